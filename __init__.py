@@ -19,7 +19,10 @@
 版权持有人不承担任何使用DrissionPage带来的风险和损失。
 版权持有人不对DrissionPage可能存在的缺陷导致的任何损失负任何责任。
 """
+from ._base.async_chromium import AsyncChromium
+from ._base.browser_pool import BrowserPool
 from ._base.chromium import Chromium
+from ._base.crawl_runner import CrawlRunner
 from ._configs.chromium_options import ChromiumOptions
 from ._configs.session_options import SessionOptions
 from ._pages.chromium_page import ChromiumPage
@@ -5,7 +5,10 @@
 @Website  : https://DrissionPage.cn
 @Copyright: (c) 2020 by g1879, Inc. All Rights Reserved.
 """
+from ._base.async_chromium import AsyncChromium
+from ._base.browser_pool import BrowserPool
 from ._base.chromium import Chromium
+from ._base.crawl_runner import CrawlRunner
 from ._configs.chromium_options import ChromiumOptions
 from ._configs.session_options import SessionOptions
 from ._pages.chromium_page import ChromiumPage
@@ -14,4 +17,5 @@ from ._pages.web_page import WebPage
 from .version import __version__
 
 
-__all__ = ['WebPage', 'ChromiumPage', 'Chromium', 'ChromiumOptions', 'SessionOptions', 'SessionPage', '__version__']
+__all__ = ['WebPage', 'ChromiumPage', 'Chromium', 'ChromiumOptions', 'SessionOptions', 'SessionPage', 'AsyncChromium',
+           'BrowserPool', 'CrawlRunner', '__version__']
@@ -0,0 +1,123 @@
+# -*- coding:utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Website  : https://DrissionPage.cn
+@Copyright: (c) 2020 by g1879, Inc. All Rights Reserved.
+"""
+from asyncio import get_running_loop
+from re import match
+
+from .async_driver import AsyncDriver
+from .chromium import handle_options, run_browser
+from .._functions.settings import Settings as _S
+from .._functions.tools import raise_error
+from .._pages.async_tab import AsyncTab
+from .._pages.chromium_base import Timeout
+from ..errors import IncorrectURLError
+
+__ERROR__ = 'error'
+
+
+class AsyncChromium(object):
+    """基于asyncio的浏览器对象，所有标签页共用一条websocket连接"""
+
+    def __init__(self, addr_or_opts=None):
+        self._chromium_options = handle_options(addr_or_opts)
+        self._type = 'AsyncChromium'
+        self._timeouts = Timeout(**self._chromium_options.timeouts)
+        self._tabs = {}
+        self._driver = None
+        self._is_headless = None
+        self._is_exists = None
+        self.address = self._chromium_options.address
+        self.id = None
+        self.version = None
+
+    def __repr__(self):
+        return f'<AsyncChromium {self.id} {self.address}>'
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.disconnect()
+
+    @property
+    def driver(self):
+        return self._driver
+
+    @property
+    def timeout(self):
+        return self._timeouts.base
+
+    @property
+    def timeouts(self):
+        return self._timeouts
+
+    async def start(self):
+        if self._driver and self._driver.is_running:
+            return self
+        self._is_headless, self.id, self._is_exists = await get_running_loop().run_in_executor(
+            None, run_browser, self._chromium_options)
+        self._driver = AsyncDriver(self.id, 'browser', self.address, self)
+        await self._driver.start()
+        self.version = (await self._run_cdp('Browser.getVersion'))['product']
+        return self
+
+    async def _run_cdp(self, cmd, **cmd_args):
+        ignore = cmd_args.pop('_ignore', None)
+        r = await self._driver.run(cmd, **cmd_args)
+        return r if __ERROR__ not in r else raise_error(r, self, ignore)
+
+    async def run_cdp(self, cmd, **cmd_args):
+        r = await self._driver.run(cmd, **cmd_args)
+        return r if __ERROR__ not in r else raise_error(r, self, user=True)
+
+    async def tab_ids(self):
+        tabs = (await self._run_cdp('Target.getTargets'))['targetInfos']
+        return [t['targetId'] for t in tabs
+                if t['type'] in ('page', 'webview') and not t['url'].startswith('devtools://')]
+
+    async def latest_tab(self):
+        ids = await self.tab_ids()
+        return await self.get_tab(ids[0]) if ids else await self.new_tab()
+
+    async def get_tab(self, tab_id):
+        tab = self._tabs.get(tab_id)
+        if tab is None or not tab.driver or not tab.driver.is_running:
+            tab = AsyncTab(self, tab_id)
+            await tab._connect()
+            self._tabs[tab_id] = tab
+        return tab
+
+    async def new_tab(self, url=None, new_window=False, background=False):
+        if url and not match(r'^.*?://.*', url):
+            raise IncorrectURLError(_S._lang.INVALID_URL, url=url)
+        tab_id = (await self._run_cdp('Target.createTarget', url='about:blank', newWindow=new_window,
+                                      background=background))['targetId']
+        tab = await self.get_tab(tab_id)
+        if url:
+            await tab.get(url)
+        return tab
+
+    async def close_tabs(self, tabs_or_ids):
+        if isinstance(tabs_or_ids, (str, AsyncTab)):
+            tabs_or_ids = (tabs_or_ids,)
+        for tab in tabs_or_ids:
+            tab_id = tab.tab_id if isinstance(tab, AsyncTab) else tab
+            self._tabs.pop(tab_id, None)
+            await self._driver.run('Target.closeTarget', targetId=tab_id)
+
+    async def disconnect(self):
+        if self._driver:
+            await self._driver.stop()
+        self._tabs.clear()
+
+    async def quit(self):
+        if self._driver and self._driver.is_running:
+            await self._driver.run('Browser.close', _timeout=3)
+        await self.disconnect()
+
+    def _on_disconnect(self):
+        self._tabs.clear()
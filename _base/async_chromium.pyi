@@ -0,0 +1,114 @@
+# -*- coding:utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Website  : https://DrissionPage.cn
+@Copyright: (c) 2020 by g1879, Inc. All Rights Reserved.
+"""
+from typing import Union, Optional, List, Dict, Iterable
+
+from .async_driver import AsyncDriver
+from .._configs.chromium_options import ChromiumOptions
+from .._pages.async_tab import AsyncTab
+from .._pages.chromium_base import Timeout
+
+
+class AsyncChromium(object):
+    _chromium_options: ChromiumOptions
+    _type: str
+    _timeouts: Timeout
+    _tabs: Dict[str, AsyncTab]
+    _driver: Optional[AsyncDriver]
+    _is_headless: Optional[bool]
+    _is_exists: Optional[bool]
+    address: str
+    id: Optional[str]
+    version: Optional[str]
+
+    def __init__(self, addr_or_opts: Union[str, int, ChromiumOptions] = None):
+        """
+        :param addr_or_opts: 'ip:port'、ChromiumOptions对象，创建后需await start()或用async with
+        """
+        ...
+
+    async def __aenter__(self) -> AsyncChromium: ...
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None: ...
+
+    @property
+    def driver(self) -> Optional[AsyncDriver]:
+        """返回浏览器驱动对象"""
+        ...
+
+    @property
+    def timeout(self) -> float:
+        """返回基本超时时间"""
+        ...
+
+    @property
+    def timeouts(self) -> Timeout:
+        """返回超时设置对象"""
+        ...
+
+    async def start(self) -> AsyncChromium:
+        """连接或启动浏览器
+        :return: 浏览器对象自身
+        """
+        ...
+
+    async def _run_cdp(self, cmd: str, **cmd_args) -> dict:
+        """执行Chrome DevTools Protocol语句
+        :param cmd: 协议项目
+        :param cmd_args: 参数
+        :return: 执行的结果
+        """
+        ...
+
+    async def run_cdp(self, cmd: str, **cmd_args) -> dict:
+        """执行Chrome DevTools Protocol语句
+        :param cmd: 协议项目
+        :param cmd_args: 参数
+        :return: 执行的结果
+        """
+        ...
+
+    async def tab_ids(self) -> List[str]:
+        """返回所有标签页id组成的列表"""
+        ...
+
+    async def latest_tab(self) -> AsyncTab:
+        """返回第一个标签页，没有时新建一个"""
+        ...
+
+    async def get_tab(self, tab_id: str) -> AsyncTab:
+        """获取一个标签页对象
+        :param tab_id: 标签页id
+        :return: AsyncTab对象
+        """
+        ...
+
+    async def new_tab(self, url: str = None, new_window: bool = False, background: bool = False) -> AsyncTab:
+        """新建一个标签页
+        :param url: 新标签页跳转到的网址
+        :param new_window: 是否在新窗口打开标签页
+        :param background: 是否不激活新标签页
+        :return: AsyncTab对象
+        """
+        ...
+
+    async def close_tabs(self, tabs_or_ids: Union[str, AsyncTab, Iterable[Union[str, AsyncTab]]]) -> None:
+        """关闭传入的标签页
+        :param tabs_or_ids: 指定的标签页对象或id，可用列表或元组传入多个
+        :return: None
+        """
+        ...
+
+    async def disconnect(self) -> None:
+        """断开与浏览器的连接，不关闭浏览器"""
+        ...
+
+    async def quit(self) -> None:
+        """关闭浏览器"""
+        ...
+
+    def _on_disconnect(self) -> None: ...
@@ -0,0 +1,364 @@
+# -*- coding: utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Website  : https://DrissionPage.cn
+@Copyright: (c) 2020 by g1879, Inc. All Rights Reserved.
+"""
+from asyncio import (open_connection, get_running_loop, wait_for, Queue, Lock, TimeoutError as AsyncTimeoutError,
+                     IncompleteReadError, CancelledError, iscoroutinefunction, current_task)
+from base64 import b64encode
+from os import urandom
+from struct import pack, unpack
+from sys import excepthook, exc_info
+from time import perf_counter
+from urllib.parse import urlparse
+
+from .driver import Driver
+from .._functions.settings import Settings as _S
+from .._functions.tools import raise_error
+from ..errors import BrowserConnectError, PageDisconnectedError
+
+
+class AsyncWebSocket(object):
+    """基于asyncio流的最小websocket客户端，只处理cdp需要的文本帧"""
+
+    def __init__(self, reader, writer):
+        self._reader = reader
+        self._writer = writer
+        self._lock = Lock()
+        self.closed = False
+
+    @classmethod
+    async def connect(cls, url, timeout=None):
+        u = urlparse(url)
+        reader, writer = await wait_for(open_connection(u.hostname, u.port or 80), timeout)
+        key = b64encode(urandom(16)).decode()
+        writer.write((f'GET {u.path or "/"} HTTP/1.1\r\nHost: {u.netloc}\r\nUpgrade: websocket\r\n'
+                      f'Connection: Upgrade\r\nSec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n\r\n').encode())
+        await writer.drain()
+        status = (await wait_for(reader.readline(), timeout)).decode()
+        while (await reader.readline()) not in (b'\r\n', b''):
+            pass
+        if ' 101 ' not in status:
+            writer.close()
+            if ' 403 ' in status:
+                raise EnvironmentError(_S._lang.join(_S._lang.UPGRADE_WS))
+            raise BrowserConnectError(_S._lang.BROWSER_CONNECT_ERR2)
+        return cls(reader, writer)
+
+    async def send(self, text, opcode=0x1):
+        data = text.encode() if isinstance(text, str) else text
+        n = len(data)
+        if n < 126:
+            head = pack('!BB', 0x80 | opcode, 0x80 | n)
+        elif n < 65536:
+            head = pack('!BBH', 0x80 | opcode, 0x80 | 126, n)
+        else:
+            head = pack('!BBQ', 0x80 | opcode, 0x80 | 127, n)
+        mask = urandom(4)
+        masked = int.from_bytes(data, 'big') ^ int.from_bytes((mask * (n // 4 + 1))[:n], 'big')
+        self._writer.write(head + mask + masked.to_bytes(n, 'big'))
+        async with self._lock:
+            await self._writer.drain()
+
+    async def recv(self):
+        """返回一条完整文本消息，连接关闭时抛出ConnectionError"""
+        buf = b''
+        while True:
+            b1, b2 = await self._reader.readexactly(2)
+            opcode = b1 & 0xf
+            n = b2 & 0x7f
+            if n == 126:
+                n = unpack('!H', await self._reader.readexactly(2))[0]
+            elif n == 127:
+                n = unpack('!Q', await self._reader.readexactly(8))[0]
+            data = await self._reader.readexactly(n)
+
+            if opcode == 0x8:
+                raise ConnectionError
+            elif opcode == 0x9:
+                await self.send(data, 0xa)
+            elif opcode == 0xa:
+                continue
+            else:
+                buf += data
+                if b1 & 0x80:
+                    return buf
+
+    async def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        try:
+            await self.send(b'\x03\xe8', 0x8)
+        except (OSError, RuntimeError):
+            pass
+        self._writer.close()
+
+
+class EventSubscription(object):
+    """可异步迭代的事件订阅"""
+
+    def __init__(self, driver, event):
+        self._driver = driver
+        self.event = event
+        self._queue = Queue()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        params = await self._queue.get()
+        if params is None:
+            raise StopAsyncIteration
+        return params
+
+    async def get(self, timeout=None):
+        params = await wait_for(self._queue.get(), timeout)
+        if params is None:
+            raise ConnectionError
+        return params
+
+    def close(self):
+        subs = self._driver._subscriptions.get(self.event)
+        if subs:
+            subs.discard(self)
+        self._queue.put_nowait(None)
+
+
+class AsyncDriver(object):
+    def __init__(self, tab_id, tab_type, address, owner=None):
+        self.id = tab_id
+        self.address = address
+        self.type = tab_type
+        self.owner = owner
+
+        self._websocket_url = f'ws://{address}/devtools/{tab_type}/{tab_id}'
+        self._cur_id = 0
+        self._ws = None
+        self._recv_task = None
+
+        self.is_running = False
+        self.event_handlers = {}
+        self.method_results = {}
+        self._subscriptions = {}
+        self._sessions = {}
+
+    def __repr__(self):
+        return f'<AsyncDriver {self.id}>'
+
+    async def start(self):
+        try:
+            self._ws = await AsyncWebSocket.connect(self._websocket_url, _S.cdp_timeout)
+        except (ConnectionRefusedError, AsyncTimeoutError):
+            raise BrowserConnectError(_S._lang.BROWSER_NOT_EXIST)
+        self.is_running = True
+        self._recv_task = get_running_loop().create_task(self._recv_loop())
+        return True
+
+    async def stop(self):
+        if not self.is_running:
+            return False
+        self._stop()
+        if self._ws:
+            await self._ws.close()
+            self._ws = None
+        return True
+
+    def _stop(self):
+        self.is_running = False
+        sessions = list(self._sessions.values())
+        self._sessions.clear()
+        for session in sessions:
+            session.session_id = None
+            session._stop()
+
+        for future in self.method_results.values():
+            if not future.done():
+                future.set_result({'error': {'message': 'connection disconnected'}, 'type': 'connection_error'})
+        self.method_results.clear()
+        self.event_handlers.clear()
+        for subs in list(self._subscriptions.values()):
+            for sub in list(subs):
+                sub.close()
+        self._subscriptions.clear()
+
+        if self._recv_task and self._recv_task is not current_task():
+            self._recv_task.cancel()
+        if hasattr(self.owner, '_on_disconnect'):
+            self.owner._on_disconnect()
+
+    async def _recv_loop(self):
+        while self.is_running:
+            try:
+                msg = _S.json_loads(await self._ws.recv())
+            except CancelledError:
+                return
+            except (OSError, ConnectionError, IncompleteReadError, ValueError):
+                self._stop()
+                return
+            self._handle_msg(msg)
+
+    def _handle_msg(self, msg):
+        session_id = msg.get('sessionId')
+        if session_id:
+            session = self._sessions.get(session_id)
+            if session:
+                session._handle_msg(msg)
+            return
+
+        if msg.get('method') == 'Target.detachedFromTarget':
+            session = self._sessions.pop(msg['params']['sessionId'], None)
+            if session:
+                session._stop()
+        self._deliver(msg)
+
+    def _deliver(self, msg):
+        if 'method' in msg:
+            self._dispatch_event(msg['method'], msg['params'])
+        else:
+            future = self.method_results.pop(msg.get('id'), None)
+            if future and not future.done():
+                future.set_result(msg)
+
+    def _dispatch_event(self, method, params):
+        function = self.event_handlers.get(method)
+        if function:
+            if iscoroutinefunction(function):
+                get_running_loop().create_task(function(**params))
+            else:  # 回调出错不能中断接收
+                try:
+                    function(**params)
+                except PageDisconnectedError:
+                    pass
+                except Exception:
+                    excepthook(*exc_info())
+        for sub in self._subscriptions.get(method, ()):
+            sub._queue.put_nowait(params)
+
+    def _post(self, message):
+        self._cur_id += 1
+        ws_id = self._cur_id
+        message['id'] = ws_id
+        future = get_running_loop().create_future()
+        self.method_results[ws_id] = future
+        return ws_id, future, _S.json_dumps(message)
+
+    async def _send_many(self, messages, timeout=None):
+        posted = [self._post(message) for message in messages]
+        try:
+            for _, _, message_json in posted:
+                await self._ws.send(message_json)
+        except (OSError, AttributeError, RuntimeError):
+            for ws_id, _, _ in posted:
+                self.method_results.pop(ws_id, None)
+            return [{'error': {'message': 'connection disconnected'}, 'type': 'connection_error'} for _ in posted]
+
+        if timeout == 0:
+            for ws_id, _, _ in posted:
+                self.method_results.pop(ws_id, None)
+            return [{'id': ws_id, 'result': {}} for ws_id, _, _ in posted]
+
+        end_time = perf_counter() + timeout if timeout is not None else None
+        results = []
+        for ws_id, future, _ in posted:
+            try:
+                results.append(await wait_for(future, None if end_time is None
+                                              else max(end_time - perf_counter(), 0)))
+            except AsyncTimeoutError:
+                self.method_results.pop(ws_id, None)
+                results.append({'error': {'message': 'timeout'}, 'type': 'timeout'})
+        return results
+
+    async def run(self, _method, **kwargs):
+        """执行cdp方法"""
+        if not self.is_running:
+            return {'error': 'connection disconnected', 'type': 'connection_error'}
+        timeout = kwargs.pop('_timeout', _S.cdp_timeout)
+        result = (await self._send_many([{'method': _method, 'params': kwargs}], timeout=timeout))[0]
+        return Driver._parse_result(result, _method, kwargs, timeout)
+
+    async def run_many(self, cmds, _timeout=None):
+        """一次发送多条互不依赖的cdp方法，按顺序返回结果"""
+        cmds = [(cmd, {}) if isinstance(cmd, str) else (cmd[0], dict(cmd[1]) if len(cmd) > 1 else {})
+                for cmd in cmds]
+        if not self.is_running:
+            return [{'error': 'connection disconnected', 'type': 'connection_error'} for _ in cmds]
+        timeout = _S.cdp_timeout if _timeout is None else _timeout
+        results = await self._send_many([{'method': method, 'params': params} for method, params in cmds],
+                                        timeout=timeout)
+        return [Driver._parse_result(result, method, params, timeout)
+                for result, (method, params) in zip(results, cmds)]
+
+    def set_callback(self, event, callback):
+        if callback:
+            self.event_handlers[event] = callback
+        else:
+            self.event_handlers.pop(event, None)
+
+    def subscribe(self, event):
+        sub = EventSubscription(self, event)
+        self._subscriptions.setdefault(event, set()).add(sub)
+        return sub
+
+    async def wait_event(self, event, timeout=None):
+        sub = self.subscribe(event)
+        try:
+            return await sub.get(timeout)
+        except AsyncTimeoutError:
+            return None
+        finally:
+            sub.close()
+
+    async def attach(self, target_id, owner=None):
+        """以flatten模式附加到target，返回共用本连接的AsyncSessionDriver"""
+        session = AsyncSessionDriver(target_id, 'page', self.address, owner, browser_driver=self)
+        await session.start()
+        return session
+
+
+class AsyncSessionDriver(AsyncDriver):
+    def __init__(self, tab_id, tab_type, address, owner=None, browser_driver=None):
+        super().__init__(tab_id, tab_type, address, owner)
+        self._browser_driver = browser_driver
+        self.session_id = None
+
+    def __repr__(self):
+        return f'<AsyncSessionDriver {self.id} {self.session_id}>'
+
+    async def start(self):
+        if not self._browser_driver or not self._browser_driver.is_running:
+            raise BrowserConnectError(_S._lang.BROWSER_NOT_EXIST)
+        r = await self._browser_driver.run('Target.attachToTarget', targetId=self.id, flatten=True)
+        if 'error' in r:
+            raise_error(r, self._browser_driver.owner)
+        self.session_id = r['sessionId']
+        self._ws = self._browser_driver._ws
+        self.is_running = True
+        self._browser_driver._sessions[self.session_id] = self
+        return True
+
+    async def stop(self):
+        if not self.is_running:
+            return False
+        session_id = self.session_id
+        self._stop()
+        if session_id:
+            await self._browser_driver.run('Target.detachFromTarget', sessionId=session_id)
+        return True
+
+    def _stop(self):
+        if self.session_id:
+            self._browser_driver._sessions.pop(self.session_id, None)
+            self.session_id = None
+        self._ws = None
+        super()._stop()
+
+    def _handle_msg(self, msg):
+        self._deliver(msg)
+
+    def _post(self, message):
+        message['sessionId'] = self.session_id
+        return super()._post(message)
+
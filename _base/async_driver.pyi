@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Website  : https://DrissionPage.cn
+@Copyright: (c) 2020 by g1879, Inc. All Rights Reserved.
+"""
+from asyncio import StreamReader, StreamWriter, Future, Queue, Lock, Task
+from typing import Union, Callable, Dict, Optional, List, Tuple, Set, Awaitable
+
+
+class AsyncWebSocket(object):
+    _reader: StreamReader
+    _writer: StreamWriter
+    _lock: Lock
+    closed: bool
+
+    def __init__(self, reader: StreamReader, writer: StreamWriter): ...
+
+    @classmethod
+    async def connect(cls, url: str, timeout: float = None) -> AsyncWebSocket:
+        """建立websocket连接
+        :param url: websocket地址
+        :param timeout: 超时时间（秒）
+        :return: AsyncWebSocket对象
+        """
+        ...
+
+    async def send(self, text: Union[str, bytes], opcode: int = 0x1) -> None:
+        """发送一帧数据
+        :param text: 要发送的数据
+        :param opcode: 帧类型
+        :return: None
+        """
+        ...
+
+    async def recv(self) -> bytes:
+        """接收一条完整消息，连接关闭时抛出ConnectionError
+        :return: 消息内容
+        """
+        ...
+
+    async def close(self) -> None:
+        """关闭连接"""
+        ...
+
+
+class EventSubscription(object):
+    _driver: AsyncDriver
+    event: str
+    _queue: Queue
+
+    def __init__(self, driver: AsyncDriver, event: str):
+        """
+        :param driver: 所属AsyncDriver对象
+        :param event: cdp事件名
+        """
+        ...
+
+    def __aiter__(self) -> EventSubscription: ...
+
+    async def __anext__(self) -> dict: ...
+
+    async def get(self, timeout: float = None) -> dict:
+        """等待下一个事件
+        :param timeout: 超时时间（秒），为None表示无限
+        :return: 事件参数
+        """
+        ...
+
+    def close(self) -> None:
+        """取消订阅，并结束正在进行的迭代"""
+        ...
+
+
+class AsyncDriver(object):
+    id: str
+    address: str
+    type: str
+    owner = ...
+    _websocket_url: str
+    _cur_id: int
+    _ws: Optional[AsyncWebSocket]
+    _recv_task: Optional[Task]
+    is_running: bool
+    event_handlers: Dict[str, Callable]
+    method_results: Dict[int, Future]
+    _subscriptions: Dict[str, Set[EventSubscription]]
+    _sessions: Dict[str, AsyncSessionDriver]
+
+    def __init__(self, tab_id: str, tab_type: str, address: str, owner=None):
+        """
+        :param tab_id: 标签页id
+        :param tab_type: 标签页类型
+        :param address: 浏览器连接地址
+        :param owner: 创建这个驱动的对象
+        """
+        ...
+
+    async def start(self) -> bool:
+        """启动连接"""
+        ...
+
+    async def stop(self) -> bool:
+        """中断连接"""
+        ...
+
+    def _stop(self) -> None:
+        """中断连接，唤醒所有等待中的指令和订阅"""
+        ...
+
+    async def _recv_loop(self) -> None:
+        """接收浏览器信息的任务"""
+        ...
+
+    def _handle_msg(self, msg: dict) -> None:
+        """分发一条从浏览器收到的信息
+        :param msg: 已解析的信息
+        :return: None
+        """
+        ...
+
+    def _deliver(self, msg: dict) -> None:
+        """处理属于本驱动的信息
+        :param msg: 已解析的信息
+        :return: None
+        """
+        ...
+
+    def _dispatch_event(self, method: str, params: dict) -> None:
+        """执行事件回调并推送给订阅者
+        :param method: 事件名
+        :param params: 事件参数
+        :return: None
+        """
+        ...
+
+    def _post(self, message: dict) -> Tuple[int, Future, str]:
+        """为一条信息分配id和Future
+        :param message: 发送给浏览器的数据
+        :return: (消息id, Future对象, 序列化后的文本)
+        """
+        ...
+
+    async def _send_many(self, messages: List[dict], timeout: float = None) -> List[dict]:
+        """一次写出多条信息，再依次收集返回的信息
+        :param messages: 发送给浏览器的数据列表
+        :param timeout: 总超时时间，为None表示无限
+        :return: 浏览器返回的数据列表
+        """
+        ...
+
+    async def run(self, _method: str, **kwargs) -> dict:
+        """执行cdp方法
+        :param _method: cdp方法名
+        :param kwargs: cdp参数
+        :return: 执行结果
+        """
+        ...
+
+    async def run_many(self, cmds: List[Union[str, Tuple[str, dict]]], _timeout: float = None) -> List[dict]:
+        """一次发送多条互不依赖的cdp方法，按顺序返回结果
+        :param cmds: 由(cdp方法名, 参数dict)或cdp方法名组成的列表
+        :param _timeout: 全部方法的总超时时间，为None使用全局设置
+        :return: 执行结果列表
+        """
+        ...
+
+    def set_callback(self, event: str, callback: Optional[Callable[..., Union[None, Awaitable]]]) -> None:
+        """绑定cdp event和回调方法，回调可以是普通函数或协程函数
+        :param event: cdp event
+        :param callback: 绑定到cdp event的回调方法，为None时解除绑定
+        :return: None
+        """
+        ...
+
+    def subscribe(self, event: str) -> EventSubscription:
+        """订阅一个cdp事件，返回可异步迭代的订阅对象
+        :param event: cdp event
+        :return: EventSubscription对象
+        """
+        ...
+
+    async def wait_event(self, event: str, timeout: float = None) -> Optional[dict]:
+        """等待一个cdp事件出现
+        :param event: cdp event
+        :param timeout: 超时时间（秒），为None表示无限
+        :return: 事件参数，超时返回None
+        """
+        ...
+
+    async def attach(self, target_id: str, owner=None) -> AsyncSessionDriver:
+        """以flatten模式附加到target，返回共用本连接的AsyncSessionDriver
+        :param target_id: target id
+        :param owner: 使用该驱动的对象
+        :return: AsyncSessionDriver对象，附加失败时抛出异常
+        """
+        ...
+
+
+class AsyncSessionDriver(AsyncDriver):
+    _browser_driver: AsyncDriver
+    session_id: Optional[str]
+
+    def __init__(self, tab_id: str, tab_type: str, address: str, owner=None,
+                 browser_driver: AsyncDriver = None):
+        """
+        :param tab_id: 标签页id
+        :param tab_type: 标签页类型
+        :param address: 浏览器连接地址
+        :param owner: 创建这个驱动的对象
+        :param browser_driver: 提供连接的浏览器驱动
+        """
+        ...
@@ -0,0 +1,253 @@
+# -*- coding:utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Website  : https://DrissionPage.cn
+@Copyright: (c) 2020 by g1879, Inc. All Rights Reserved.
+"""
+from os import cpu_count
+from queue import Queue
+from threading import Lock, Thread, Event
+
+from .chromium import Chromium
+from .._configs.chromium_options import ChromiumOptions
+from .._functions.settings import Settings as _S
+from ..errors import BrowserConnectError, PageDisconnectedError
+
+
+class BrowserPool(object):
+    """同时运行多个浏览器，把任务分配给负载最低的浏览器，浏览器崩溃时自动重启"""
+
+    def __init__(self, size=None, options_factory=None, tabs_per_browser=4, balance='tabs'):
+        if balance not in ('tabs', 'memory'):
+            raise ValueError(_S._lang.join(_S._lang.INCORRECT_VAL_, 'balance',
+                                           ALLOW_VAL="'tabs', 'memory'", CURR_VAL=balance))
+        self.size = size or cpu_count() or 1
+        self.tabs_per_browser = tabs_per_browser
+        self.balance = balance
+        self._factory = options_factory or _default_options
+        self._lock = Lock()
+        self._closed = False
+        self._slots = [BrowserSlot(self, i) for i in range(self.size)]
+
+        errors = []
+
+        def start(slot):
+            try:
+                slot.start()
+            except Exception as e:
+                errors.append(e)
+
+        threads = [Thread(target=start, args=(s,), daemon=True) for s in self._slots]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        if errors:
+            self.close()
+            raise errors[0]
+
+    def __repr__(self):
+        return f'<BrowserPool size={self.size} balance={self.balance}>'
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @property
+    def browsers(self):
+        """返回所有浏览器对象"""
+        return [s.browser for s in self._slots]
+
+    @property
+    def stats(self):
+        """返回每个浏览器的负载信息"""
+        return [s.stats for s in self._slots]
+
+    def lease(self, url=None):
+        """从负载最低的浏览器借出一个标签页"""
+        return self._pick().lease(url)
+
+    def release(self, tab):
+        """归还lease()借出的标签页"""
+        for s in self._slots:
+            if s.browser is tab.browser:
+                return s.release(tab)
+        return False
+
+    def map(self, func, urls, concurrency=None, ordered=False, retries=1, return_exceptions=False):
+        """用多个浏览器并发执行func(tab, url)，按完成顺序逐个返回结果"""
+        if concurrency is None:
+            concurrency = self.size * self.tabs_per_browser
+        items = iter(enumerate(urls))
+        items_lock = Lock()
+        results = Queue()
+        stop = Event()
+
+        def worker():
+            try:
+                while not stop.is_set():
+                    with items_lock:
+                        try:
+                            i, url = next(items)
+                        except StopIteration:
+                            break
+                    results.put((i, self._run(func, url, retries)))
+            except Exception as e:
+                results.put((-1, (False, e)))
+            finally:
+                results.put(None)
+
+        threads = [Thread(target=worker, daemon=True) for _ in range(max(concurrency, 1))]
+        for t in threads:
+            t.start()
+
+        done = 0
+        pending = {}
+        next_i = 0
+        try:
+            while done < len(threads):
+                item = results.get()
+                if item is None:
+                    done += 1
+                    continue
+                i, (ok, value) = item
+                if not ok and (i < 0 or not return_exceptions):
+                    raise value
+                if not ordered:
+                    yield value
+                    continue
+                pending[i] = value
+                while next_i in pending:
+                    yield pending.pop(next_i)
+                    next_i += 1
+        finally:
+            stop.set()
+
+    def close(self):
+        """关闭所有浏览器"""
+        self._closed = True
+        for s in self._slots:
+            s.quit()
+
+    def _pick(self):
+        """返回负载最低的浏览器并计入一个任务，已崩溃的先重启"""
+        if self._closed:
+            raise RuntimeError(_S._lang.join(_S._lang.POOL_CLOSED))
+        for s in self._slots:
+            if not s.alive:
+                s.restart()
+        with self._lock:
+            slot = min(self._slots, key=BrowserSlot.load)
+            slot.active += 1
+            return slot
+
+    def _run(self, func, url, retries):
+        err = None
+        for _ in range(retries + 1):
+            slot = self._pick()
+            try:
+                tab = slot.lease()
+            except (PageDisconnectedError, BrowserConnectError) as e:
+                err = e
+                continue
+            try:
+                return True, func(tab, url)
+            except (PageDisconnectedError, BrowserConnectError) as e:
+                err = e
+            except Exception as e:
+                return False, e
+            finally:
+                slot.release(tab)
+        return False, err
+
+
+class BrowserSlot(object):
+    """BrowserPool中的一个浏览器"""
+
+    def __init__(self, pool, index):
+        self.pool = pool
+        self.index = index
+        self.browser = None
+        self.tabs = None
+        self.active = 0
+        self.restarts = 0
+        self._lock = Lock()
+
+    def __repr__(self):
+        return f'<BrowserSlot {self.index} {self.browser.address if self.browser else None}>'
+
+    @property
+    def alive(self):
+        return self.browser is not None and self.browser._driver.is_running
+
+    @property
+    def memory(self):
+        """返回浏览器进程及子进程占用的内存（字节），无法获取时返回None"""
+        if not self.browser or not self.browser.process_id:
+            return None
+        from psutil import Process, Error
+        try:
+            p = Process(self.browser.process_id)
+            return p.memory_info().rss + sum(c.memory_info().rss for c in p.children(recursive=True))
+        except Error:
+            return None
+
+    @property
+    def stats(self):
+        return {'index': self.index, 'address': self.browser.address if self.browser else None,
+                'alive': self.alive, 'active': self.active, 'tabs': self.browser.tabs_count if self.alive else 0,
+                'memory': self.memory, 'restarts': self.restarts,
+                'hit_rate': self.tabs.stats['hit_rate'] if self.tabs else None}
+
+    def load(self):
+        """返回用于比较负载的值，balance为'memory'时先按内存（以64MB为单位）比较，再按使用中的标签页数量比较"""
+        if not self.alive:
+            return float('inf'), 0
+        tabs = max(self.active, self.browser.tabs_count - len(self.tabs._idle))
+        if self.pool.balance == 'memory':
+            return (self.memory or 0) >> 26, tabs
+        return 0, tabs
+
+    def start(self):
+        self.browser = Chromium(self.pool._factory(self.index))
+        self.tabs = self.browser.new_tab_pool(self.pool.tabs_per_browser)
+
+    def restart(self):
+        with self._lock:
+            if self.alive or self.pool._closed:
+                return
+            self.quit()
+            self.restarts += 1
+            self.start()
+
+    def quit(self):
+        if self.browser is None:
+            return
+        try:
+            self.tabs.close()
+            self.browser.quit()
+        except Exception:
+            pass
+
+    def lease(self, url=None):
+        """借出标签页，须先由BrowserPool._pick()计入任务"""
+        try:
+            return self.tabs.lease(url)
+        except Exception:
+            self._done()
+            raise
+
+    def release(self, tab):
+        self._done()
+        return self.tabs.release(tab)
+
+    def _done(self):
+        with self.pool._lock:
+            self.active -= 1
+
+
+def _default_options(index):
+    return ChromiumOptions().auto_port()
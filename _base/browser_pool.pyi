@@ -0,0 +1,170 @@
+# -*- coding:utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Website  : https://DrissionPage.cn
+@Copyright: (c) 2020 by g1879, Inc. All Rights Reserved.
+"""
+from threading import Lock
+from typing import Any, Callable, Iterable, Iterator, List, Literal, Optional, Tuple, Union
+
+from .chromium import Chromium
+from .._configs.chromium_options import ChromiumOptions
+from .._pages.chromium_tab import ChromiumTab
+from .._pages.mix_tab import MixTab
+from .._units.tab_pool import TabPool
+
+
+class BrowserPool(object):
+    size: int
+    tabs_per_browser: int
+    balance: Literal['tabs', 'memory']
+    _factory: Callable[[int], Union[ChromiumOptions, str, int]]
+    _lock: Lock
+    _closed: bool
+    _slots: List[BrowserSlot]
+
+    def __init__(self,
+                 size: int = None,
+                 options_factory: Callable[[int], Union[ChromiumOptions, str, int]] = None,
+                 tabs_per_browser: int = 4,
+                 balance: Literal['tabs', 'memory'] = 'tabs'):
+        """同时运行多个浏览器，把任务分配给负载最低的浏览器，浏览器崩溃时自动重启
+        :param size: 浏览器数量，为None时使用CPU核心数
+        :param options_factory: 接收浏览器序号，返回用于创建Chromium对象的参数，为None时每个浏览器使用自动分配的端口
+        :param tabs_per_browser: 每个浏览器预先打开的标签页数量
+        :param balance: 负载计算方式，'tabs'按使用中的标签页数量，'memory'按浏览器进程占用的内存
+        """
+        ...
+
+    def __enter__(self) -> BrowserPool: ...
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None: ...
+
+    @property
+    def browsers(self) -> List[Chromium]:
+        """返回所有浏览器对象"""
+        ...
+
+    @property
+    def stats(self) -> List[dict]:
+        """返回每个浏览器的负载信息"""
+        ...
+
+    def lease(self, url: str = None) -> Union[MixTab, ChromiumTab]:
+        """从负载最低的浏览器借出一个标签页
+        :param url: 借出后要访问的网址，为None时不访问
+        :return: 标签页对象
+        """
+        ...
+
+    def release(self, tab: Union[MixTab, ChromiumTab]) -> bool:
+        """归还lease()借出的标签页
+        :param tab: 标签页对象
+        :return: 是否由本池借出
+        """
+        ...
+
+    def map(self,
+            func: Callable[[Union[MixTab, ChromiumTab], Any], Any],
+            urls: Iterable[Any],
+            concurrency: int = None,
+            ordered: bool = False,
+            retries: int = 1,
+            return_exceptions: bool = False) -> Iterator[Any]:
+        """用多个浏览器并发执行func(tab, url)，逐个返回结果
+        :param func: 接收标签页对象和url的方法
+        :param urls: url或任务参数组成的可迭代对象，按需读取
+        :param concurrency: 并发数，为None时为浏览器数量乘以每个浏览器的标签页数量
+        :param ordered: 是否按输入顺序返回，为False时按完成顺序返回
+        :param retries: 浏览器断开时换一个浏览器重试的次数
+        :param return_exceptions: 为True时把func抛出的异常作为结果返回，否则直接抛出
+        :return: 结果生成器
+        """
+        ...
+
+    def close(self) -> None:
+        """关闭所有浏览器"""
+        ...
+
+    def _pick(self) -> BrowserSlot:
+        """返回负载最低的浏览器并计入一个任务，已崩溃的先重启"""
+        ...
+
+    def _run(self, func: Callable, url: Any, retries: int) -> Tuple[bool, Any]:
+        """执行一个任务
+        :param func: 要执行的方法
+        :param url: 传给方法的参数
+        :param retries: 重试次数
+        :return: (是否成功, 结果或异常)
+        """
+        ...
+
+
+class BrowserSlot(object):
+    pool: BrowserPool
+    index: int
+    browser: Optional[Chromium]
+    tabs: Optional[TabPool]
+    active: int
+    restarts: int
+    _lock: Lock
+
+    def __init__(self, pool: BrowserPool, index: int):
+        """BrowserPool中的一个浏览器
+        :param pool: 所属BrowserPool
+        :param index: 序号
+        """
+        ...
+
+    @property
+    def alive(self) -> bool:
+        """返回浏览器是否仍连接"""
+        ...
+
+    @property
+    def memory(self) -> Optional[int]:
+        """返回浏览器进程及子进程占用的内存（字节），无法获取时返回None"""
+        ...
+
+    @property
+    def stats(self) -> dict:
+        """返回负载信息"""
+        ...
+
+    def load(self) -> Tuple[float, int]:
+        """返回用于比较负载的值，balance为'memory'时先按内存（以64MB为单位）比较，再按使用中的标签页数量比较"""
+        ...
+
+    def start(self) -> None:
+        """启动浏览器并创建标签页池"""
+        ...
+
+    def restart(self) -> None:
+        """重启已断开的浏览器"""
+        ...
+
+    def quit(self) -> None:
+        """关闭浏览器"""
+        ...
+
+    def lease(self, url: str = None) -> Union[MixTab, ChromiumTab]:
+        """借出标签页，须先由BrowserPool._pick()计入任务
+        :param url: 借出后要访问的网址
+        :return: 标签页对象
+        """
+        ...
+
+    def release(self, tab: Union[MixTab, ChromiumTab]) -> bool:
+        """归还标签页
+        :param tab: 标签页对象
+        :return: 是否由本池借出
+        """
+        ...
+
+    def _done(self) -> None:
+        """任务结束时减少计数"""
+        ...
+
+
+def _default_options(index: int) -> ChromiumOptions: ...
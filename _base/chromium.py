@@ -12,20 +12,24 @@ from threading import Lock
 from time import sleep, perf_counter
 
 from requests import Session
-from websocket import WebSocketBadStatusException
 
 from .driver import BrowserDriver, Driver
 from .._configs.chromium_options import ChromiumOptions
-from .._functions.browser import connect_browser
+from .._functions.browser import connect_browser, connect_pipe_browser
 from .._functions.cookies import CookiesList
 from .._functions.settings import Settings as _S
 from .._functions.tools import PortFinder, raise_error
-from .._pages.chromium_base import Timeout
+from .._pages.chromium_base import Timeout, ChromiumBase
 from .._pages.chromium_tab import ChromiumTab
 from .._pages.mix_tab import MixTab
 from .._units.downloader import DownloadManager
+from .._units.metrics import merge_metrics
+from .._units.notifier import Notifier
+from .._units.scheduler import Scheduler
 from .._units.setter import BrowserSetter
 from .._units.states import BrowserStates
+from .._units.tab_pool import TabPool
+from .._units.targets import TargetRegistry, TAB_TYPES
 from .._units.waiter import BrowserWaiter
 from ..errors import BrowserConnectError, CDPError, PageDisconnectedError, IncorrectURLError
 
@@ -60,16 +64,19 @@ class Chromium(object):
 
         self._type = 'Chromium'
         self._frames = {}
-        self._drivers = {}
         self._all_drivers = {}
         self._relation = {}
         self._newest_tab_id = None
+        self._notifier = Notifier()
+        self._scheduler = Scheduler()
+        self._targets = TargetRegistry()
 
         self._set = None
         self._wait = None
         self._states = None
         self._timeouts = Timeout(**self._chromium_options.timeouts)
         self._load_mode = self._chromium_options.load_mode
+        self._multiplex = self._chromium_options.is_multiplex or self._chromium_options.is_pipe
         self._download_path = str(Path(self._chromium_options.download_path).absolute())
         self._auto_handle_alert = None
         self._none_ele_return_value = False
@@ -83,18 +90,18 @@ class Chromium(object):
         if ((not self._chromium_options._ua_set and self._is_headless != self._chromium_options.is_headless)
                 or (self._is_exists and self._chromium_options._new_env)):
             self.quit(3, True)
-            connect_browser(self._chromium_options)
-            s = Session()
-            s.trust_env = False
-            s.keep_alive = False
-            ws = s.get(f'http://{self._chromium_options.address}/json/version', headers={'Connection': 'close'})
-            self.id = ws.json()['webSocketDebuggerUrl'].split('/')[-1]
+            if self._chromium_options.is_pipe:  # 管道地址随进程变化，重新启动后由run_browser()设置
+                self._chromium_options.set_address('127.0.0.1:0')
+            self._is_headless, browser_id, _ = run_browser(self._chromium_options)
+            with Chromium._lock:
+                Chromium._BROWSERS.pop(self.id, None)
+                self.id = browser_id
+                Chromium._BROWSERS[browser_id] = self
+            self.address = self._chromium_options.address
+            self._scheduler = Scheduler()
             self._driver = BrowserDriver(self.id, 'browser', self.address, self)
-            ws.close()
-            s.close()
             self._is_exists = False
             self._frames = {}
-            self._drivers = {}
             self._all_drivers = {}
 
         self.version = self._run_cdp('Browser.getVersion')['product']
@@ -109,9 +116,7 @@ class Chromium(object):
         except:
             pass
 
-        self._run_cdp('Target.setDiscoverTargets', discover=True)
-        self._driver.set_callback('Target.targetDestroyed', self._onTargetDestroyed)
-        self._driver.set_callback('Target.targetCreated', self._onTargetCreated)
+        self._listen_targets()
         self._dl_mgr = DownloadManager(self)
 
         self._session_options = session_options
@@ -158,15 +163,17 @@ class Chromium(object):
             self._wait = BrowserWaiter(self)
         return self._wait
 
+    @property
+    def scheduler(self):
+        return self._scheduler
+
     @property
     def tabs_count(self):
-        j = self._run_cdp('Target.getTargets')['targetInfos']  # 不要改用get，避免卡死
-        return len([i for i in j if i['type'] in ('page', 'webview') and not i['url'].startswith('devtools://')])
+        return len(self._targets.tab_ids())
 
     @property
     def tab_ids(self):
-        j = self._driver.get(f'http://{self.address}/json').json()  # 不要改用cdp，因为顺序不对
-        return [i['id'] for i in j if i['type'] in ('page', 'webview') and not i['url'].startswith('devtools://')]
+        return self._targets.tab_ids()
 
     @property
     def latest_tab(self):
@@ -180,6 +187,9 @@ class Chromium(object):
     def new_tab(self, url=None, new_window=False, background=False, new_context=False):
         return self._new_tab(True, url=url, new_window=new_window, background=background, new_context=new_context)
 
+    def new_tab_pool(self, size=4, new_context=False, clear_cookies=None):
+        return TabPool(self, size=size, new_context=new_context, clear_cookies=clear_cookies)
+
     def get_tab(self, id_or_num=None, title=None, url=None, tab_type='page'):
         t = self._get_tab(id_or_num=id_or_num, title=title, url=url, tab_type=tab_type, mix=True, as_id=False)
         if t._type != 'MixTab':
@@ -211,11 +221,13 @@ class Chromium(object):
             self.quit()
 
     def _close_tab(self, tab):
-        if isinstance(tab, str):
-            tab = self.get_tab(tab)
-        tab._run_cdp('Target.closeTarget', targetId=tab.tab_id)
-        while tab.driver.is_running and tab.tab_id in self._all_drivers:
-            sleep(.01)
+        tab_id = tab if isinstance(tab, str) else tab.tab_id
+        if tab_id not in self._targets:
+            if isinstance(tab, str):
+                raise RuntimeError(_S._lang.join(_S._lang.NO_SUCH_TAB, ARG=tab_id, ALL_TABS=self.tab_ids))
+            return
+        self._run_cdp('Target.closeTarget', targetId=tab_id)
+        self._notifier.wait_for(lambda: tab_id not in self._targets or not self._driver.is_running, self.timeout)
 
     def activate_tab(self, id_ind_tab):
         if isinstance(id_ind_tab, int):
@@ -224,15 +236,18 @@ class Chromium(object):
         elif isinstance(id_ind_tab, ChromiumTab):
             id_ind_tab = id_ind_tab.tab_id
         self._run_cdp('Target.activateTarget', targetId=id_ind_tab)
+        self._targets.activate(id_ind_tab)
 
     def reconnect(self):
         self._disconnect_flag = True
+        if self._scheduler.closed:  # 连接意外断开时已关闭
+            self._scheduler = Scheduler()
+        with Chromium._lock:
+            Chromium._BROWSERS.setdefault(self.id, self)
         self._driver.stop()
-        BrowserDriver.BROWSERS.pop(self.id)
+        BrowserDriver.BROWSERS.pop(self.id, None)
         self._driver = BrowserDriver(self.id, 'browser', self.address, self)
-        self._run_cdp('Target.setDiscoverTargets', discover=True)
-        self._driver.set_callback('Target.targetDestroyed', self._onTargetDestroyed)
-        self._driver.set_callback('Target.targetCreated', self._onTargetCreated)
+        self._listen_targets()
         self._disconnect_flag = False
 
     def clear_cache(self, cache=True, cookies=True):
@@ -243,6 +258,7 @@ class Chromium(object):
             self._run_cdp('Storage.clearCookies')
 
     def quit(self, timeout=5, force=False, del_data=False):
+        self._scheduler.shutdown(timeout=timeout)
         try:
             self._run_cdp('Browser.close')
         except PageDisconnectedError:
@@ -314,11 +330,8 @@ class Chromium(object):
             except CDPError:
                 return _new_tab_by_js(self, url, tab_type, new_window)
 
-        while self.states.is_alive:
-            if tab in self._drivers:
-                break
-            sleep(.01)
-        else:
+        self._notifier.wait_for(lambda: tab in self._targets or not self._driver.is_running)
+        if tab not in self._targets:
             raise BrowserConnectError(_S._lang.BROWSER_DISCONNECTED)
         tab = tab_type(self, tab)
         if url:
@@ -331,7 +344,7 @@ class Chromium(object):
                 id_or_num = self.tab_ids[id_or_num - 1 if id_or_num > 0 else id_or_num]
             elif isinstance(id_or_num, ChromiumTab):
                 return id_or_num.tab_id if as_id else ChromiumTab(self, id_or_num.tab_id)
-            elif id_or_num not in [i['id'] for i in self._driver.get(f'http://{self.address}/json').json()]:
+            elif id_or_num not in self._targets:
                 raise RuntimeError(_S._lang.join(_S._lang.NO_SUCH_TAB, ARG=id_or_num, ALL_TABS=self.tab_ids))
 
         elif title == url is None and tab_type == 'page':
@@ -352,8 +365,6 @@ class Chromium(object):
             return MixTab(self, id_or_num) if mix else ChromiumTab(self, id_or_num)
 
     def _get_tabs(self, title=None, url=None, tab_type='page', mix=True, as_id=False):
-        tabs = self._driver.get(f'http://{self.address}/json').json()  # 不要改用cdp
-
         if isinstance(tab_type, str):
             tab_type = {tab_type}
         elif isinstance(tab_type, (list, tuple, set)):
@@ -362,16 +373,22 @@ class Chromium(object):
             raise ValueError(_S._lang.join(_S._lang.INCORRECT_TYPE_, 'tab_type',
                                            ALLOW_TYPE='set, list, tuple, str, None', CURR_VAL=tab_type))
 
-        tabs = [i for i in tabs if ((title is None or title in i['title']) and (url is None or url in i['url'])
-                                    and (tab_type is None or i['type'] in tab_type)
-                                    and i['title'] != 'chrome-extension://neajdppkdcdipfabeoofebfddakdcjhd/audio.html')]
+        tabs = [i['targetId'] for i in self._targets.infos(tab_type)
+                if (title is None or title in i['title']) and (url is None or url in i['url'])
+                and i['title'] != 'chrome-extension://neajdppkdcdipfabeoofebfddakdcjhd/audio.html']
         if as_id:
-            return [tab['id'] for tab in tabs]
+            return tabs
         with self._lock:
             if mix:
-                return [MixTab(self, tab['id']) for tab in tabs]
+                return [MixTab(self, tab) for tab in tabs]
             else:
-                return [ChromiumTab(self, tab['id']) for tab in tabs]
+                return [ChromiumTab(self, tab) for tab in tabs]
+
+    def metrics(self):
+        drivers = {self._driver}
+        for tab_drivers in list(self._all_drivers.values()):
+            drivers.update(tab_drivers)
+        return merge_metrics(drivers)
 
     def _run_cdp(self, cmd, **cmd_args):
         ignore = cmd_args.pop('_ignore', None)
@@ -379,41 +396,74 @@ class Chromium(object):
         return r if __ERROR__ not in r else raise_error(r, self, ignore)
 
     def _get_driver(self, tab_id, owner=None):
-        d = self._drivers.pop(tab_id, None)
-        if not d:
-            d = Driver(tab_id, 'page', self.address)
+        d = self._new_driver(tab_id)
         d.owner = owner
         self._all_drivers.setdefault(tab_id, set()).add(d)
         return d
 
+    def _new_driver(self, tab_id):
+        return self._driver.attach(tab_id) if self._multiplex else Driver(tab_id, 'page', self.address)
+
+    def _listen_targets(self):
+        """开启目标发现，登记表的激活顺序以/json为准，之后由事件维护"""
+        self._run_cdp('Target.setDiscoverTargets', discover=True)
+        self._driver.set_callback('Target.targetDestroyed', self._onTargetDestroyed)
+        self._driver.set_callback('Target.targetCreated', self._onTargetCreated)
+        self._driver.set_callback('Target.targetInfoChanged', self._onTargetInfoChanged)
+        self._targets.sync(self._json())  # cdp返回的顺序不是激活顺序
+
+    def _json(self):
+        """返回/json接口的目标列表，管道连接没有http接口，改用Target.getTargets"""
+        if self._chromium_options.is_pipe:
+            return [{'id': i['targetId'], 'type': i['type'], 'title': i['title'], 'url': i['url']}
+                    for i in self._run_cdp('Target.getTargets')['targetInfos']]
+        return self._driver.get(f'http://{self.address}/json').json()
+
+    def _close_target(self, tab_id):
+        try:
+            self._run_cdp('Target.closeTarget', targetId=tab_id)
+        except (CDPError, PageDisconnectedError):
+            pass
+
     def _onTargetCreated(self, **kwargs):
-        if (kwargs['targetInfo']['type'] in ('page', 'webview')
-                and kwargs['targetInfo']['targetId'] not in self._all_drivers
-                and not kwargs['targetInfo']['url'].startswith('devtools://')):
-            try:
-                tab_id = kwargs['targetInfo']['targetId']
-                self._frames[tab_id] = tab_id
-                d = Driver(tab_id, 'page', self.address)
-                self._relation[tab_id] = kwargs['targetInfo'].get('openerId', None)
-                self._drivers[tab_id] = d
-                self._all_drivers.setdefault(tab_id, set()).add(d)
-                self._newest_tab_id = tab_id
-            except WebSocketBadStatusException:
-                pass
+        info = kwargs['targetInfo']
+        if self._targets.should_close(info):
+            self._scheduler.submit(self._close_target, info['targetId'])
+            return
+        # 不在此时连接标签页，获取标签页对象时才连接
+        if (self._targets.on_created(info) and info['type'] in TAB_TYPES
+                and not info['url'].startswith('devtools://')):
+            tab_id = info['targetId']
+            self._frames[tab_id] = tab_id
+            self._relation[tab_id] = info.get('openerId', None)
+            self._newest_tab_id = tab_id
+            self._notifier.notify()
+
+    def _onTargetInfoChanged(self, **kwargs):
+        info = kwargs['targetInfo']
+        if info['targetId'] not in self._all_drivers and self._targets.should_close(info):
+            self._scheduler.submit(self._close_target, info['targetId'])
+        self._targets.on_changed(info)
+        for d in list(self._all_drivers.get(info['targetId'], ())):
+            if isinstance(d.owner, ChromiumBase):
+                d.owner._onTargetInfoChanged(info)
 
     def _onTargetDestroyed(self, **kwargs):
         tab_id = kwargs['targetId']
+        self._targets.on_destroyed(tab_id)
         self._dl_mgr.clear_tab_info(tab_id)
         for key in [k for k, i in self._frames.items() if i == tab_id]:
             self._frames.pop(key, None)
         for d in self._all_drivers.get(tab_id, tuple()):
             d.stop()
-        self._drivers.pop(tab_id, None)
         self._all_drivers.pop(tab_id, None)
         self._relation.pop(tab_id, None)
+        self._notifier.notify()
 
     def _on_disconnect(self):
+        self._notifier.notify()
         if not self._disconnect_flag:
+            self._scheduler.shutdown(wait=False)
             Chromium._BROWSERS.pop(self.id, None)
             if self._chromium_options.is_auto_port and self._chromium_options.user_data_path:
                 path = Path(self._chromium_options.user_data_path)
@@ -436,18 +486,16 @@ def handle_options(addr_or_opts):
     """
     if not addr_or_opts:
         _chromium_options = ChromiumOptions(addr_or_opts)
+        if _chromium_options.is_pipe and not _chromium_options.user_data_path and not _chromium_options.is_auto_port:
+            _chromium_options.auto_port()
         if _chromium_options.is_auto_port:
-            port, path = PortFinder(_chromium_options.tmp_path).get_port(_chromium_options.is_auto_port)
-            _chromium_options.set_address(f'127.0.0.1:{port}')
-            _chromium_options.set_user_data_path(path)
-            _chromium_options.auto_port(scope=_chromium_options.is_auto_port)
+            _set_auto_port(_chromium_options)
 
     elif isinstance(addr_or_opts, ChromiumOptions):
+        if addr_or_opts.is_pipe and not addr_or_opts.user_data_path and not addr_or_opts.is_auto_port:
+            addr_or_opts.auto_port()
         if addr_or_opts.is_auto_port:
-            port, path = PortFinder(addr_or_opts.tmp_path).get_port(addr_or_opts.is_auto_port)
-            addr_or_opts.set_address(f'127.0.0.1:{port}')
-            addr_or_opts.set_user_data_path(path)
-            addr_or_opts.auto_port(scope=addr_or_opts.is_auto_port)
+            _set_auto_port(addr_or_opts)
         _chromium_options = addr_or_opts
 
     elif isinstance(addr_or_opts, str) and ':' in addr_or_opts:
@@ -465,8 +513,23 @@ def handle_options(addr_or_opts):
     return _chromium_options
 
 
+def _set_auto_port(chromium_options):
+    """为自动端口的配置分配端口和用户文件夹，未指定端口范围时由浏览器自行选择端口"""
+    finder = PortFinder(chromium_options.tmp_path)
+    scope = chromium_options.is_auto_port
+    if scope is True or chromium_options.is_pipe:
+        port, path = 0, finder.new_user_path(chromium_options.is_pipe)
+    else:
+        port, path = finder.get_port(scope)
+    chromium_options.set_address(f'127.0.0.1:{port}')
+    chromium_options.set_user_data_path(path)
+    chromium_options.auto_port(scope=scope)
+
+
 def run_browser(chromium_options):
     """连接浏览器"""
+    if chromium_options.is_pipe or chromium_options.address.startswith('pipe:'):
+        return connect_pipe_browser(chromium_options)
     is_exists = connect_browser(chromium_options)
     try:
         s = Session()
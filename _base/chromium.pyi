@@ -8,7 +8,7 @@
 from threading import Lock
 from typing import List, Optional, Set, Dict, Union, Tuple, Literal, Any
 
-from .driver import BrowserDriver, Driver
+from .driver import BrowserDriver, Driver, SessionDriver
 from .._configs.chromium_options import ChromiumOptions
 from .._configs.session_options import SessionOptions
 from .._functions.cookies import CookiesList
@@ -16,8 +16,12 @@ from .._pages.chromium_base import Timeout, ChromiumBase
 from .._pages.chromium_tab import ChromiumTab
 from .._pages.mix_tab import MixTab
 from .._units.downloader import DownloadManager
+from .._units.notifier import Notifier
+from .._units.scheduler import Scheduler
 from .._units.setter import BrowserSetter
 from .._units.states import BrowserStates
+from .._units.tab_pool import TabPool
+from .._units.targets import TargetRegistry
 from .._units.waiter import BrowserWaiter
 
 
@@ -38,13 +42,13 @@ class Chromium(object):
     _session_options: SessionOptions = ...
     _driver: BrowserDriver = ...
     _frames: dict = ...
-    _drivers: Dict[str, Driver] = ...
     _all_drivers: Dict[str, Set[Driver]] = ...
     _relation: Dict[str, Optional[str]] = ...
     _process_id: Optional[int] = ...
     _dl_mgr: DownloadManager = ...
     _timeouts: Timeout = ...
     _load_mode: str = ...
+    _multiplex: bool = ...
     _download_path: str = ...
     _auto_handle_alert: Optional[bool] = ...
     _is_exists: bool = ...
@@ -53,6 +57,9 @@ class Chromium(object):
     _none_ele_return_value: bool = ...
     _none_ele_value: Any = ...
     _newest_tab_id: Optional[str] = ...
+    _notifier: Notifier = ...
+    _scheduler: Scheduler = ...
+    _targets: TargetRegistry = ...
 
     def __new__(cls,
                 addr_or_opts: Union[str, int, ChromiumOptions] = None,
@@ -116,6 +123,11 @@ class Chromium(object):
         """返回用于等待的对象"""
         ...
 
+    @property
+    def scheduler(self) -> Scheduler:
+        """返回库内后台任务使用的调度器，可通过其stats属性查看线程和队列情况"""
+        ...
+
     @property
     def tabs_count(self) -> int:
         """返回标签页数量，只统计page、webview类型"""
@@ -123,7 +135,7 @@ class Chromium(object):
 
     @property
     def tab_ids(self) -> List[str]:
-        """返回所有标签页id组成的列表，只统计page、webview类型"""
+        """返回所有标签页id组成的列表，按激活顺序排列，只统计page、webview类型，由Target域事件维护，不发送请求"""
         ...
 
     @property
@@ -153,6 +165,15 @@ class Chromium(object):
         """
         ...
 
+    def new_tab_pool(self, size: int = 4, new_context: bool = False, clear_cookies: bool = None) -> TabPool:
+        """新建一个标签页池，预先创建size个就绪的标签页供借出和归还
+        :param size: 保持就绪的空闲标签页数量
+        :param new_context: 是否每个标签页使用独立环境，cookies和存储互不影响
+        :param clear_cookies: 归还时是否清除cookies，为None时独立环境下清除；非独立环境会清除整个浏览器的cookies
+        :return: TabPool对象
+        """
+        ...
+
     def get_tab(self,
                 id_or_num: Union[str, int] = None,
                 title: str = None,
@@ -220,7 +241,7 @@ class Chromium(object):
         ...
 
     def quit(self, timeout: float = 5, force: bool = False, del_data: bool = False) -> None:
-        """关闭浏览器
+        """关闭浏览器，同时关闭后台任务调度器
         :param timeout: 等待浏览器关闭超时时间（秒）
         :param force: 是否立刻强制终止进程
         :param del_data: 是否删除用户文件夹
@@ -278,6 +299,12 @@ class Chromium(object):
         """
         ...
 
+    def metrics(self) -> dict:
+        """返回浏览器及所有标签页连接的cdp调用统计，需先用Settings.set_cdp_metrics()开启
+        :return: 包含methods、events、queues等键的dict
+        """
+        ...
+
     def _run_cdp(self, cmd, **cmd_args) -> dict:
         """执行Chrome DevTools Protocol语句
         :param cmd: 协议项目
@@ -294,8 +321,29 @@ class Chromium(object):
         """
         ...
 
+    def _new_driver(self, tab_id: str) -> Union[Driver, SessionDriver]:
+        """为指定target新建连接，multiplex模式下返回共用浏览器连接的SessionDriver
+        :param tab_id: 标签页id
+        :return: Driver或SessionDriver对象
+        """
+        ...
+
+    def _listen_targets(self) -> None:
+        """开启目标发现并绑定Target域事件，用/json结果初始化目标登记表的激活顺序"""
+        ...
+
+    def _json(self) -> List[dict]:
+        """返回/json接口的目标列表，管道连接没有http接口，改用Target.getTargets"""
+        ...
+
+    def _close_target(self, tab_id: str) -> None:
+        """不连接标签页直接关闭它，忽略已关闭的"""
+        ...
+
     def _onTargetCreated(self, **kwargs): ...
 
+    def _onTargetInfoChanged(self, **kwargs): ...
+
     def _onTargetDestroyed(self, **kwargs): ...
 
     def _on_disconnect(self): ...
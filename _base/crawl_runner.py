@@ -0,0 +1,268 @@
+# -*- coding:utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Website  : https://DrissionPage.cn
+@Copyright: (c) 2020 by g1879, Inc. All Rights Reserved.
+"""
+from collections import deque
+from json import dumps
+from multiprocessing import get_context
+from os import cpu_count
+from pathlib import Path
+from pickle import dumps as pickle_dumps
+from queue import Empty
+from threading import Thread
+
+from .browser_pool import BrowserPool, _default_options
+from .._functions.settings import Settings as _S
+
+
+class CrawlRunner(object):
+    """多进程执行器，每个工作进程拥有自己的浏览器，主进程分发任务并汇总结果，进程崩溃时重启并重新分发未完成的任务"""
+
+    def __init__(self, func, processes=None, options_factory=None, browsers_per_process=1, tabs_per_browser=4,
+                 retries=1, mp_context=None):
+        self.func = func
+        self.processes = processes or cpu_count() or 1
+        self.options_factory = options_factory
+        self.browsers_per_process = browsers_per_process
+        self.tabs_per_browser = tabs_per_browser
+        self.retries = retries
+        self._ctx = get_context(mp_context)
+        self.restarts = 0
+
+    def __repr__(self):
+        return f'<CrawlRunner processes={self.processes} browsers_per_process={self.browsers_per_process}>'
+
+    def run(self, urls, ordered=False, return_exceptions=False):
+        """在工作进程中执行func(tab, url)，逐个返回结果"""
+        for i, url, ok, value in self._results(urls, ordered):
+            if not ok and not return_exceptions:
+                raise value
+            yield value
+
+    def run_to(self, path, urls, ordered=False, fmt=None, batch_size=1000):
+        """执行任务并把结果逐条写入jsonl或arrow文件，返回写入的记录数"""
+        path = Path(path)
+        fmt = fmt or ('arrow' if path.suffix in ('.arrow', '.feather', '.ipc') else 'jsonl')
+        if fmt not in ('jsonl', 'arrow'):
+            raise ValueError(_S._lang.join(_S._lang.INCORRECT_VAL_, 'fmt', ALLOW_VAL="'jsonl', 'arrow'", CURR_VAL=fmt))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        records = ({'index': i, 'url': str(url), 'result': value if ok else None, 'error': None if ok else repr(value)}
+                   for i, url, ok, value in self._results(urls, ordered))
+        return _write_arrow(path, records, batch_size) if fmt == 'arrow' else _write_jsonl(path, records, batch_size)
+
+    def _results(self, urls, ordered):
+        """返回(序号, url, 是否成功, 结果或异常)生成器"""
+        items = iter(enumerate(urls))
+        results = self._ctx.Queue()
+        workers = [_Worker(self, n, results) for n in range(self.processes)]
+        capacity = self.browsers_per_process * self.tabs_per_browser * 2
+        outstanding = {}  # 已分发未完成的任务
+        owners = {}
+        crashes = {}
+        retry = deque()
+        pending = {}
+        next_i = 0
+        exhausted = False
+        try:
+            for w in workers:
+                w.start()
+
+            while True:
+                for w in workers:
+                    while len(w.assigned) < capacity:
+                        while retry and retry[0] not in outstanding:
+                            retry.popleft()
+                        if retry:
+                            i = retry.popleft()
+                            url = outstanding[i]
+                        elif not exhausted:
+                            try:
+                                i, url = next(items)
+                            except StopIteration:
+                                exhausted = True
+                                break
+                            outstanding[i] = url
+                        else:
+                            break
+                        w.assigned.add(i)
+                        owners[i] = w
+                        w.tasks.put((i, url))
+
+                if exhausted and not outstanding:
+                    break
+
+                got = []
+                try:
+                    got.append(results.get(timeout=.5))
+                except Empty:
+                    pass
+
+                for w in workers:
+                    if w.alive:
+                        continue
+                    for i in w.assigned:
+                        crashes[i] = crashes.get(i, 0) + 1
+                        if crashes[i] > self.retries:
+                            got.append((i, False, RuntimeError(_S._lang.join(_S._lang.WORKER_CRASHED))))
+                        else:
+                            retry.append(i)
+                    w.restart()
+                    self.restarts += 1
+
+                for i, ok, value in got:
+                    if i < 0:  # 工作进程启动失败
+                        raise value
+                    if i not in outstanding:  # 崩溃前已发出的结果，任务已由其它进程完成
+                        continue
+                    url = outstanding.pop(i)
+                    owner = owners.pop(i, None)
+                    if owner is not None:
+                        owner.assigned.discard(i)
+                    if not ordered:
+                        yield i, url, ok, value
+                        continue
+                    pending[i] = (i, url, ok, value)
+                    while next_i in pending:
+                        yield pending.pop(next_i)
+                        next_i += 1
+
+        finally:
+            for w in workers:
+                w.stop()
+            results.close()
+            results.cancel_join_thread()
+
+
+class _Worker(object):
+    """主进程中对一个工作进程的记录"""
+
+    def __init__(self, runner, index, results):
+        self.runner = runner
+        self.index = index
+        self.results = results
+        self.process = None
+        self.tasks = None
+        self.assigned = set()
+
+    @property
+    def alive(self):
+        return self.process.is_alive()
+
+    def start(self):
+        r = self.runner
+        ctx = r._ctx
+        self.tasks = ctx.Queue()
+        self.process = ctx.Process(target=_worker_main, daemon=True,
+                                   args=(self.index, r.func, r.options_factory, r.browsers_per_process,
+                                         r.tabs_per_browser, r.retries, self.tasks, self.results))
+        self.process.start()
+
+    def restart(self):
+        self.process.join(1)
+        self.tasks.close()
+        self.tasks.cancel_join_thread()
+        self.assigned.clear()
+        self.start()
+
+    def stop(self):
+        if self.process is None:
+            return
+        if self.process.is_alive():
+            for _ in range(self.runner.browsers_per_process * self.runner.tabs_per_browser):
+                self.tasks.put(None)
+            self.process.join(10)
+            if self.process.is_alive():
+                self.process.terminate()
+                self.process.join(1)
+        self.tasks.close()
+        self.tasks.cancel_join_thread()
+
+
+def _worker_main(index, func, factory, browsers, tabs, retries, tasks, results):
+    """工作进程入口"""
+    base = index * browsers
+    factory = factory or _default_options
+    try:
+        pool = BrowserPool(browsers, lambda i: factory(base + i), tabs_per_browser=tabs)
+    except Exception as e:
+        results.put((-1, False, _picklable(e)))
+        return
+
+    def work():
+        while True:
+            task = tasks.get()
+            if task is None:
+                return
+            i, url = task
+            try:
+                ok, value = pool._run(func, url, retries)
+            except Exception as e:
+                ok, value = False, e
+            results.put((i, ok, _picklable(value)))
+
+    threads = [Thread(target=work, daemon=True) for _ in range(browsers * tabs)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    pool.close()
+
+
+def _picklable(value):
+    """不能序列化的结果转为RuntimeError"""
+    try:
+        pickle_dumps(value)
+        return value
+    except Exception as e:
+        return RuntimeError(f'{value!r} ({e})')
+
+
+def _write_jsonl(path, records, batch_size):
+    num = 0
+    with open(path, 'w', encoding='utf-8') as f:
+        for r in records:
+            f.write(dumps(r, ensure_ascii=False, default=str))
+            f.write('\n')
+            num += 1
+            if num % batch_size == 0:
+                f.flush()
+    return num
+
+
+def _write_arrow(path, records, batch_size):
+    from pyarrow import RecordBatch, OSFile
+    from pyarrow.ipc import new_stream
+
+    num = 0
+    writer = None
+    batch = []
+    with OSFile(str(path), 'wb') as sink:
+        try:
+            for r in records:
+                batch.append(r)
+                if len(batch) < batch_size:
+                    continue
+                writer = _write_batch(sink, writer, batch, RecordBatch, new_stream)
+                num += len(batch)
+                batch = []
+            if batch:
+                writer = _write_batch(sink, writer, batch, RecordBatch, new_stream)
+                num += len(batch)
+        finally:
+            if writer is not None:
+                writer.close()
+    return num
+
+
+def _write_batch(sink, writer, batch, RecordBatch, new_stream):
+    """写入一批记录，后续批次沿用第一批推断出的schema"""
+    if writer is None:
+        batch = RecordBatch.from_pylist(batch)
+        writer = new_stream(sink, batch.schema)
+    else:
+        batch = RecordBatch.from_pylist(batch, schema=writer.schema)
+    writer.write_batch(batch)
+    return writer
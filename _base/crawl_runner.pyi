@@ -0,0 +1,123 @@
+# -*- coding:utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Website  : https://DrissionPage.cn
+@Copyright: (c) 2020 by g1879, Inc. All Rights Reserved.
+"""
+from multiprocessing import Process, Queue
+from multiprocessing.context import BaseContext
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, Literal, Optional, Set, Tuple, Union
+
+from .._configs.chromium_options import ChromiumOptions
+from .._pages.chromium_tab import ChromiumTab
+from .._pages.mix_tab import MixTab
+
+
+class CrawlRunner(object):
+    func: Callable[[Union[MixTab, ChromiumTab], Any], Any]
+    processes: int
+    options_factory: Optional[Callable[[int], Union[ChromiumOptions, str, int]]]
+    browsers_per_process: int
+    tabs_per_browser: int
+    retries: int
+    restarts: int
+    _ctx: BaseContext
+
+    def __init__(self,
+                 func: Callable[[Union[MixTab, ChromiumTab], Any], Any],
+                 processes: int = None,
+                 options_factory: Callable[[int], Union[ChromiumOptions, str, int]] = None,
+                 browsers_per_process: int = 1,
+                 tabs_per_browser: int = 4,
+                 retries: int = 1,
+                 mp_context: Literal['fork', 'spawn', 'forkserver'] = None):
+        """多进程执行器，每个工作进程拥有自己的浏览器，主进程分发任务并汇总结果，进程崩溃时重启并重新分发未完成的任务
+        :param func: 接收标签页对象和url的方法，须能被pickle（模块级函数）
+        :param processes: 工作进程数量，为None时使用CPU核心数
+        :param options_factory: 接收浏览器全局序号，返回用于创建Chromium对象的参数，须能被pickle，为None时自动分配端口
+        :param browsers_per_process: 每个工作进程的浏览器数量
+        :param tabs_per_browser: 每个浏览器同时执行的任务数
+        :param retries: 浏览器断开或工作进程崩溃时重试任务的次数
+        :param mp_context: multiprocessing启动方式，为None时使用系统默认
+        """
+        ...
+
+    def run(self,
+            urls: Iterable[Any],
+            ordered: bool = False,
+            return_exceptions: bool = False) -> Iterator[Any]:
+        """在工作进程中执行func(tab, url)，逐个返回结果
+        :param urls: url或任务参数组成的可迭代对象，按需读取，元素须能被pickle
+        :param ordered: 是否按输入顺序返回，为False时按完成顺序返回
+        :param return_exceptions: 为True时把异常作为结果返回，否则直接抛出
+        :return: 结果生成器
+        """
+        ...
+
+    def run_to(self,
+               path: Union[str, Path],
+               urls: Iterable[Any],
+               ordered: bool = False,
+               fmt: Literal['jsonl', 'arrow'] = None,
+               batch_size: int = 1000) -> int:
+        """执行任务并把结果逐条写入jsonl或arrow文件，每条记录包含index、url、result、error字段
+        :param path: 文件路径
+        :param urls: url或任务参数组成的可迭代对象
+        :param ordered: 是否按输入顺序写入
+        :param fmt: 文件格式，为None时根据后缀判断，.arrow、.feather、.ipc为arrow，其它为jsonl；arrow格式需安装pyarrow
+        :param batch_size: 每写入多少条刷新一次文件
+        :return: 写入的记录数
+        """
+        ...
+
+    def _results(self, urls: Iterable[Any], ordered: bool) -> Iterator[Tuple[int, Any, bool, Any]]:
+        """返回(序号, url, 是否成功, 结果或异常)生成器"""
+        ...
+
+
+class _Worker(object):
+    runner: CrawlRunner
+    index: int
+    results: Queue
+    process: Optional[Process]
+    tasks: Optional[Queue]
+    assigned: Set[int]
+
+    def __init__(self, runner: CrawlRunner, index: int, results: Queue): ...
+
+    @property
+    def alive(self) -> bool: ...
+
+    def start(self) -> None: ...
+
+    def restart(self) -> None: ...
+
+    def stop(self) -> None: ...
+
+
+def _worker_main(index: int,
+                 func: Callable,
+                 factory: Optional[Callable],
+                 browsers: int,
+                 tabs: int,
+                 retries: int,
+                 tasks: Queue,
+                 results: Queue) -> None:
+    """工作进程入口"""
+    ...
+
+
+def _picklable(value: Any) -> Any:
+    """不能序列化的结果转为RuntimeError"""
+    ...
+
+
+def _write_jsonl(path: Path, records: Iterable[dict], batch_size: int) -> int: ...
+
+
+def _write_arrow(path: Path, records: Iterable[dict], batch_size: int) -> int: ...
+
+
+def _write_batch(sink, writer, batch: list, RecordBatch, new_stream): ...
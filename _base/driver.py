@@ -5,9 +5,11 @@
 @Website  : https://DrissionPage.cn
 @Copyright: (c) 2020 by g1879, Inc. All Rights Reserved.
 """
-from json import dumps, loads, JSONDecodeError
+from collections import deque
+from itertools import count
 from queue import Queue, Empty
-from threading import Thread
+from sys import excepthook, exc_info
+from threading import Thread, Lock, Event, current_thread
 from time import perf_counter, sleep
 
 from requests import Session
@@ -15,7 +17,9 @@ from requests import adapters
 from websocket import (WebSocketTimeoutException, WebSocketConnectionClosedException, create_connection,
                        WebSocketException, WebSocketBadStatusException)
 
+from .pipe import PipeConnection
 from .._functions.settings import Settings as _S
+from .._units.metrics import CDPMetrics, merge_metrics
 from ..errors import PageDisconnectedError, BrowserConnectError
 
 adapters.DEFAULT_RETRIES = 5
@@ -30,85 +34,212 @@ class Driver(object):
         self.alert_flag = False  # 标记alert出现，跳过一条请求后复原
 
         self._websocket_url = f'ws://{address}/devtools/{tab_type}/{tab_id}'
-        self._cur_id = 0
+        self._ids = count(1)  # 多个线程同时发送时next()不会取到重复的id
         self._ws = None
 
         self._recv_th = Thread(target=self._recv_loop)
         self._handle_event_th = Thread(target=self._handle_event_loop)
         self._recv_th.daemon = True
         self._handle_event_th.daemon = True
-        self._handle_immediate_event_th = None
 
         self.is_running = False
 
         self.event_handlers = {}
         self.immediate_event_handlers = {}
+        self.watchers = {}  # 在接收线程中同步执行的事件处理方法
         self.method_results = {}
+        self._free_slots = []
         self.event_queue = Queue()
-        self.immediate_event_queue = Queue()
+        self._immediate = self._immediate_worker()
+        self._immediate_lock = Lock()
+        self.immediate_event_queue = self._immediate  # 只用于qsize()
+        self._lanes = {}
+        self._event_lanes = {}
+        self.dispatched_events = 0
+        self.dropped_events = 0
+        self.metrics = CDPMetrics() if _S.cdp_metrics else None
 
         self.start()
 
     def _send(self, message, timeout=None):
-        self._cur_id += 1
-        ws_id = self._cur_id
+        start = perf_counter()
+        end_time = start + timeout if timeout is not None else None
+        ws_id, slot = self._post(message)
+        if slot is None:
+            result = {'error': {'message': 'connection disconnected'}, 'type': 'connection_error'}
+        elif timeout == 0:
+            self._release_slot(ws_id, slot)
+            return {'id': ws_id, 'result': {}}
+        else:
+            result = self._collect(ws_id, slot, end_time)
+        if self.metrics is not None:
+            self.metrics.on_done(message['method'], perf_counter() - start, result)
+        return result
+
+    def _send_many(self, messages, timeout=None):
+        """一次写出全部指令，再依次收集结果"""
+        start = perf_counter()
+        end_time = start + timeout if timeout is not None else None
+        posted = [self._post(message) for message in messages]
+        results = []
+        for ws_id, slot in posted:
+            if slot is None:
+                results.append({'error': {'message': 'connection disconnected'}, 'type': 'connection_error'})
+            elif timeout == 0:
+                self._release_slot(ws_id, slot)
+                results.append({'id': ws_id, 'result': {}})
+            else:
+                results.append(self._collect(ws_id, slot, end_time))
+        if self.metrics is not None and timeout != 0:
+            latency = perf_counter() - start
+            for message, result in zip(messages, results):
+                self.metrics.on_done(message['method'], latency, result)
+        return results
+
+    def _post(self, message):
+        """写出一条指令，返回其id和等待位，写出失败时等待位为None"""
+        ws_id = next(self._ids)
         message['id'] = ws_id
-        message_json = dumps(message)
+        message_json = _S.json_dumps(message)
 
-        end_time = perf_counter() + timeout if timeout is not None else None
-        self.method_results[ws_id] = Queue()
+        try:
+            slot = self._free_slots.pop()
+        except IndexError:
+            slot = ResponseSlot()
+        slot.id = ws_id
+        slot.alert_sensitive = message['method'].startswith(('Input.', 'Runtime.'))
+        if self.metrics is not None:
+            slot.method = message['method']
+            self.metrics.on_sent(slot.method, len(message_json))
+        self.method_results[ws_id] = slot
         try:
             self._ws.send(message_json)
-            if timeout == 0:
-                self.method_results.pop(ws_id, None)
-                return {'id': ws_id, 'result': {}}
-
-        except (OSError, WebSocketConnectionClosedException):
-            self.method_results.pop(ws_id, None)
-            return {'error': {'message': 'connection disconnected'}, 'type': 'connection_error'}
-
-        while self.is_running:
-            try:
-                result = self.method_results[ws_id].get(timeout=.2)
-                self.method_results.pop(ws_id, None)
-                return result
-
-            except Empty:
-                if self.alert_flag and message['method'].startswith(('Input.', 'Runtime.')):
-                    return {'error': {'message': 'alert exists.'}, 'type': 'alert_exists'}
-
-                if timeout is not None and perf_counter() > end_time:
-                    self.method_results.pop(ws_id, None)
-                    return {'error': {'message': 'alert exists.'}, 'type': 'alert_exists'} \
-                        if self.alert_flag else {'error': {'message': 'timeout'}, 'type': 'timeout'}
-
-                continue
-
-        return {'error': {'message': 'connection disconnected'}, 'type': 'connection_error'}
+        except (OSError, WebSocketConnectionClosedException, AttributeError):
+            self._release_slot(ws_id, slot)
+            return ws_id, None
+        return ws_id, slot
+
+    def _collect(self, ws_id, slot, end_time):
+        """等待一条已写出指令的结果"""
+        while True:
+            if slot.alert_sensitive and self.alert_flag:  # 弹窗已存在时只等一小段时间
+                wait_time = .2 if end_time is None else min(.2, end_time - perf_counter())
+            else:
+                wait_time = None if end_time is None else end_time - perf_counter()
+
+            if slot.wait(wait_time):
+                if slot.result is not None:
+                    return self._release_slot(ws_id, slot)
+                slot.clear()  # 被弹窗或断开唤醒
+                if slot.result is not None:
+                    return self._release_slot(ws_id, slot)
+
+            if not self.is_running:
+                self._release_slot(ws_id, slot)
+                return {'error': {'message': 'connection disconnected'}, 'type': 'connection_error'}
+
+            if self.alert_flag and slot.alert_sensitive:
+                result = self._release_slot(ws_id, slot)
+                return result or {'error': {'message': 'alert exists.'}, 'type': 'alert_exists'}
+
+            if end_time is not None and perf_counter() >= end_time:
+                result = self._release_slot(ws_id, slot)
+                return result or ({'error': {'message': 'alert exists.'}, 'type': 'alert_exists'}
+                                  if self.alert_flag else {'error': {'message': 'timeout'}, 'type': 'timeout'})
+
+    def _release_slot(self, ws_id, slot):
+        """收回等待位，返回已收到的结果"""
+        if self.method_results.pop(ws_id, None) is None and self.is_running:  # 接收线程已取走，等它写入结果
+            end_time = perf_counter() + 1
+            while slot.result is None and perf_counter() < end_time:
+                slot.clear()
+                if slot.result is None:
+                    slot.wait(end_time - perf_counter())
+        result = slot.result
+        slot.reset()
+        self._free_slots.append(slot)
+        return result
+
+    def _wake_waiters(self, alert_only=False):
+        for slot in list(self.method_results.values()):
+            if not alert_only or slot.alert_sensitive:
+                slot.wake()
 
     def _recv_loop(self):
         while self.is_running:
             try:
                 # self._ws.settimeout(1)
                 msg_json = self._ws.recv()
-                msg = loads(msg_json)
+                if msg_json.startswith('{"method":"'):  # 先取出事件名，无人处理的事件不做完整解析
+                    if not self._want_event(msg_json[11:msg_json.find('"', 11)], msg_json):
+                        continue
+                msg = _S.json_loads(msg_json)
             except WebSocketTimeoutException:
                 continue
-            except (WebSocketException, OSError, WebSocketConnectionClosedException, JSONDecodeError):
+            except (WebSocketException, OSError, WebSocketConnectionClosedException, ValueError):
                 self._stop()
                 return
 
-            if 'method' in msg:
-                if msg['method'].startswith('Page.javascriptDialog'):
-                    self.alert_flag = msg['method'].endswith('Opening')
-                function = self.immediate_event_handlers.get(msg['method'])
-                if function:
-                    self._handle_immediate_event(function, msg['params'])
+            self._handle_msg(msg, len(msg_json))
+
+    def _want_event(self, method, msg_json):
+        """判断事件是否需要解析，不需要时计入丢弃数"""
+        if (method in self.event_handlers or method in self.immediate_event_handlers or method in self.watchers
+                or method.startswith('Page.javascriptDialog')):
+            return True
+        self.dropped_events += 1
+        if self.metrics is not None:
+            self.metrics.on_event(method, False)
+        return False
+
+    def _handle_msg(self, msg, size=0):
+        if 'method' in msg:
+            if msg['method'].startswith('Page.javascriptDialog'):
+                self.alert_flag = msg['method'].endswith('Opening')
+                if self.alert_flag:
+                    self._wake_waiters(alert_only=True)
+            watcher = self.watchers.get(msg['method'])
+            if watcher:  # 在接收线程中执行，出错不能中断接收
+                try:
+                    watcher(**msg['params'])
+                except Exception:
+                    excepthook(*exc_info())
+            function = self.immediate_event_handlers.get(msg['method'])
+            if function:
+                self.dispatched_events += 1
+                self._handle_immediate_event(function, msg['params'])
+            elif msg['method'] in self.event_handlers:
+                self.dispatched_events += 1
+                lane = self._event_lanes.get(msg['method'])
+                if lane:
+                    lane.put(msg)
                 else:
-                    self.event_queue.put(msg)
+                    self._put_event(msg)
+            elif not watcher:
+                self.dropped_events += 1
+            if self.metrics is not None:
+                self.metrics.on_event(msg['method'], bool(function or watcher) or msg['method'] in self.event_handlers)
+                self.metrics.on_queue(self.event_queue.qsize())
+                self.metrics.on_queue(self.immediate_event_queue.qsize(), immediate=True)
+
+        else:
+            slot = self.method_results.pop(msg.get('id'), None)
+            if slot:
+                if self.metrics is not None:
+                    self.metrics.on_received(slot.method, size)
+                slot.set(msg['id'], msg)
+
+    @property
+    def event_stats(self):
+        """返回已分发和已丢弃的事件数"""
+        return {'dispatched': self.dispatched_events, 'dropped': self.dropped_events}
 
-            elif msg.get('id') in self.method_results:
-                self.method_results[msg['id']].put(msg)
+    def get_metrics(self):
+        """返回本连接的统计数据，未开启统计时返回None"""
+        return merge_metrics((self,)) if self.metrics is not None else None
+
+    def _put_event(self, msg):
+        self.event_queue.put(msg)
 
     def _handle_event_loop(self):
         while self.is_running:
@@ -116,6 +247,8 @@ class Driver(object):
                 event = self.event_queue.get(timeout=1)
             except Empty:
                 continue
+            if event is None:
+                continue
 
             function = self.event_handlers.get(event['method'])
             if function:
@@ -123,20 +256,11 @@ class Driver(object):
 
             self.event_queue.task_done()
 
-    def _handle_immediate_event_loop(self):
-        while not self.immediate_event_queue.empty():
-            function, kwargs = self.immediate_event_queue.get(timeout=1)
-            try:
-                function(**kwargs)
-            except PageDisconnectedError:
-                pass
+    def _immediate_worker(self):
+        return ImmediateWorker()
 
     def _handle_immediate_event(self, function, kwargs):
-        self.immediate_event_queue.put((function, kwargs))
-        if self._handle_immediate_event_th is None or not self._handle_immediate_event_th.is_alive():
-            self._handle_immediate_event_th = Thread(target=self._handle_immediate_event_loop)
-            self._handle_immediate_event_th.daemon = True
-            self._handle_immediate_event_th.start()
+        self._immediate.put(self._immediate_lock, function, kwargs)
 
     def run(self, _method, **kwargs):
         """执行cdp方法
@@ -149,17 +273,45 @@ class Driver(object):
 
         timeout = kwargs.pop('_timeout', _S.cdp_timeout)
         result = self._send({'method': _method, 'params': kwargs}, timeout=timeout)
+        return self._parse_result(result, _method, kwargs, timeout)
+
+    def run_many(self, cmds, _timeout=None):
+        """一次发送多条互不依赖的cdp指令，按顺序返回结果
+        :param cmds: 由(方法名, 参数dict)或方法名组成的列表
+        :param _timeout: 全部指令的总超时时间，为None时使用全局设置
+        :return: 执行结果列表
+        """
+        cmds = [(cmd, {}) if isinstance(cmd, str) else (cmd[0], dict(cmd[1]) if len(cmd) > 1 else {})
+                for cmd in cmds]
+        if not self.is_running:
+            return [{'error': 'connection disconnected', 'type': 'connection_error'} for _ in cmds]
+
+        timeout = _S.cdp_timeout if _timeout is None else _timeout
+        results = self._send_many([{'method': method, 'params': params} for method, params in cmds],
+                                  timeout=timeout)
+        return [self._parse_result(result, method, params, timeout)
+                for result, (method, params) in zip(results, cmds)]
+
+    @staticmethod
+    def _parse_result(result, method, kwargs, timeout):
         if 'result' not in result and 'error' in result:
             kwargs['_timeout'] = timeout
             return {'error': result['error']['message'], 'type': result.get('type', 'call_method_error'),
-                    'method': _method, 'args': kwargs, 'data': result['error'].get('data')}
+                    'method': method, 'args': kwargs, 'data': result['error'].get('data')}
         else:
             return result['result']
 
     def start(self):
         self.is_running = True
         try:
-            self._ws = create_connection(self._websocket_url, enable_multithread=True, suppress_origin=True)
+            if self.address.startswith('pipe:'):
+                self._ws = PipeConnection.get(self.address)
+                if self._ws is None:
+                    raise ConnectionRefusedError
+            else:
+                self._ws = create_connection(self._websocket_url, enable_multithread=True, suppress_origin=True)
+            if _S.cdp_recorder is not None and not _S.cdp_recorder.closed:
+                self._ws = _S.cdp_recorder.wrap(self._ws, self._websocket_url)
         except WebSocketBadStatusException as e:
             if 'Handshake status 403 Forbidden' in str(e):
                 raise EnvironmentError(_S._lang.join(_S._lang.UPGRADE_WS))
@@ -187,18 +339,252 @@ class Driver(object):
             self._ws = None
 
         self.event_handlers.clear()
+        self.watchers.clear()
+        self._wake_waiters()
         self.method_results.clear()
         self.event_queue.queue.clear()
+        self.event_queue.put(None)  # 唤醒事件线程使其退出
+        self._close_lanes()
+        self._immediate.close()
 
         if hasattr(self.owner, '_on_disconnect'):
             self.owner._on_disconnect()
 
-    def set_callback(self, event, callback, immediate=False):
+    def _close_lanes(self):
+        self._event_lanes.clear()
+        lanes = list(self._lanes.values())
+        self._lanes.clear()
+        for lane in lanes:
+            lane.close()
+
+    def set_callback(self, event, callback, immediate=False, lane=None):
         handler = self.immediate_event_handlers if immediate else self.event_handlers
         if callback:
             handler[event] = callback
+            if lane and not immediate:
+                self._event_lanes[event] = self._lanes.get(lane) or self.set_lane(lane)
+            else:
+                self._event_lanes.pop(event, None)
         else:
             handler.pop(event, None)
+            self._event_lanes.pop(event, None)
+
+    def set_watcher(self, event, callback):
+        if callback:
+            self.watchers[event] = callback
+        else:
+            self.watchers.pop(event, None)
+
+    def set_lane(self, name, workers=1, key=None):
+        """创建或修改事件通道，已绑定到该通道的事件改用新设置"""
+        old = self._lanes.get(name)
+        lane = self._lanes[name] = EventLane(self, name, workers, key)
+        if old:
+            for event, l in list(self._event_lanes.items()):
+                if l is old:
+                    self._event_lanes[event] = lane
+            old.close()
+        return lane
+
+
+class ResponseSlot(object):
+    """一条指令的结果等待位，可在Driver内重复使用"""
+
+    def __init__(self):
+        self.id = None  # 当前服务的指令id，复用后旧指令的结果不再写入
+        self.result = None
+        self.alert_sensitive = False
+        self.method = None
+        self._event = Event()
+        self._lock = Lock()
+
+    def set(self, ws_id, result):
+        with self._lock:
+            if ws_id != self.id:
+                return False
+            self.result = result
+            self._event.set()
+            return True
+
+    def wake(self):
+        self._event.set()
+
+    def wait(self, timeout=None):
+        return self._event.wait(None if timeout is None else max(timeout, 0))
+
+    def clear(self):
+        self._event.clear()
+
+    def reset(self):
+        with self._lock:
+            self.id = None
+            self.result = None
+            self._event.clear()
+
+
+class EventLane(object):
+    """事件分发通道，按key把事件分给固定的工作线程，同一key的事件按到达顺序处理"""
+
+    def __init__(self, driver, name, workers=1, key=None):
+        self.driver = driver
+        self.name = name
+        self.key = key
+        self._queues = [Queue() for _ in range(max(workers, 1))]
+        self._threads = [None] * len(self._queues)
+        self._lock = Lock()
+        self._closed = False
+
+    def __repr__(self):
+        return f'<EventLane {self.name} workers={len(self._queues)}>'
+
+    @property
+    def workers(self):
+        return len(self._queues)
+
+    def qsize(self):
+        return sum(q.qsize() for q in self._queues)
+
+    def put(self, msg):
+        i = 0 if len(self._queues) == 1 else hash(
+            self.key(msg['params']) if self.key else msg['method']) % len(self._queues)
+        with self._lock:
+            if self._closed:
+                return
+            self._queues[i].put(msg)
+            if self._threads[i] is None:  # 工作线程按需启动，空闲后退出
+                self._threads[i] = Thread(target=self._loop, args=(i,))
+                self._threads[i].daemon = True
+                self._threads[i].start()
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            for q, t in zip(self._queues, self._threads):
+                q.queue.clear()
+                if t is not None:
+                    q.put(None)
+
+    def _loop(self, i):
+        q = self._queues[i]
+        try:
+            while True:
+                try:
+                    msg = q.get(timeout=1)
+                except Empty:
+                    with self._lock:
+                        if q.empty():
+                            self._threads[i] = None
+                            return
+                    continue
+                if msg is None:
+                    return
+
+                function = self.driver.event_handlers.get(msg['method'])
+                if function:
+                    try:
+                        function(**msg['params'])
+                    except PageDisconnectedError:
+                        pass
+        finally:
+            with self._lock:
+                if self._threads[i] is current_thread():
+                    self._threads[i] = None
+
+
+class ImmediateWorker(object):
+    """处理需立即响应的事件，常驻一个线程，该线程忙时临时增开线程，避免事件被耗时回调长时间阻塞，
+    同一Driver的事件按收到的顺序依次执行"""
+
+    def __init__(self, max_workers=4):
+        self.queue = Queue()  # 有待处理事件的Driver的锁
+        self.max_workers = max_workers
+        self._lock = Lock()
+        self._pending = {}  # {Driver的锁: 待处理的(function, kwargs)}
+        self._size = 0
+        self._threads = 0
+        self._idle = 0
+        self._closed = False
+
+    def __repr__(self):
+        return f'<ImmediateWorker threads={self._threads} queue={self._size}>'
+
+    @property
+    def threads(self):
+        return self._threads
+
+    def qsize(self):
+        """返回待处理的事件数"""
+        return self._size
+
+    def put(self, lock, function, kwargs):
+        """lock为所属Driver的锁，同一Driver的回调不会并行执行"""
+        with self._lock:
+            if self._closed:
+                return
+            self._size += 1
+            pending = self._pending.get(lock)
+            if pending is not None:  # 该Driver已在排队或正在处理
+                pending.append((function, kwargs))
+                return
+            self._pending[lock] = deque(((function, kwargs),))
+            self.queue.put(lock)
+            if self._threads == 0 or (self.queue.qsize() > self._idle and self._threads < self.max_workers):
+                self._threads += 1
+                Thread(target=self._loop, args=(self._threads == 1,), daemon=True).start()
+
+    def close(self):
+        """已收到的事件处理完后停止所有线程"""
+        with self._lock:
+            if not self._closed:
+                self._closed = True
+                self.queue.put(None)
+
+    def _loop(self, resident):
+        while True:
+            with self._lock:
+                self._idle += 1
+            try:
+                lock = self.queue.get(timeout=None if resident else 1)
+            except Empty:
+                with self._lock:
+                    self._idle -= 1
+                    if self.queue.empty():
+                        self._threads -= 1
+                        return
+                continue
+            with self._lock:
+                self._idle -= 1
+
+            if lock is None:
+                self.queue.put(None)  # 让其它线程也退出
+                with self._lock:
+                    self._threads -= 1
+                return
+
+            self._run(lock)
+
+    def _run(self, lock):
+        """依次执行一个Driver的事件，执行一批后排回队尾，避免其它Driver的事件等待过久"""
+        num = 0
+        while True:
+            with self._lock:
+                pending = self._pending[lock]
+                if not pending:
+                    self._pending.pop(lock)
+                    return
+                if num >= 100 and not self._closed:  # 关闭后排入的位置在结束标记之前
+                    self.queue.put(lock)
+                    return
+                function, kwargs = pending.popleft()
+                self._size -= 1
+            num += 1
+            with lock:
+                try:
+                    function(**kwargs)
+                except PageDisconnectedError:
+                    pass
+                except Exception:
+                    excepthook(*exc_info())
 
 
 class BrowserDriver(Driver):
@@ -213,12 +599,55 @@ class BrowserDriver(Driver):
         if hasattr(self, '_created'):
             return
         self._created = True
+        self._sessions = {}
         BrowserDriver.BROWSERS[tab_id] = self
         super().__init__(tab_id, tab_type, address, owner)
 
     def __repr__(self):
         return f'<BrowserDriver {self.id}>'
 
+    def _handle_msg(self, msg, size=0):
+        session_id = msg.get('sessionId')
+        if session_id:
+            session = self._sessions.get(session_id)
+            if session:
+                session._handle_msg(msg, size)
+            return
+
+        if msg.get('method') == 'Target.detachedFromTarget':
+            session = self._sessions.pop(msg['params']['sessionId'], None)
+            if session:
+                session._on_detached()
+
+        super()._handle_msg(msg, size)
+
+    def _want_event(self, method, msg_json):
+        if msg_json.endswith('"}'):  # 浏览器把sessionId写在消息末尾
+            i = msg_json.rfind(',"sessionId":"')
+            if i > 0:
+                session = self._sessions.get(msg_json[i + 14:-2])
+                if session:
+                    return session._want_event(method, msg_json)
+                self.dropped_events += 1
+                return False
+        return method == 'Target.detachedFromTarget' or super()._want_event(method, msg_json)
+
+    def _stop(self):
+        if not self.is_running:
+            return False
+        sessions = list(self._sessions.values())
+        self._sessions.clear()
+        for session in sessions:
+            session.session_id = None
+            session._stop()
+        if BrowserDriver.BROWSERS.get(self.id) is self:  # 已断开的连接不再复用
+            BrowserDriver.BROWSERS.pop(self.id)
+        super()._stop()
+
+    def attach(self, target_id):
+        """以flatten模式附加到target，返回共用本连接的SessionDriver"""
+        return SessionDriver(target_id, 'page', self.address, browser_driver=self)
+
     @staticmethod
     def get(url):
         s = Session()
@@ -228,3 +657,102 @@ class BrowserDriver(Driver):
         r.close()
         s.close()
         return r
+
+
+class SessionDriver(Driver):
+    def __init__(self, tab_id, tab_type, address, owner=None, browser_driver=None):
+        self._browser_driver = browser_driver
+        self.session_id = None
+        self._event_lock = Lock()
+        self._handling_events = False
+        super().__init__(tab_id, tab_type, address, owner)
+
+    def __repr__(self):
+        return f'<SessionDriver {self.id} {self.session_id}>'
+
+    def _immediate_worker(self):
+        # 与浏览器连接共用，避免大量iframe时每个session各占一个线程
+        return self._browser_driver._immediate if self._browser_driver else ImmediateWorker()
+
+    def _post(self, message):
+        message['sessionId'] = self.session_id
+        return super()._post(message)
+
+    def _put_event(self, msg):
+        with self._event_lock:
+            self.event_queue.put(msg)
+            if not self._handling_events:
+                self._handling_events = True
+                self._handle_event_th = Thread(target=self._handle_event_loop)
+                self._handle_event_th.daemon = True
+                self._handle_event_th.start()
+
+    def _handle_event_loop(self):
+        while self.is_running:
+            try:
+                event = self.event_queue.get(timeout=1)
+            except Empty:
+                with self._event_lock:
+                    if self.event_queue.empty():
+                        self._handling_events = False
+                        return
+                continue
+            if event is None:
+                continue
+
+            function = self.event_handlers.get(event['method'])
+            if function:
+                function(**event['params'])
+
+            self.event_queue.task_done()
+
+        with self._event_lock:
+            self._handling_events = False
+
+    def _on_detached(self):
+        function = self.immediate_event_handlers.get('Inspector.detached')
+        if function:
+            self._handle_immediate_event(function, {'reason': 'target_closed'})
+        self.session_id = None
+        self._stop()
+
+    def start(self):
+        if not self._browser_driver or not self._browser_driver.is_running:
+            raise BrowserConnectError(_S._lang.BROWSER_NOT_EXIST)
+        r = self._browser_driver.run('Target.attachToTarget', targetId=self.id, flatten=True)
+        if 'error' in r:
+            return
+        self.session_id = r['sessionId']
+        self._ws = self._browser_driver._ws
+        self.is_running = True
+        self._browser_driver._sessions[self.session_id] = self
+        return True
+
+    def stop(self):
+        self._stop()
+        if self._handle_event_th is not current_thread():
+            while self._handling_events:
+                sleep(.01)
+        return True
+
+    def _stop(self):
+        if not self.is_running:
+            return False
+
+        self.is_running = False
+        if self.session_id:
+            self._browser_driver._sessions.pop(self.session_id, None)
+            self._browser_driver.run('Target.detachFromTarget', sessionId=self.session_id)
+            self.session_id = None
+        self._ws = None
+
+        self.event_handlers.clear()
+        self.watchers.clear()
+        self._wake_waiters()
+        self.method_results.clear()
+        self.event_queue.queue.clear()
+        self.event_queue.put(None)  # 唤醒事件线程使其退出
+        self._close_lanes()
+
+        if hasattr(self.owner, '_on_disconnect'):
+            self.owner._on_disconnect()
@@ -6,13 +6,15 @@
 @Copyright: (c) 2020 by g1879, Inc. All Rights Reserved.
 """
 from queue import Queue
-from threading import Thread
-from typing import Union, Callable, Dict, Optional
+from threading import Thread, Lock, Event
+from typing import Union, Callable, Dict, Optional, List, Tuple, Any, Deque, Iterator
 
 from requests import Response
 from websocket import WebSocket
 
 from .._base.chromium import Chromium
+from .._units.metrics import CDPMetrics
+from .._units.recorder import RecordingWebSocket
 
 
 class Driver(object):
@@ -22,17 +24,25 @@ class Driver(object):
     owner = ...
     alert_flag: bool
     _websocket_url: str
-    _cur_id: int
-    _ws: Optional[WebSocket]
+    _ids: Iterator[int]
+    _ws: Union[WebSocket, RecordingWebSocket, None]
     _recv_th: Thread
     _handle_event_th: Thread
-    _handle_immediate_event_th: Optional[Thread]
     is_running: bool
     event_handlers: dict
     immediate_event_handlers: dict
-    method_results: dict
+    watchers: Dict[str, Callable]
+    method_results: Dict[int, ResponseSlot]
+    _free_slots: List[ResponseSlot]
     event_queue: Queue
-    immediate_event_queue: Queue
+    _immediate: ImmediateWorker
+    _immediate_lock: Lock
+    immediate_event_queue: ImmediateWorker
+    _lanes: Dict[str, EventLane]
+    _event_lanes: Dict[str, EventLane]
+    dispatched_events: int
+    dropped_events: int
+    metrics: Optional[CDPMetrics]
 
     def __init__(self, tab_id: str, tab_type: str, address: str, owner=None):
         """
@@ -51,15 +61,88 @@ class Driver(object):
         """
         ...
 
+    def _send_many(self, messages: List[dict], timeout: float = None) -> List[dict]:
+        """一次写出多条信息，再依次收集浏览器返回的信息
+        :param messages: 发送给浏览器的数据列表
+        :param timeout: 总超时时间，为None表示无限
+        :return: 浏览器返回的数据列表
+        """
+        ...
+
+    def _post(self, message: dict) -> Tuple[int, Optional[ResponseSlot]]:
+        """写出一条信息，不等待返回
+        :param message: 发送给浏览器的数据
+        :return: (消息id, 等待槽)，写出失败时等待槽为None
+        """
+        ...
+
+    def _collect(self, ws_id: int, slot: ResponseSlot, end_time: Optional[float]) -> dict:
+        """等待一条已写出信息的返回数据
+        :param ws_id: 消息id
+        :param slot: 等待槽对象
+        :param end_time: 截止时间，为None表示无限
+        :return: 浏览器返回的数据
+        """
+        ...
+
+    def _release_slot(self, ws_id: int, slot: ResponseSlot) -> Optional[dict]:
+        """注销等待槽并放回复用池
+        :param ws_id: 消息id
+        :param slot: 等待槽对象
+        :return: 槽中保存的返回数据
+        """
+        ...
+
+    def _wake_waiters(self, alert_only: bool = False) -> None:
+        """唤醒正在等待返回数据的线程
+        :param alert_only: 是否只唤醒受弹窗影响的方法
+        :return: None
+        """
+        ...
+
     def _recv_loop(self) -> None:
         """接收浏览器信息的守护线程方法"""
         ...
 
+    def _want_event(self, method: str, msg_json: str) -> bool:
+        """根据事件名判断是否需要完整解析该事件，不需要时计入丢弃数
+        :param method: 事件名
+        :param msg_json: 原始信息文本
+        :return: 是否需要解析
+        """
+        ...
+
+    def _handle_msg(self, msg: dict, size: int = 0) -> None:
+        """分发一条从浏览器收到的信息
+        :param msg: 已解析的信息
+        :param size: 原始信息长度，用于统计
+        :return: None
+        """
+        ...
+
+    def _put_event(self, msg: dict) -> None:
+        """把事件放入事件队列
+        :param msg: 事件信息
+        :return: None
+        """
+        ...
+
+    @property
+    def event_stats(self) -> Dict[str, int]:
+        """返回已分发和已丢弃的事件数，格式：{'dispatched': int, 'dropped': int}"""
+        ...
+
+    def get_metrics(self) -> Optional[dict]:
+        """返回本连接的统计数据，未开启统计时返回None"""
+        ...
+
     def _handle_event_loop(self) -> None:
         """当接收到浏览器信息，执行已绑定的方法"""
         ...
 
-    def _handle_immediate_event_loop(self): ...
+    def _immediate_worker(self) -> ImmediateWorker:
+        """返回处理立即执行动作的ImmediateWorker"""
+        ...
 
     def _handle_immediate_event(self, function: Callable, kwargs: dict):
         """处理立即执行的动作
@@ -77,6 +160,25 @@ class Driver(object):
         """
         ...
 
+    def run_many(self, cmds: List[Union[str, Tuple[str, dict]]], _timeout: float = None) -> List[dict]:
+        """一次发送多条互不依赖的cdp方法，按顺序返回结果
+        :param cmds: 由(cdp方法名, 参数dict)或cdp方法名组成的列表
+        :param _timeout: 全部方法的总超时时间，为None使用全局设置
+        :return: 执行结果列表
+        """
+        ...
+
+    @staticmethod
+    def _parse_result(result: dict, method: str, kwargs: dict, timeout: Optional[float]) -> dict:
+        """把浏览器返回的数据整理成run()的返回格式
+        :param result: 浏览器返回的数据
+        :param method: cdp方法名
+        :param kwargs: cdp参数
+        :param timeout: 超时时间
+        :return: 执行结果
+        """
+        ...
+
     def start(self) -> bool:
         """启动连接"""
         ...
@@ -89,11 +191,172 @@ class Driver(object):
         """中断连接"""
         ...
 
-    def set_callback(self, event: str, callback: Union[Callable, None], immediate: bool = False) -> None:
+    def _close_lanes(self) -> None:
+        """关闭所有事件通道"""
+        ...
+
+    def set_callback(self,
+                     event: str,
+                     callback: Union[Callable, None],
+                     immediate: bool = False,
+                     lane: str = None) -> None:
         """绑定cdp event和回调方法
         :param event: cdp event
         :param callback: 绑定到cdp event的回调方法
         :param immediate: 是否要立即处理的动作
+        :param lane: 处理该事件的通道名称，为None时在公共事件线程处理，通道不存在时以默认设置创建
+        :return: None
+        """
+        ...
+
+    def set_watcher(self, event: str, callback: Union[Callable, None]) -> None:
+        """绑定在接收线程中同步执行的事件处理方法，在此后收到的指令结果返回前执行完毕，
+        用于维护缓存等须与指令结果保持顺序的轻量操作，方法中不能执行cdp指令
+        :param event: cdp event
+        :param callback: 处理方法，为None时解除绑定
+        :return: None
+        """
+        ...
+
+    def set_lane(self, name: str, workers: int = 1, key: Callable[[dict], Any] = None) -> EventLane:
+        """创建或修改事件通道，通道有独立的工作线程，回调耗时不会阻塞其它事件
+        :param name: 通道名称
+        :param workers: 工作线程数量
+        :param key: 接收事件参数，返回分组依据的方法，同一组的事件在同一线程按顺序处理，为None时按事件名分组
+        :return: 通道对象
+        """
+        ...
+
+
+class ResponseSlot(object):
+    id: Optional[int]
+    result: Optional[dict]
+    alert_sensitive: bool
+    method: Optional[str]
+    _event: Event
+    _lock: Lock
+
+    def __init__(self): ...
+
+    def set(self, ws_id: int, result: dict) -> bool:
+        """写入返回数据并唤醒等待线程，槽已改为服务其它指令时丢弃
+        :param ws_id: 返回数据对应的消息id
+        :param result: 浏览器返回的数据
+        :return: 是否已写入
+        """
+        ...
+
+    def wake(self) -> None:
+        """不写入数据，只唤醒等待线程"""
+        ...
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """等待被唤醒
+        :param timeout: 超时时间（秒）
+        :return: 是否被唤醒
+        """
+        ...
+
+    def clear(self) -> None:
+        """清除唤醒标记"""
+        ...
+
+    def reset(self) -> None:
+        """重置状态以便复用"""
+        ...
+
+
+class EventLane(object):
+    driver: Driver
+    name: str
+    key: Optional[Callable[[dict], Any]]
+    _queues: List[Queue]
+    _threads: List[Optional[Thread]]
+    _lock: Lock
+    _closed: bool
+
+    def __init__(self, driver: Driver, name: str, workers: int = 1, key: Callable[[dict], Any] = None):
+        """
+        :param driver: 所属的Driver对象
+        :param name: 通道名称
+        :param workers: 工作线程数量
+        :param key: 接收事件参数，返回分组依据的方法，为None时按事件名分组
+        """
+        ...
+
+    @property
+    def workers(self) -> int:
+        """返回工作线程数量"""
+        ...
+
+    def qsize(self) -> int:
+        """返回等待处理的事件数量"""
+        ...
+
+    def put(self, msg: dict) -> None:
+        """把事件放入对应工作线程的队列，线程未运行时启动
+        :param msg: 事件消息
+        :return: None
+        """
+        ...
+
+    def close(self) -> None:
+        """丢弃未处理的事件并停止工作线程"""
+        ...
+
+    def _loop(self, i: int) -> None:
+        """工作线程，空闲1秒后退出"""
+        ...
+
+
+class ImmediateWorker(object):
+    queue: Queue
+    max_workers: int
+    _lock: Lock
+    _pending: Dict[Lock, Deque[Tuple[Callable, dict]]]
+    _size: int
+    _threads: int
+    _idle: int
+    _closed: bool
+
+    def __init__(self, max_workers: int = 4):
+        """
+        :param max_workers: 最多同时运行的线程数，常驻线程忙时临时增开，空闲后退出
+        """
+        ...
+
+    @property
+    def threads(self) -> int:
+        """返回正在运行的线程数"""
+        ...
+
+    def qsize(self) -> int:
+        """返回待执行的动作数"""
+        ...
+
+    def put(self, lock: Lock, function: Callable, kwargs: dict) -> None:
+        """添加要执行的动作
+        :param lock: 所属Driver的锁，同一Driver的动作按添加顺序依次执行
+        :param function: 要运行的方法
+        :param kwargs: 方法参数
+        :return: None
+        """
+        ...
+
+    def close(self) -> None:
+        """已收到的动作执行完后停止所有线程"""
+        ...
+
+    def _loop(self, resident: bool) -> None:
+        """工作线程
+        :param resident: 是否常驻线程，否则空闲1秒后退出
+        :return: None
+        """
+        ...
+
+    def _run(self, lock: Lock) -> None:
+        """依次执行一个Driver的动作，执行一批后排回队尾
+        :param lock: 所属Driver的锁
         :return: None
         """
         ...
@@ -102,11 +365,19 @@ class Driver(object):
 class BrowserDriver(Driver):
     BROWSERS: Dict[str, Driver] = ...
     owner: Chromium = ...
+    _sessions: Dict[str, SessionDriver] = ...
 
     def __new__(cls, tab_id: str, tab_type: str, address: str, owner: Chromium): ...
 
     def __init__(self, tab_id: str, tab_type: str, address: str, owner: Chromium): ...
 
+    def attach(self, target_id: str) -> SessionDriver:
+        """以flatten模式附加到target，返回共用本连接的SessionDriver
+        :param target_id: 要附加的target id
+        :return: SessionDriver对象
+        """
+        ...
+
     @staticmethod
     def get(url) -> Response:
         """
@@ -114,3 +385,26 @@ class BrowserDriver(Driver):
         :return: Response对象
         """
         ...
+
+
+class SessionDriver(Driver):
+    """通过BrowserDriver的连接收发信息的flatten session，不单独占用websocket和接收线程"""
+    session_id: Optional[str] = ...
+    _browser_driver: BrowserDriver = ...
+    _event_lock: Lock = ...
+    _handling_events: bool = ...
+
+    def __init__(self, tab_id: str, tab_type: str, address: str, owner=None,
+                 browser_driver: BrowserDriver = None):
+        """
+        :param tab_id: 标签页id
+        :param tab_type: 标签页类型
+        :param address: 浏览器连接地址
+        :param owner: 创建这个驱动的对象
+        :param browser_driver: 共用连接的BrowserDriver
+        """
+        ...
+
+    def _on_detached(self) -> None:
+        """target被分离或关闭时执行"""
+        ...
@@ -0,0 +1,155 @@
+# -*- coding:utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Website  : https://DrissionPage.cn
+@Copyright: (c) 2020 by g1879, Inc. All Rights Reserved.
+"""
+from os import close, read, write, pipe, environ, devnull, listdir, get_inheritable, waitpid, O_WRONLY
+from select import select
+from threading import Lock, Thread
+
+from .._functions.settings import Settings as _S
+from ..errors import BrowserConnectError
+
+
+class PipeConnection(object):
+    """通过--remote-debugging-pipe与浏览器通讯，接口与websocket连接相同，消息以NUL分隔"""
+    CONNECTIONS = {}
+
+    def __init__(self, pid, write_fd, read_fd):
+        self.pid = pid
+        self.address = f'pipe:{pid}'
+        self.browser_id = None
+        self.is_headless = False
+        self.closed = False
+        self._write_fd = write_fd
+        self._read_fd = read_fd
+        self._write_lock = Lock()
+        self._read_lock = Lock()
+        self._buffer = bytearray()
+        self._scanned = 0  # 缓冲区中已确认没有NUL的长度
+        self._call_id = 0
+        PipeConnection.CONNECTIONS[self.address] = self
+
+    def __repr__(self):
+        return f'<PipeConnection {self.address}>'
+
+    @classmethod
+    def get(cls, address):
+        """返回地址对应的未关闭连接，没有时返回None"""
+        conn = cls.CONNECTIONS.get(address)
+        return conn if conn and not conn.closed else None
+
+    def send(self, message):
+        data = memoryview(message.encode('utf-8') + b'\0')
+        with self._write_lock:
+            if self.closed:
+                raise BrokenPipeError()
+            while data:
+                data = data[write(self._write_fd, data):]
+
+    def recv(self):
+        with self._read_lock:
+            while True:
+                i = self._buffer.find(b'\0', self._scanned)
+                if i >= 0:
+                    msg = self._buffer[:i].decode('utf-8')
+                    del self._buffer[:i + 1]
+                    self._scanned = 0
+                    return msg
+                self._scanned = len(self._buffer)
+                if self.closed:
+                    self._close_reader()
+                    raise ConnectionResetError()
+                if not select([self._read_fd], [], [], .5)[0]:  # 定时醒来检查是否已关闭
+                    continue
+                chunk = read(self._read_fd, 1 << 20)
+                if chunk:
+                    self._buffer += chunk
+                else:  # 浏览器已退出
+                    self.close()
+
+    def call(self, method, **params):
+        """在Driver接管前同步执行一条cdp指令"""
+        self._call_id -= 1
+        self.send(_S.json_dumps({'id': self._call_id, 'method': method, 'params': params}))
+        while True:
+            msg = _S.json_loads(self.recv())
+            if msg.get('id') == self._call_id:
+                if 'error' in msg:
+                    raise BrowserConnectError(msg['error'].get('message'))
+                return msg['result']
+
+    def close(self):
+        with self._write_lock:
+            if self.closed:
+                return
+            self.closed = True
+            close(self._write_fd)
+        if PipeConnection.CONNECTIONS.get(self.address) is self:
+            PipeConnection.CONNECTIONS.pop(self.address)
+        if self._read_lock.acquire(blocking=False):  # 正在读取时由读取方醒来后关闭
+            try:
+                self._close_reader()
+            finally:
+                self._read_lock.release()
+
+    def _close_reader(self):
+        if self._read_fd is not None:
+            close(self._read_fd)
+            self._read_fd = None
+
+
+def launch_pipe_browser(path, args):
+    """以--remote-debugging-pipe启动浏览器，浏览器从fd 3读取指令，向fd 4写出结果
+    :param path: 浏览器可执行文件路径
+    :param args: 启动参数
+    :return: PipeConnection对象
+    """
+    try:
+        from fcntl import fcntl, F_DUPFD_CLOEXEC
+        from os import posix_spawnp, POSIX_SPAWN_CLOSE, POSIX_SPAWN_DUP2, POSIX_SPAWN_OPEN
+    except ImportError:
+        raise EnvironmentError(_S._lang.join(_S._lang.PIPE_POSIX_ONLY))
+
+    to_browser_r, to_browser_w = pipe()
+    from_browser_r, from_browser_w = pipe()
+    # 先移到3、4以上，避免dup2到3时覆盖要放到4的一端；用posix_spawn的文件操作在子进程中摆放fd，
+    # 不用preexec_fn，多线程同时启动时不会死锁
+    r = fcntl(to_browser_r, F_DUPFD_CLOEXEC, 5)
+    w = fcntl(from_browser_w, F_DUPFD_CLOEXEC, 5)
+    actions = [(POSIX_SPAWN_CLOSE, fd) for fd in _inheritable_fds() if fd > 2]  # 只留下0、1、2和3、4
+    actions.extend(((POSIX_SPAWN_DUP2, r, 3), (POSIX_SPAWN_DUP2, w, 4),
+                    (POSIX_SPAWN_OPEN, 1, devnull, O_WRONLY, 0), (POSIX_SPAWN_OPEN, 2, devnull, O_WRONLY, 0)))
+    try:
+        pid = posix_spawnp(path, [path, '--remote-debugging-pipe', *args], environ, file_actions=actions)
+    except BaseException:
+        for fd in (to_browser_w, from_browser_r):
+            close(fd)
+        raise
+    finally:
+        for fd in (to_browser_r, from_browser_w, r, w):
+            close(fd)
+    Thread(target=_reap, args=(pid,), daemon=True).start()
+    return PipeConnection(pid, to_browser_w, from_browser_r)
+
+
+def _inheritable_fds():
+    """返回本进程中会被子进程继承的fd"""
+    fds = []
+    for i in listdir('/dev/fd'):
+        try:
+            if get_inheritable(int(i)):
+                fds.append(int(i))
+        except (OSError, ValueError):  # listdir()自身用过的fd已关闭
+            pass
+    return fds
+
+
+def _reap(pid):
+    """等待浏览器进程退出并回收，避免留下僵尸进程"""
+    try:
+        waitpid(pid, 0)
+    except ChildProcessError:
+        pass
@@ -0,0 +1,92 @@
+# -*- coding:utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Website  : https://DrissionPage.cn
+@Copyright: (c) 2020 by g1879, Inc. All Rights Reserved.
+"""
+from threading import Lock
+from typing import Dict, List, Optional
+
+
+class PipeConnection(object):
+    CONNECTIONS: Dict[str, PipeConnection] = ...
+    pid: int
+    address: str
+    browser_id: Optional[str]
+    is_headless: bool
+    closed: bool
+    _write_fd: int
+    _read_fd: Optional[int]
+    _write_lock: Lock
+    _read_lock: Lock
+    _buffer: bytearray
+    _scanned: int
+    _call_id: int
+
+    def __init__(self, pid: int, write_fd: int, read_fd: int):
+        """通过--remote-debugging-pipe与浏览器通讯，接口与websocket连接相同，消息以NUL分隔
+        :param pid: 浏览器进程id
+        :param write_fd: 向浏览器写指令的文件描述符
+        :param read_fd: 读取浏览器消息的文件描述符
+        """
+        ...
+
+    @classmethod
+    def get(cls, address: str) -> Optional[PipeConnection]:
+        """返回地址对应的未关闭连接
+        :param address: 'pipe:进程号'
+        :return: 没有时返回None
+        """
+        ...
+
+    def send(self, message: str) -> None:
+        """发送一条消息
+        :param message: json文本
+        :return: None
+        """
+        ...
+
+    def recv(self) -> str:
+        """接收一条消息，连接关闭时抛出ConnectionResetError
+        :return: json文本
+        """
+        ...
+
+    def call(self, method: str, **params) -> dict:
+        """在Driver接管前同步执行一条cdp指令
+        :param method: cdp方法名
+        :param params: 参数
+        :return: 执行结果
+        """
+        ...
+
+    def close(self) -> None:
+        """关闭连接，浏览器收到管道关闭后退出"""
+        ...
+
+    def _close_reader(self) -> None: ...
+
+
+def launch_pipe_browser(path: str, args: List[str]) -> PipeConnection:
+    """以--remote-debugging-pipe启动浏览器，浏览器从fd 3读取指令，向fd 4写出结果
+    :param path: 浏览器可执行文件路径
+    :param args: 启动参数
+    :return: PipeConnection对象
+    """
+    ...
+
+
+def _inheritable_fds() -> List[int]:
+    """返回本进程中会被子进程继承的fd
+    :return: fd列表
+    """
+    ...
+
+
+def _reap(pid: int) -> None:
+    """等待浏览器进程退出并回收，避免留下僵尸进程
+    :param pid: 进程id
+    :return: None
+    """
+    ...
@@ -6,7 +6,7 @@
 @Copyright: (c) 2020 by g1879, Inc. All Rights Reserved.
 """
 from pathlib import Path
-from re import search
+from re import search, sub
 
 from .options_manage import OptionsManager
 from .._functions.settings import Settings as _S
@@ -46,6 +46,8 @@ class ChromiumOptions(object):
         self._system_user_path = options.get('system_user_path', False)
         self._existing_only = options.get('existing_only', False)
         self._new_env = options.get('new_env', False)
+        self._multiplex = options.get('multiplex', False)
+        self._pipe = options.get('pipe', False)
         for i in self._arguments:
             if i.startswith('--headless'):
                 self._is_headless = True
@@ -144,6 +146,14 @@ class ChromiumOptions(object):
     def is_auto_port(self):
         return self._auto_port
 
+    @property
+    def is_multiplex(self):
+        return self._multiplex
+
+    @property
+    def is_pipe(self):
+        return self._pipe
+
     @property
     def retry_times(self):
         return self._retry_times
@@ -338,8 +348,7 @@ class ChromiumOptions(object):
         return self
 
     def set_address(self, address):
-        address = address.replace('localhost', '127.0.0.1').lstrip('htps:/')
-        self._address = address
+        self._address = sub(r'^https?://', '', address.replace('localhost', '127.0.0.1'))
         return self
 
     def set_browser_path(self, path):
@@ -371,7 +380,7 @@ class ChromiumOptions(object):
 
     def auto_port(self, on_off=True, scope=None):
         if on_off:
-            self._auto_port = scope if scope else (9600, 59600)
+            self._auto_port = scope if scope else True
         else:
             self._auto_port = False
         return self
@@ -380,6 +389,14 @@ class ChromiumOptions(object):
         self._existing_only = on_off
         return self
 
+    def multiplex(self, on_off=True):
+        self._multiplex = on_off
+        return self
+
+    def remote_debugging_pipe(self, on_off=True):
+        self._pipe = on_off
+        return self
+
     def save(self, path=None):
         if path == 'default':
             path = (Path(__file__).parent / 'configs.ini').absolute()
@@ -402,7 +419,8 @@ class ChromiumOptions(object):
 
         # 设置chromium_options
         attrs = ('address', 'browser_path', 'arguments', 'extensions', 'user', 'load_mode',
-                 'auto_port', 'system_user_path', 'existing_only', 'flags', 'new_env')
+                 'auto_port', 'system_user_path', 'existing_only', 'flags', 'new_env', 'multiplex',
+                 'pipe')
         for i in attrs:
             om.set_item('chromium_options', i, self.__getattribute__(f'_{i}'))
         # 设置代理
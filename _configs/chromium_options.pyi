@@ -31,6 +31,8 @@ class ChromiumOptions(object):
     _auto_port: Union[Tuple[int, int], False] = ...
     _system_user_path: bool = ...
     _existing_only: bool = ...
+    _multiplex: bool = ...
+    _pipe: bool = ...
     _retry_times: int = ...
     _retry_interval: float = ...
     _is_headless: bool = ...
@@ -122,7 +124,17 @@ class ChromiumOptions(object):
 
     @property
     def is_auto_port(self) -> Union[bool, Tuple[int, int]]:
-        """返回是否使用自动端口和用户文件，如指定范围则返回范围tuple"""
+        """返回是否使用自动端口和用户文件，如指定范围则返回范围tuple，由浏览器自行选择端口时返回True"""
+        ...
+
+    @property
+    def is_multiplex(self) -> bool:
+        """返回是否所有标签页共用一个浏览器连接"""
+        ...
+
+    @property
+    def is_pipe(self) -> bool:
+        """返回是否以--remote-debugging-pipe启动浏览器"""
         ...
 
     @property
@@ -379,7 +391,7 @@ class ChromiumOptions(object):
                   scope: Tuple[int, int] = None) -> ChromiumOptions:
         """自动获取可用端口
         :param on_off: 是否开启自动获取端口号
-        :param scope: 指定端口范围，不含最后的数字，为None则使用[9600-59600)
+        :param scope: 指定端口范围，不含最后的数字，为None时以--remote-debugging-port=0启动，由浏览器自行选择端口
         :return: 当前对象
         """
         ...
@@ -391,6 +403,20 @@ class ChromiumOptions(object):
         """
         ...
 
+    def multiplex(self, on_off: bool = True) -> ChromiumOptions:
+        """设置是否让所有标签页通过flatten session共用一个浏览器连接，而不是每个标签页一个websocket
+        :param on_off: 开或关
+        :return: 当前对象
+        """
+        ...
+
+    def remote_debugging_pipe(self, on_off: bool = True) -> ChromiumOptions:
+        """设置是否以--remote-debugging-pipe启动浏览器，通过管道而不是端口通讯，所有标签页共用该连接，仅支持Linux和macOS
+        :param on_off: 开或关
+        :return: 当前对象
+        """
+        ...
+
     def save(self, path: Union[str, Path] = None) -> str:
         """保存设置到文件
         :param path: ini文件的路径， None 保存到当前读取的配置文件，传入 'default' 保存到默认ini文件
@@ -0,0 +1,233 @@
+# -*- coding:utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Website  : https://DrissionPage.cn
+@Copyright: (c) 2020 by g1879, Inc. All Rights Reserved.
+"""
+from asyncio import sleep
+from json import loads
+from time import perf_counter
+
+from .chromium_element import make_js_for_find_ele_by_xpath, parse_js_result, convert_argument
+from .none_element import NoneElement
+from .session_element import make_session_ele
+from .._functions.locator import get_loc
+from .._functions.settings import Settings as _S
+from .._functions.web import is_js_func, get_ele_txt
+from .._units.rect import _midpoint
+from ..errors import LocatorError, JavaScriptError, ElementLostError, ContextLostError
+
+__ERROR__ = 'error'
+
+
+class AsyncElement(object):
+    def __init__(self, owner, obj_id, backend_id=None):
+        self.owner = owner
+        self._obj_id = obj_id
+        self._backend_id = backend_id
+        self._tag = None
+        self._type = 'AsyncElement'
+
+    def __repr__(self):
+        return f'<AsyncElement {self._tag or ""} {self._obj_id}>'
+
+    @property
+    def timeout(self):
+        return self.owner.timeout
+
+    async def _describe(self):
+        node = (await self.owner._run_cdp('DOM.describeNode', objectId=self._obj_id))['node']
+        self._backend_id = node['backendNodeId']
+        self._tag = node['localName'].lower()
+        return node
+
+    async def tag(self):
+        if self._tag is None:
+            await self._describe()
+        return self._tag
+
+    async def backend_id(self):
+        if self._backend_id is None:
+            await self._describe()
+        return self._backend_id
+
+    async def html(self):
+        return (await self.owner._run_cdp('DOM.getOuterHTML', objectId=self._obj_id))['outerHTML']
+
+    async def inner_html(self):
+        return await self.run_js('return this.innerHTML;')
+
+    async def text(self):
+        return get_ele_txt(make_session_ele(await self.html()))
+
+    async def value(self):
+        return await self.run_js('return this.value;')
+
+    async def attrs(self):
+        return await self.run_js('let r={};for(const a of this.attributes){r[a.name]=a.value;}return r;')
+
+    async def attr(self, name):
+        return await self.run_js('return this.getAttribute(arguments[0]);', name)
+
+    async def property(self, name):
+        return await self.run_js(f'return this.{name};')
+
+    async def run_js(self, script, *args, as_expr=False, timeout=None):
+        return await run_js(self.owner, self, script, as_expr=as_expr, timeout=timeout, args=args)
+
+    async def ele(self, locator, index=1, timeout=None):
+        return await find_in_async(self.owner, self, locator, index=index, timeout=timeout, method='ele()')
+
+    async def eles(self, locator, timeout=None):
+        return await find_in_async(self.owner, self, locator, index=None, timeout=timeout)
+
+    async def scroll_to_see(self):
+        await self.owner._run_cdp('DOM.scrollIntoViewIfNeeded', objectId=self._obj_id)
+
+    async def midpoint(self):
+        """返回元素中点在视口中的坐标"""
+        model = (await self.owner._run_cdp('DOM.getBoxModel', objectId=self._obj_id))['model']
+        return _midpoint(model['border'])
+
+    async def click(self, by_js=False):
+        if not by_js:
+            await self.scroll_to_see()
+            x, y = await self.midpoint()
+            r = await self.owner.driver.run_many(
+                [('Input.dispatchMouseEvent', {'type': 'mousePressed', 'x': x, 'y': y, 'button': 'left',
+                                               'clickCount': 1}),
+                 ('Input.dispatchMouseEvent', {'type': 'mouseReleased', 'x': x, 'y': y, 'button': 'left',
+                                               'clickCount': 1})])
+            if __ERROR__ not in r[0] and __ERROR__ not in r[1]:
+                return True
+        await self.run_js('this.click();')
+        return True
+
+    async def focus(self):
+        await self.owner._run_cdp('DOM.focus', objectId=self._obj_id)
+
+    async def clear(self):
+        await self.run_js("this.value='';this.dispatchEvent(new Event('input', {bubbles: true}));")
+
+    async def input(self, vals, clear=False):
+        await self.focus()
+        if clear:
+            await self.clear()
+        await self.owner._run_cdp('Input.insertText', text=str(vals))
+
+
+async def find_in_async(owner, ele, locator, index=1, timeout=None, method=None):
+    """在页面或元素内查找元素，ele为None时在整个页面查找"""
+    if isinstance(locator, (str, tuple)):
+        loc = get_loc(locator)
+    else:
+        raise LocatorError(ALLOW_TYPE=_S._lang.LOC_FORMAT, CURR_VAL=locator)
+    if ele and loc[0] == 'xpath' and loc[1].lstrip().startswith('/'):
+        loc = loc[0], f'.{loc[1]}'
+    if timeout is None:
+        timeout = owner.timeout
+
+    if loc[0] == 'xpath':
+        js = make_js_for_find_ele_by_xpath(loc[1], '9' if index == 1 else '7', 'this')
+    else:
+        selector = loc[1].replace('"', r'\"')
+        js = f'function(){{return this.querySelector{"" if index == 1 else "All"}("{selector}");}}'
+
+    end_time = perf_counter() + timeout
+    while True:
+        result = await _do_find(owner, ele, js, loc, index)
+        if result is not None or perf_counter() >= end_time:
+            break
+        await sleep(.01)
+
+    if result is not None:
+        return result
+    return (NoneElement(method=method, args={'locator': locator, 'index': index, 'timeout': timeout})
+            if index is not None else [])
+
+
+async def _do_find(owner, ele, js, loc, index):
+    res = await owner._call_function(js, ele._obj_id if ele else None)
+    if 'exceptionDetails' in res:
+        desc = res['result'].get('description', '')
+        if 'The result is not a node set' in desc:
+            js1 = make_js_for_find_ele_by_xpath(loc[1], '1', 'this')
+            res = await owner._call_function(js1, ele._obj_id if ele else None)
+            return res['result'].get('value')
+        elif 'is not a valid XPath expression' in desc:
+            raise LocatorError(_S._lang.INVALID_XPATH_, loc[1])
+        elif 'is not a valid selector' in desc:
+            raise LocatorError(_S._lang.INVALID_CSS_, loc[1])
+        raise LocatorError(_S._lang.FIND_ELE_ERR, INFO=res)
+
+    result = res['result']
+    if result['type'] != 'object':
+        return result.get('value')
+    if result.get('subtype') == 'null' or result.get('description') in ('NodeList(0)', 'Array(0)'):
+        return None
+    if index == 1:
+        return AsyncElement(owner, result['objectId'])
+
+    props = (await owner._run_cdp('Runtime.getProperties', objectId=result['objectId'],
+                                  ownProperties=True))['result']
+    items = [AsyncElement(owner, i['value']['objectId']) if i['value']['type'] == 'object' else i['value'].get('value')
+             for i in props if i['name'].isdigit()]
+    if index is None:
+        return items
+    if not items or abs(index) > len(items):
+        return None
+    return items[index - 1 if index > 0 else index]
+
+
+async def run_js(owner, ele, script, as_expr, timeout, args=()):
+    if timeout is None:
+        timeout = owner.timeouts.script
+    end_time = perf_counter() + timeout
+    try:
+        if as_expr:
+            res = await owner._run_cdp('Runtime.evaluate', expression=script, returnByValue=False,
+                                       awaitPromise=True, userGesture=True, _timeout=timeout)
+        else:
+            if not is_js_func(script):
+                script = f'function(){{{script}}}'
+            res = await owner._call_function(script, ele._obj_id if ele else None,
+                                             [_convert_argument(arg) for arg in args], timeout)
+    except TimeoutError:
+        raise TimeoutError(_S._lang.join(_S._lang.TIMEOUT_, _S._lang.RUN_JS, timeout))
+    except ContextLostError:
+        raise ContextLostError() if ele is None else ElementLostError()
+
+    if res.get('exceptionDetails'):
+        raise JavaScriptError(JS=script, INFO=res['exceptionDetails'])
+    return await parse_async_js_result(owner, res['result'], end_time)
+
+
+async def parse_async_js_result(owner, result, end_time):
+    """需要再次请求浏览器的结果在此处理，其余交给parse_js_result()"""
+    if result['type'] == 'object' and 'unserializableValue' not in result:
+        sub_type = result.get('subtype')
+        if sub_type == 'node' and result.get('className') != 'HTMLDocument':
+            return AsyncElement(owner, result['objectId'])
+
+        elif sub_type == 'array':
+            r = (await owner._run_cdp('Runtime.getProperties', objectId=result['objectId'],
+                                      ownProperties=True))['result']
+            return [await parse_async_js_result(owner, i['value'], end_time) for i in r if i['name'].isdigit()]
+
+        elif sub_type != 'null' and 'objectId' in result:
+            timeout = end_time - perf_counter()
+            if timeout < 0:
+                return
+            js = 'function(){return JSON.stringify(this);}'
+            r = await owner._run_cdp('Runtime.callFunctionOn', functionDeclaration=js, objectId=result['objectId'],
+                                     returnByValue=False, awaitPromise=True, userGesture=True, _timeout=timeout)
+            return loads(parse_js_result(None, None, r['result'], end_time))
+
+    return parse_js_result(None, None, result, end_time)
+
+
+def _convert_argument(arg):
+    if isinstance(arg, AsyncElement):
+        return {'objectId': arg._obj_id}
+    return convert_argument(arg)
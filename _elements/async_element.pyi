@@ -0,0 +1,188 @@
+# -*- coding:utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Website  : https://DrissionPage.cn
+@Copyright: (c) 2020 by g1879, Inc. All Rights Reserved.
+"""
+from pathlib import Path
+from typing import Union, Optional, List, Tuple, Any
+
+from .none_element import NoneElement
+from .._pages.async_tab import AsyncTab
+
+
+class AsyncElement(object):
+    owner: AsyncTab
+    _obj_id: str
+    _backend_id: Optional[int]
+    _tag: Optional[str]
+    _type: str
+
+    def __init__(self, owner: AsyncTab, obj_id: str, backend_id: int = None):
+        """
+        :param owner: 元素所在的AsyncTab对象
+        :param obj_id: js中的object id
+        :param backend_id: backend id
+        """
+        ...
+
+    @property
+    def timeout(self) -> float:
+        """返回查找元素的超时时间"""
+        ...
+
+    async def _describe(self) -> dict:
+        """获取节点信息，并记录backend id和tag"""
+        ...
+
+    async def tag(self) -> str:
+        """返回元素tag"""
+        ...
+
+    async def backend_id(self) -> int:
+        """返回元素的backend id"""
+        ...
+
+    async def html(self) -> str:
+        """返回元素outerHTML文本"""
+        ...
+
+    async def inner_html(self) -> str:
+        """返回元素innerHTML文本"""
+        ...
+
+    async def text(self) -> str:
+        """返回元素文本，规则与ChromiumElement.text相同"""
+        ...
+
+    async def value(self) -> str:
+        """返回元素的value值"""
+        ...
+
+    async def attrs(self) -> dict:
+        """返回元素所有attribute属性"""
+        ...
+
+    async def attr(self, name: str) -> Optional[str]:
+        """返回一个attribute属性值
+        :param name: 属性名
+        :return: 属性值文本，没有该属性返回None
+        """
+        ...
+
+    async def property(self, name: str) -> Any:
+        """获取一个property属性值
+        :param name: 属性名
+        :return: 属性值
+        """
+        ...
+
+    async def run_js(self, script: Union[str, Path], *args, as_expr: bool = False, timeout: float = None) -> Any:
+        """对本元素执行javascript代码
+        :param script: js文本，文本中用this表示本元素
+        :param args: 参数，按顺序在js文本中对应arguments[0]、arguments[1]...
+        :param as_expr: 是否作为表达式运行，为True时args无效
+        :param timeout: js超时时间（秒），为None则使用脚本超时设置
+        :return: 运行的结果
+        """
+        ...
+
+    async def ele(self, locator: Union[Tuple[str, str], str], index: int = 1,
+                  timeout: float = None) -> Union[AsyncElement, NoneElement, str, float]:
+        """返回当前元素下级符合条件的一个元素
+        :param locator: 定位符
+        :param index: 获取第几个元素，从1开始，可传入负数获取倒数第几个
+        :param timeout: 查找元素超时时间（秒），为None使用基本超时设置
+        :return: AsyncElement对象，找不到时返回NoneElement
+        """
+        ...
+
+    async def eles(self, locator: Union[Tuple[str, str], str], timeout: float = None) -> List[Union[AsyncElement, str]]:
+        """返回当前元素下级所有符合条件的子元素
+        :param locator: 定位符
+        :param timeout: 查找元素超时时间（秒），为None使用基本超时设置
+        :return: 元素对象组成的列表
+        """
+        ...
+
+    async def scroll_to_see(self) -> None:
+        """滚动页面直到元素可见"""
+        ...
+
+    async def midpoint(self) -> Tuple[float, float]:
+        """返回元素中点在视口中的坐标"""
+        ...
+
+    async def click(self, by_js: bool = False) -> bool:
+        """点击元素，模拟点击失败时改用js点击
+        :param by_js: 是否直接用js点击
+        :return: 是否点击成功
+        """
+        ...
+
+    async def focus(self) -> None:
+        """使元素获取焦点"""
+        ...
+
+    async def clear(self) -> None:
+        """清空元素文本"""
+        ...
+
+    async def input(self, vals: Any, clear: bool = False) -> None:
+        """输入文本
+        :param vals: 文本值
+        :param clear: 输入前是否清空文本框
+        :return: None
+        """
+        ...
+
+
+async def find_in_async(owner: AsyncTab, ele: Optional[AsyncElement], locator: Union[Tuple[str, str], str],
+                        index: Optional[int] = 1, timeout: float = None,
+                        method: str = None) -> Union[AsyncElement, NoneElement, str, float, list]:
+    """在页面或元素内查找元素
+    :param owner: AsyncTab对象
+    :param ele: 作为查找起点的AsyncElement，为None时在整个页面查找
+    :param locator: 定位符
+    :param index: 第几个结果，为None返回全部
+    :param timeout: 查找超时时间（秒）
+    :param method: 调用的方法名，用于NoneElement
+    :return: 元素对象、文本或它们组成的列表
+    """
+    ...
+
+
+async def _do_find(owner: AsyncTab, ele: Optional[AsyncElement], js: str, loc: Tuple[str, str],
+                   index: Optional[int]) -> Union[AsyncElement, str, float, list, None]:
+    """执行一次查找，没有结果返回None"""
+    ...
+
+
+async def run_js(owner: AsyncTab, ele: Optional[AsyncElement], script: str, as_expr: bool, timeout: Optional[float],
+                 args: tuple = ()) -> Any:
+    """运行javascript代码
+    :param owner: AsyncTab对象
+    :param ele: 执行代码的元素，为None时在document上执行
+    :param script: js文本
+    :param as_expr: 是否作为表达式运行
+    :param timeout: 超时时间（秒）
+    :param args: 参数
+    :return: 运行结果
+    """
+    ...
+
+
+async def parse_async_js_result(owner: AsyncTab, result: dict, end_time: float) -> Any:
+    """解析js返回的结果
+    :param owner: AsyncTab对象
+    :param result: cdp返回的结果
+    :param end_time: 截止时间
+    :return: 解析后的结果
+    """
+    ...
+
+
+def _convert_argument(arg: Any) -> dict:
+    """把参数转换为cdp可用的格式"""
+    ...
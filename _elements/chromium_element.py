@@ -33,6 +33,8 @@ from ..errors import (ContextLostError, ElementLostError, JavaScriptError, CDPEr
                       AlertExistsError, NoRectError, LocatorError)
 
 __FRAME_ELEMENT__ = ('iframe', 'frame')
+__BATCH_SIZE__ = 1000  # 批量获取节点时每批处理的节点数
+__NODES_INFO_JS__ = 'function(){return Array.from(arguments, n => [n.nodeType, n.localName || "", n.nodeValue]);}'
 
 
 class ChromiumElement(DrissionElement):
@@ -52,24 +54,11 @@ class ChromiumElement(DrissionElement):
         self._type = 'ChromiumElement'
         self._doc_id = None
 
-        if node_id and obj_id and backend_id:
-            self._node_id = node_id
-            self._obj_id = obj_id
-            self._backend_id = backend_id
-        elif node_id:
-            self._node_id = node_id
-            self._obj_id = self._get_obj_id(node_id)
-            self._backend_id = self._get_backend_id(self._node_id)
-        elif obj_id:
-            self._node_id = self._get_node_id(obj_id)
-            self._obj_id = obj_id
-            self._backend_id = self._get_backend_id(self._node_id)
-        elif backend_id:
-            self._obj_id = self._get_obj_id(backend_id=backend_id)
-            self._node_id = self._get_node_id(obj_id=self._obj_id)
-            self._backend_id = backend_id
-        else:
+        if not (node_id or obj_id or backend_id):
             raise ElementLostError
+        self._nid = node_id  # 三种id按需获取并缓存
+        self._oid = obj_id
+        self._bid = backend_id
 
     def __call__(self, locator, index=1, timeout=None):
         return self.ele(locator, index=index, timeout=timeout)
@@ -82,22 +71,50 @@ class ChromiumElement(DrissionElement):
         return self._backend_id == getattr(other, '_backend_id', None)
 
     @property
-    def tag(self):
-        if self._tag is None:
-            self._tag = self.owner._run_cdp('DOM.describeNode',
-                                            backendNodeId=self._backend_id)['node']['localName'].lower()
-        return self._tag
+    def _backend_id(self):
+        if self._bid is None:
+            ids = self._known_ids()
+            for n, i in enumerate(ids, 1):
+                try:
+                    node = self.owner._run_cdp('DOM.describeNode', **i)['node']
+                    break
+                except ElementLostError:  # 一种id失效时用另一种
+                    if n == len(ids):
+                        raise
+            self._bid = node['backendNodeId']
+            self._tag = node['localName'].lower()
+        return self._bid
 
-    @property
-    def html(self):
-        return self.owner._run_cdp('DOM.getOuterHTML', backendNodeId=self._backend_id)['outerHTML']
+    @_backend_id.setter
+    def _backend_id(self, backend_id):
+        self._bid = backend_id
 
     @property
-    def inner_html(self):
-        return self._run_js('return this.innerHTML;')
+    def _obj_id(self):
+        if self._oid is None:
+            self._oid = self._get_obj_id(node_id=self._nid, backend_id=self._bid)
+        return self._oid
+
+    @_obj_id.setter
+    def _obj_id(self, obj_id):
+        self._oid = obj_id
 
     @property
-    def attrs(self):
+    def _node_id(self):
+        if self._nid is None:
+            self._nid = self._get_node_id(obj_id=self._obj_id)
+        return self._nid
+
+    @_node_id.setter
+    def _node_id(self, node_id):
+        self._nid = node_id
+
+    def _cached(self, kind, func):
+        """开启元素缓存时从缓存读取，否则直接执行func()"""
+        cache = self.owner._ele_cache
+        return cache.load(kind, self, func) if cache else func()
+
+    def _get_attrs(self):
         try:
             attrs = self.owner._run_cdp('DOM.getAttributes', nodeId=self._node_id)['attributes']
             return {attrs[i]: attrs[i + 1] for i in range(0, len(attrs), 2)}
@@ -108,6 +125,32 @@ class ChromiumElement(DrissionElement):
         except CDPError:  # 文档根元素不能调用此方法
             return {}
 
+    def _known_ids(self):
+        """返回已获取的id组成的列表，用作cdp参数，object id不随node id失效，排在前面"""
+        if self._bid:
+            return [{'backendNodeId': self._bid}]
+        return [i for i in ({'objectId': self._oid}, {'nodeId': self._nid}) if next(iter(i.values()))]
+
+    @property
+    def tag(self):
+        if self._tag is None:
+            self._tag = self._cached('tag', lambda: self.owner._run_cdp(
+                'DOM.describeNode', backendNodeId=self._backend_id)['node']['localName'].lower())
+        return self._tag
+
+    @property
+    def html(self):
+        return self._cached('html', lambda: self.owner._run_cdp('DOM.getOuterHTML',
+                                                                backendNodeId=self._backend_id)['outerHTML'])
+
+    @property
+    def inner_html(self):
+        return self._run_js('return this.innerHTML;')
+
+    @property
+    def attrs(self):
+        return dict(self._cached('attrs', self._get_attrs))
+
     @property
     def text(self):
         return get_ele_txt(make_session_ele(self.html))
@@ -376,10 +419,10 @@ class ChromiumElement(DrissionElement):
             if not link or link.lower().startswith(('javascript:', 'mailto:')):
                 return link
             else:
-                return make_absolute_link(link, self.property('baseURI'))
+                return make_absolute_link(link, self._cached('base_uri', lambda: self.property('baseURI')))
 
         elif name == 'src':
-            return make_absolute_link(attrs.get('src'), self.property('baseURI'))
+            return make_absolute_link(attrs.get('src'), self._cached('base_uri', lambda: self.property('baseURI')))
 
         elif name == 'text':
             return self.text
@@ -634,8 +677,9 @@ class ChromiumElement(DrissionElement):
         return n['backendNodeId']
 
     def _refresh_id(self):
-        self._obj_id = self._get_obj_id(backend_id=self._backend_id)
-        self._node_id = self._get_node_id(obj_id=self._obj_id)
+        backend_id = self._backend_id
+        self._nid = None
+        self._oid = self._get_obj_id(backend_id=backend_id)
 
     def _get_ele_path(self, xpath=True):
         if xpath:
@@ -734,9 +778,8 @@ class ShadowRoot(BaseElement):
         return run_js(self, script, as_expr, self.owner.timeouts.script if timeout is None else timeout, args)
 
     def run_async_js(self, script, *args, as_expr=False, timeout=None):
-        from threading import Thread
-        Thread(target=run_js, args=(self, script, as_expr,
-                                    self.owner.timeouts.script if timeout is None else timeout, args)).start()
+        self.owner.browser._scheduler.submit(run_js, self, script, as_expr,
+                                             self.owner.timeouts.script if timeout is None else timeout, args)
 
     def parent(self, level_or_loc=1, index=1, timeout=0):
         if isinstance(level_or_loc, int):
@@ -969,21 +1012,41 @@ def find_in_chromium_ele(ele, locator, index=1, timeout=None, relative=True):
 
 
 def find_by_xpath(ele, xpath, index, timeout, relative=True):
-    type_txt = '9' if index == 1 else '7'
     node_txt = 'this.contentDocument' if ele.tag in __FRAME_ELEMENT__ and not relative else 'this'
-    js = make_js_for_find_ele_by_xpath(xpath, type_txt, node_txt)
     ele.owner.wait.doc_loaded()
+    result = wait_by_xpath(ele, xpath, index, timeout, node_txt)
+    if result:
+        return result
+    return NoneElement(ele.owner) if index is not None else ChromiumElementsList(owner=ele.owner)
+
 
-    def do_find():
-        res = ele.owner._run_cdp('Runtime.callFunctionOn', functionDeclaration=js, objectId=ele._obj_id,
-                                 returnByValue=False, awaitPromise=True, userGesture=True)
+def find_by_css(ele, selector, index, timeout):
+    node_txt = 'this.contentDocument' if ele.tag in ('iframe', 'frame', 'shadow-root') else 'this'
+    ele.owner.wait.doc_loaded()
+    result = wait_by_css(ele, selector, index, timeout, node_txt)
+    if result:
+        return result
+    return NoneElement(ele.owner) if index is not None else ChromiumElementsList(owner=ele.owner)
+
+
+def wait_by_xpath(page_or_ele, xpath, index, timeout, node_txt='this'):
+    """在页面中用MutationObserver等待xpath结果出现，一次调用返回结果，超时返回None"""
+    page, get_obj_id = _find_target(page_or_ele)
+    type_txt = '9' if index == 1 else '7'
+    js = make_js_for_wait(make_js_for_find_ele_by_xpath(xpath, type_txt, node_txt), node_txt,
+                          1 if index is None else abs(index))
+
+    def do_find(wait=0):
+        res = page._run_cdp('Runtime.callFunctionOn', functionDeclaration=js, objectId=get_obj_id(),
+                            arguments=[{'value': int(wait * 1000)}], returnByValue=False, awaitPromise=True,
+                            userGesture=True, _timeout=wait + _S.cdp_timeout)
         if res['result']['type'] == 'string':
             return res['result']['value']
         if 'exceptionDetails' in res:
             if 'The result is not a node set' in res['result']['description']:
                 js1 = make_js_for_find_ele_by_xpath(xpath, '1', node_txt)
-                res = ele.owner._run_cdp('Runtime.callFunctionOn', functionDeclaration=js1, objectId=ele._obj_id,
-                                         returnByValue=False, awaitPromise=True, userGesture=True)
+                res = page._run_cdp('Runtime.callFunctionOn', functionDeclaration=js1, objectId=get_obj_id(),
+                                    returnByValue=False, awaitPromise=True, userGesture=True)
                 return res['result']['value']
             elif 'is not a valid XPath expression' in res['result']['description']:
                 raise LocatorError(_S._lang.INVALID_XPATH_, xpath)
@@ -994,19 +1057,18 @@ def find_by_xpath(ele, xpath, index, timeout, relative=True):
             return None
 
         if index == 1:
-            r = make_chromium_eles(ele.owner, _ids=res['result']['objectId'], is_obj_id=True)
+            r = make_chromium_eles(page, _ids=res['result']['objectId'], is_obj_id=True)
             return None if r is False else r
 
         else:
-            res = ele.owner._run_cdp('Runtime.getProperties', objectId=res['result']['objectId'],
-                                     ownProperties=True)['result'][:-1]
+            res = page._run_cdp('Runtime.getProperties', objectId=res['result']['objectId'],
+                                ownProperties=True)['result'][:-1]
             if index is None:
-                r = ChromiumElementsList(owner=ele.owner)
+                obj_ids = [i['value']['objectId'] for i in res if i['value']['type'] == 'object']
+                nodes = iter(_get_nodes(page, obj_ids, True, False))
+                r = ChromiumElementsList(owner=page)
                 for i in res:
-                    if i['value']['type'] == 'object':
-                        r.append(make_chromium_eles(ele.owner, _ids=i['value']['objectId'], is_obj_id=True))
-                    else:
-                        r.append(i['value']['value'])
+                    r.append(next(nodes) if i['value']['type'] == 'object' else i['value']['value'])
                 return None if False in r else r
 
             else:
@@ -1017,33 +1079,26 @@ def find_by_xpath(ele, xpath, index, timeout, relative=True):
                 index1 = eles_count + index + 1 if index < 0 else index
                 res = res[index1 - 1]
                 if res['value']['type'] == 'object':
-                    r = make_chromium_eles(ele.owner, _ids=res['value']['objectId'], is_obj_id=True)
+                    r = make_chromium_eles(page, _ids=res['value']['objectId'], is_obj_id=True)
                 else:
                     r = res['value']['value']
                 return None if r is False else r
 
-    end_time = perf_counter() + timeout
-    result = do_find()
-    while result is None and perf_counter() < end_time:
-        sleep(.01)
-        result = do_find()
+    return _wait_result(do_find, timeout)
 
-    if result:
-        return result
-    return NoneElement(ele.owner) if index is not None else ChromiumElementsList(owner=ele.owner)
 
-
-def find_by_css(ele, selector, index, timeout):
+def wait_by_css(page_or_ele, selector, index, timeout, node_txt='this'):
+    """在页面中用MutationObserver等待css selector结果出现，一次调用返回结果，超时返回None"""
+    page, get_obj_id = _find_target(page_or_ele)
     selector = selector.replace('"', r'\"')
     find_all = '' if index == 1 else 'All'
-    node_txt = 'this.contentDocument' if ele.tag in ('iframe', 'frame', 'shadow-root') else 'this'
-    js = f'function(){{return {node_txt}.querySelector{find_all}("{selector}");}}'
+    js = make_js_for_wait(f'function(){{return {node_txt}.querySelector{find_all}("{selector}");}}', node_txt,
+                          1 if index is None else abs(index))
 
-    ele.owner.wait.doc_loaded()
-
-    def do_find():
-        res = ele.owner._run_cdp('Runtime.callFunctionOn', functionDeclaration=js, objectId=ele._obj_id,
-                                 returnByValue=False, awaitPromise=True, userGesture=True)
+    def do_find(wait=0):
+        res = page._run_cdp('Runtime.callFunctionOn', functionDeclaration=js, objectId=get_obj_id(),
+                            arguments=[{'value': int(wait * 1000)}], returnByValue=False, awaitPromise=True,
+                            userGesture=True, _timeout=wait + _S.cdp_timeout)
 
         if 'exceptionDetails' in res:
             if 'is not a valid selector' in res['result']['description']:
@@ -1054,53 +1109,56 @@ def find_by_css(ele, selector, index, timeout):
             return None
 
         if index == 1:
-            r = make_chromium_eles(ele.owner, _ids=res['result']['objectId'], is_obj_id=True)
+            r = make_chromium_eles(page, _ids=res['result']['objectId'], is_obj_id=True)
             return None if r is False else r
 
         else:
-            obj_ids = [i['value']['objectId'] for i in ele.owner._run_cdp('Runtime.getProperties',
-                                                                          objectId=res['result']['objectId'],
-                                                                          ownProperties=True)['result']]
-            r = make_chromium_eles(ele.owner, _ids=obj_ids, index=index, is_obj_id=True)
+            obj_ids = [i['value']['objectId'] for i in page._run_cdp('Runtime.getProperties',
+                                                                     objectId=res['result']['objectId'],
+                                                                     ownProperties=True)['result']]
+            r = make_chromium_eles(page, _ids=obj_ids, index=index, is_obj_id=True)
             return None if r is False else r
 
+    return _wait_result(do_find, timeout)
+
+
+def _find_target(page_or_ele):
+    """返回执行查找的页面对象和获取查找起点object id的方法"""
+    if isinstance(page_or_ele, (ChromiumElement, ShadowRoot)):
+        return page_or_ele.owner, lambda: page_or_ele._obj_id
+    return page_or_ele, lambda: page_or_ele._root_id
+
+
+def _wait_result(do_find, timeout):
+    """执行在页面中等待的查找，找到的元素已失效时在剩余时间内重新查找"""
     end_time = perf_counter() + timeout
-    result = do_find()
+    result = do_find(timeout)
     while result is None and perf_counter() < end_time:
         sleep(.01)
-        result = do_find()
-
-    if result:
-        return result
-    return NoneElement(ele.owner) if index is not None else ChromiumElementsList(owner=ele.owner)
+        result = do_find(end_time - perf_counter())
+    return result
 
 
 def make_chromium_eles(page, _ids, index=1, is_obj_id=True, ele_only=False):
-    if is_obj_id:
-        get_node_func = _get_node_by_obj_id
-    else:
-        get_node_func = _get_node_by_node_id
     if not isinstance(_ids, (list, tuple)):
         _ids = (_ids,)
 
     if index is not None:  # 获取一个
         if ele_only:
             for obj_id in _ids:
-                tmp = get_node_func(page, obj_id, ele_only)
+                tmp = _get_nodes(page, (obj_id,), is_obj_id, ele_only)[0]
                 if tmp is not None:
                     return tmp
             return False
 
+        elif abs(index) > len(_ids):
+            return None
         else:
-            obj_id = _ids[index - 1]
-            return get_node_func(page, obj_id, ele_only)
+            return _get_nodes(page, (_ids[index if index < 0 else index - 1],), is_obj_id, ele_only)[0]
 
     else:  # 获取全部
         nodes = ChromiumElementsList(owner=page)
-        for obj_id in _ids:
-            # if obj_id == 0:
-            #     continue
-            tmp = get_node_func(page, obj_id, ele_only)
+        for tmp in _get_nodes(page, _ids, is_obj_id, ele_only):
             if tmp is False:
                 return False
             elif tmp is not None:
@@ -1108,51 +1166,114 @@ def make_chromium_eles(page, _ids, index=1, is_obj_id=True, ele_only=False):
         return nodes
 
 
-def _get_node_info(page, id_type, _id):
-    if not _id:
-        return False
-    arg = {id_type: _id}
-    node = page.driver.run('DOM.describeNode', **arg)
-    if 'error' in node:
-        return False
-    return node
+def _get_nodes(page, _ids, is_obj_id, ele_only):
+    """批量获取节点信息，返回元素对象或文本组成的列表，ele_only时文本为None，出错的为False"""
+    infos = []
+    for i in range(0, len(_ids), __BATCH_SIZE__):
+        batch = _ids[i:i + __BATCH_SIZE__]
+        infos.extend((is_obj_id and _nodes_info(page, batch)) or _describe_nodes(page, batch, is_obj_id))
+
+    r = []
+    for _id, info in zip(_ids, infos):
+        if info is None:
+            r.append(False)
+        elif info[0] in (3, 8):  # 文本或注释节点
+            r.append(None if ele_only else info[2])
+        elif is_obj_id:
+            r.append(_make_ele(page, info[1], obj_id=_id, backend_id=info[3]))
+        else:
+            r.append(_make_ele(page, info[1], node_id=_id, backend_id=info[3]))
+    return r
 
 
-def _get_node_by_obj_id(page, obj_id, ele_only):
-    """根据obj id返回元素对象或文本，ele_only时如果是文本返回None，出错返回False"""
-    node = _get_node_info(page, 'objectId', obj_id)
-    if node is False:
-        return False
-    if node['node']['nodeName'] in ('#text', '#comment'):
-        return None if ele_only else node['node']['nodeValue']
-    else:
-        return _make_ele(page, obj_id, node)
+def _nodes_info(page, obj_ids):
+    """用一次js调用获取一批节点的类型、标签名和文本，有失效的id时返回None"""
+    if not all(obj_ids):
+        return None
+    res = page.driver.run('Runtime.callFunctionOn', functionDeclaration=__NODES_INFO_JS__, objectId=obj_ids[0],
+                          arguments=[{'objectId': i} for i in obj_ids], returnByValue=True)
+    if 'error' in res or 'exceptionDetails' in res:
+        return None
+    return [(t, name, value, None) for t, name, value in res['result']['value']]
 
 
-def _get_node_by_node_id(page, node_id, ele_only):
-    """根据node id返回元素对象或文本，ele_only时如果是文本返回None，出错返回False"""
-    node = _get_node_info(page, 'nodeId', node_id)
-    if node is False:
-        return False
-    if node['node']['nodeName'] in ('#text', '#comment'):
-        return None if ele_only else node['node']['nodeValue']
-    else:
-        obj_id = page.driver.run('DOM.resolveNode', nodeId=node_id)
-        if 'error' in obj_id:
-            return False
-        obj_id = obj_id['object']['objectId']
-        return _make_ele(page, obj_id, node)
+def _describe_nodes(page, _ids, is_obj_id):
+    """一次发出全部DOM.describeNode指令获取节点信息，出错的为None"""
+    id_type = 'objectId' if is_obj_id else 'nodeId'
+    r = []
+    for _id, res in zip(_ids, page.driver.run_many([('DOM.describeNode', {id_type: _id}) for _id in _ids])):
+        if not _id or 'error' in res:
+            r.append(None)
+        else:
+            node = res['node']
+            r.append((node['nodeType'], node['localName'], node.get('nodeValue'), node['backendNodeId']))
+    return r
 
 
-def _make_ele(page, obj_id, node):
-    ele = ChromiumElement(page, obj_id=obj_id, node_id=node['node']['nodeId'],
-                          backend_id=node['node']['backendNodeId'])
-    if ele.tag in __FRAME_ELEMENT__:
+def _make_ele(page, tag, obj_id=None, node_id=None, backend_id=None):
+    """创建元素对象，未知的id在使用时获取"""
+    ele = ChromiumElement(page, obj_id=obj_id, node_id=node_id, backend_id=backend_id)
+    ele._tag = tag.lower()
+    if ele._tag in __FRAME_ELEMENT__:
         from .._pages.chromium_frame import ChromiumFrame
-        ele = ChromiumFrame(page, ele, node)
+        ele = ChromiumFrame(page, ele)
     return ele
 
 
+def _is_ele_result(result):
+    """判断js返回值是否需要转换为元素对象"""
+    return (result.get('subtype') == 'node' and 'objectId' in result
+            and result.get('className') not in ('ShadowRoot', 'HTMLDocument'))
+
+
+def _parse_js_list(page, ele, items, end_time):
+    """解析js返回的数组，其中的节点一次批量转换"""
+    obj_ids = [i['objectId'] for i in items if _is_ele_result(i)]
+    nodes = iter(_get_nodes(page, obj_ids, True, False)) if obj_ids else None
+    r = []
+    for i in items:
+        if _is_ele_result(i):
+            n = next(nodes)
+            if n is False:
+                raise ElementLostError
+            r.append(n)
+        else:
+            r.append(parse_js_result(page, ele, result=i, end_time=end_time))
+    return r
+
+
+def make_js_for_wait(find_js, node_txt='this', count=1):
+    """把查找函数包装为等待函数，参数为等待毫秒数，没有结果或结果数量少于count时用MutationObserver监视节点所在的
+    文档或shadow root，结果出现或超时后返回"""
+    return f'''function(ms){{
+const find = ({find_js}).bind(this);
+const count = {count};
+const found = (r) => !(r === null || r === undefined
+    || ((r instanceof NodeList || Array.isArray(r)) && r.length < count));
+const r = find();
+if (found(r) || !(ms > 0)) {{return r;}}
+return new Promise((resolve, reject) => {{
+    let timer = null;
+    const ob = new MutationObserver(() => check(false));
+    const check = (end) => {{
+        try {{
+            const r = find();
+            if (!end && !found(r)) {{return;}}
+            ob.disconnect();
+            clearTimeout(timer);
+            resolve(r);
+        }} catch (e) {{
+            ob.disconnect();
+            clearTimeout(timer);
+            reject(e);
+        }}
+    }};
+    ob.observe(({node_txt}).getRootNode(), {{childList: true, subtree: true, attributes: true, characterData: true}});
+    timer = setTimeout(() => check(true), ms);
+}});
+}}'''
+
+
 def make_js_for_find_ele_by_xpath(xpath, type_txt, node_txt):
     for_txt = ''
 
@@ -1226,9 +1347,16 @@ def run_js(page_or_ele, script, as_expr, timeout, args=None):
             args = args or ()
             if not is_js_func(script):
                 script = f'function(){{{script}}}'
-            res = page._run_cdp('Runtime.callFunctionOn', functionDeclaration=script, objectId=obj_id,
-                                arguments=[convert_argument(arg) for arg in args], returnByValue=False,
-                                awaitPromise=True, userGesture=True, _timeout=timeout, _ignore=AlertExistsError)
+            kwargs = {'functionDeclaration': script, 'arguments': [convert_argument(arg) for arg in args],
+                      'returnByValue': False, 'awaitPromise': True, 'userGesture': True,
+                      '_timeout': timeout, '_ignore': AlertExistsError}
+            try:
+                res = page._run_cdp('Runtime.callFunctionOn', objectId=obj_id, **kwargs)
+            except (ContextLostError, ElementLostError):
+                if not isinstance(page_or_ele, ChromiumElement):
+                    raise
+                page_or_ele._refresh_id()  # 上下文重建后objectId失效，用backendNodeId重新获取
+                res = page._run_cdp('Runtime.callFunctionOn', objectId=page_or_ele._obj_id, **kwargs)
     except TimeoutError:
         raise TimeoutError(_S._lang.join(_S._lang.TIMEOUT_, _S._lang.RUN_JS, timeout))
     except ContextLostError:
@@ -1272,7 +1400,7 @@ def parse_js_result(page, ele, result, end_time):
 
         elif sub_type == 'array':
             r = page._run_cdp('Runtime.getProperties', objectId=result['objectId'], ownProperties=True)['result']
-            return [parse_js_result(page, ele, result=i['value'], end_time=end_time) for i in r if i['name'].isdigit()]
+            return _parse_js_list(page, ele, [i['value'] for i in r if i['name'].isdigit()], end_time)
 
         elif result.get('className') == 'Blob':
             data = page._run_cdp('IO.read',
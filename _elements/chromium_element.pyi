@@ -6,7 +6,7 @@
 @Copyright: (c) 2020 by g1879, Inc. All Rights Reserved.
 """
 from pathlib import Path
-from typing import Union, Tuple, List, Any, Literal, Optional
+from typing import Union, Tuple, List, Any, Literal, Optional, Callable
 
 from .._base.base import DrissionElement, BaseElement
 from .._elements.session_element import SessionElement
@@ -32,9 +32,9 @@ class ChromiumElement(DrissionElement):
     owner: ChromiumBase = ...
     page: Union[ChromiumPage, WebPage] = ...
     tab: Union[ChromiumPage, ChromiumTab] = ...
-    _node_id: int = ...
-    _obj_id: str = ...
-    _backend_id: int = ...
+    _nid: Optional[int] = ...
+    _oid: Optional[str] = ...
+    _bid: Optional[int] = ...
     _doc_id: Optional[str] = ...
     _scroll: Optional[ElementScroller] = ...
     _clicker: Optional[Clicker] = ...
@@ -50,7 +50,7 @@ class ChromiumElement(DrissionElement):
                  node_id: int = None,
                  obj_id: str = None,
                  backend_id: int = None):
-        """node_id、obj_id和backend_id必须至少传入一个
+        """node_id、obj_id和backend_id必须至少传入一个，其余的在使用时获取
         :param owner: 元素所在页面对象
         :param node_id: cdp中的node id
         :param obj_id: js中的object id
@@ -583,6 +583,46 @@ class ChromiumElement(DrissionElement):
         """
         ...
 
+    @property
+    def _backend_id(self) -> int:
+        """返回backend id，未获取时获取并缓存"""
+        ...
+
+    @_backend_id.setter
+    def _backend_id(self, backend_id: int) -> None: ...
+
+    @property
+    def _obj_id(self) -> str:
+        """返回js中的object id，未获取时获取并缓存"""
+        ...
+
+    @_obj_id.setter
+    def _obj_id(self, obj_id: str) -> None: ...
+
+    @property
+    def _node_id(self) -> int:
+        """返回cdp中的node id，未获取时获取并缓存"""
+        ...
+
+    @_node_id.setter
+    def _node_id(self, node_id: int) -> None: ...
+
+    def _cached(self, kind: str, func: Callable[[], Any]) -> Any:
+        """开启元素缓存时从缓存读取，否则直接执行func()
+        :param kind: 'tag'、'attrs'、'html'或'base_uri'
+        :param func: 获取值的方法
+        :return: 值
+        """
+        ...
+
+    def _get_attrs(self) -> dict:
+        """从浏览器获取所有属性"""
+        ...
+
+    def _known_ids(self) -> List[dict]:
+        """返回已获取的id组成的列表，用作cdp参数，object id排在node id前面"""
+        ...
+
     def _get_obj_id(self, node_id: int = None, backend_id: int = None) -> str: ...
 
     def _get_node_id(self, obj_id: str = None, backend_id: int = None) -> int: ...
@@ -590,7 +630,7 @@ class ChromiumElement(DrissionElement):
     def _get_backend_id(self, node_id: int) -> int: ...
 
     def _refresh_id(self) -> None:
-        """根据backend id刷新其它id"""
+        """根据backend id重新获取object id，node id在使用时获取"""
         ...
 
     def _get_ele_path(self, xpath: bool = True) -> str:
@@ -904,6 +944,56 @@ def find_by_css(ele: ChromiumElement,
     ...
 
 
+def wait_by_xpath(page_or_ele: Union[ChromiumBase, ChromiumElement, ShadowRoot],
+                  xpath: str,
+                  index: Optional[int],
+                  timeout: float,
+                  node_txt: str = 'this') -> Union[ChromiumElement, ChromiumElementsList, str, float, None]:
+    """在页面中用MutationObserver等待xpath结果出现，结果在一次cdp调用中返回
+    :param page_or_ele: 在此页面或元素中查找
+    :param xpath: 查找语句
+    :param index: 第几个结果，从1开始，可传入负数获取倒数第几个，为None返回所有
+    :param timeout: 超时时间（秒）
+    :param node_txt: 查找起点的js文本
+    :return: 查找结果，超时返回None
+    """
+    ...
+
+
+def wait_by_css(page_or_ele: Union[ChromiumBase, ChromiumElement, ShadowRoot],
+                selector: str,
+                index: Optional[int],
+                timeout: float,
+                node_txt: str = 'this') -> Union[ChromiumElement, ChromiumElementsList, None]:
+    """在页面中用MutationObserver等待css selector结果出现，结果在一次cdp调用中返回
+    :param page_or_ele: 在此页面或元素中查找
+    :param selector: 查找语句
+    :param index: 第几个结果，从1开始，可传入负数获取倒数第几个，为None返回所有
+    :param timeout: 超时时间（秒）
+    :param node_txt: 查找起点的js文本
+    :return: 查找结果，超时返回None
+    """
+    ...
+
+
+def _find_target(page_or_ele: Union[ChromiumBase, ChromiumElement, ShadowRoot]
+                 ) -> Tuple[ChromiumBase, Callable[[], str]]:
+    """返回执行查找的页面对象和获取查找起点object id的方法
+    :param page_or_ele: 页面或元素对象
+    :return: (页面对象, 获取object id的方法)
+    """
+    ...
+
+
+def _wait_result(do_find: Callable[[float], Any], timeout: float) -> Any:
+    """执行在页面中等待的查找，找到的元素已失效时在剩余时间内重新查找
+    :param do_find: 查找方法，参数为在页面中等待的秒数
+    :param timeout: 超时时间（秒）
+    :return: 查找结果，超时返回None
+    """
+    ...
+
+
 def make_chromium_eles(page: Union[ChromiumBase, ChromiumPage, WebPage, ChromiumTab, ChromiumFrame],
                        _ids: Union[tuple, list, str, int],
                        index: Optional[int] = 1,
@@ -931,6 +1021,16 @@ def make_js_for_find_ele_by_xpath(xpath: str, type_txt: str, node_txt: str) -> s
     ...
 
 
+def make_js_for_wait(find_js: str, node_txt: str = 'this', count: int = 1) -> str:
+    """把查找函数包装为在页面中等待结果出现的js函数
+    :param find_js: 查找函数的js文本
+    :param node_txt: 查找起点的js文本，MutationObserver监视其所在的文档或shadow root
+    :param count: 结果为列表时至少需要的数量
+    :return: js文本，函数参数为等待毫秒数
+    """
+    ...
+
+
 def run_js(page_or_ele: Union[ChromiumBase, ChromiumElement, ShadowRoot],
            script: str,
            as_expr: bool,
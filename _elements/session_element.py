@@ -14,7 +14,7 @@ from lxml.html import HtmlElement, fromstring
 from .none_element import NoneElement
 from .._base.base import DrissionElement, BasePage, BaseElement
 from .._functions.elements import SessionElementsList
-from .._functions.locator import get_loc
+from .._functions.locator import get_loc, compile_xpath, compile_css
 from .._functions.settings import Settings as _S
 from .._functions.web import get_ele_txt, make_absolute_link
 from ..errors import LocatorError
@@ -258,10 +258,10 @@ def make_session_ele(html_or_ele, loc=None, index=1, method=None):
 
     # ---------------执行查找-----------------
     try:
-        if loc[0] == 'xpath':  # 用lxml内置方法获取lxml的元素对象列表
-            eles = html_or_ele.xpath(loc[1])
-        else:  # 用css selector获取元素对象列表
-            eles = html_or_ele.cssselect(loc[1])
+        if loc[0] == 'xpath':  # 用预编译的lxml XPath对象获取元素对象列表
+            eles = compile_xpath(loc[1])(html_or_ele)
+        else:  # 用预编译的css selector获取元素对象列表
+            eles = compile_css(loc[1])(html_or_ele)
 
         if not isinstance(eles, list):  # 结果不是列表，如数字
             return eles
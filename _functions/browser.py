@@ -16,7 +16,7 @@ from time import perf_counter, sleep
 from requests import Session
 
 from .settings import Settings as _S
-from .tools import port_is_using
+from .tools import port_is_using, read_active_port
 from .._configs.options_manage import OptionsManager
 from ..errors import BrowserConnectError
 
@@ -26,7 +26,7 @@ def connect_browser(option):
     browser_path = option.browser_path
 
     ip, port = address.split(':')
-    using = port_is_using(ip, port)
+    using = port != '0' and port_is_using(ip, port)
     if ip != '127.0.0.1' or using or option.is_existing_only:
         if test_connect(ip, port):
             return True
@@ -43,21 +43,70 @@ def connect_browser(option):
         rmtree(user_path, ignore_errors=True)
     set_prefs(option)
     set_flags(option)
+    if port == '0':  # 浏览器启动后把实际端口写入用户文件夹的DevToolsActivePort
+        if not option.user_data_path:
+            raise BrowserConnectError(ADDRESS=address)
+        try:
+            (Path(option.user_data_path) / 'DevToolsActivePort').unlink()
+        except FileNotFoundError:
+            pass
     try:
-        _run_browser(port, browser_path, args)
+        process = _run_browser(port, browser_path, args)
 
     # 传入的路径找不到，主动在ini文件、注册表、系统变量中找
     except FileNotFoundError:
         browser_path = get_chrome_path(option.ini_path)
         if not browser_path:
             raise FileNotFoundError(_S._lang.join(_S._lang.BROWSER_EXE_NOT_FOUND))
-        _run_browser(port, browser_path, args)
+        process = _run_browser(port, browser_path, args)
+
+    if port == '0':
+        port = _wait_active_port(option.user_data_path, process, address)
+        option.set_address(f'{ip}:{port}')
+        address = option.address
 
     if not test_connect(ip, port):
         raise BrowserConnectError(ADDRESS=address, TIP=_S._lang.BROWSER_CONNECT_ERR_INFO)
     return False
 
 
+def connect_pipe_browser(option):
+    """以--remote-debugging-pipe启动浏览器，或返回本进程中已启动的管道浏览器
+    :param option: ChromiumOptions对象
+    :return: (是否无头, 浏览器id, 是否接管的浏览器)
+    """
+    from .._base.pipe import PipeConnection, launch_pipe_browser
+    conn = PipeConnection.get(option.address)
+    if conn:
+        return conn.is_headless, conn.browser_id, True
+    elif option.address.startswith('pipe:'):
+        raise BrowserConnectError(_S._lang.BROWSER_NOT_EXIST, ADDRESS=option.address)
+
+    args, user_path = get_launch_args(option)
+    if option._new_env:
+        rmtree(user_path, ignore_errors=True)
+    set_prefs(option)
+    set_flags(option)
+    p = Path(option.browser_path)
+    try:
+        conn = launch_pipe_browser(str(p / 'chrome') if p.is_dir() else str(p), args)
+    except FileNotFoundError:
+        browser_path = get_chrome_path(option.ini_path)
+        if not browser_path:
+            raise FileNotFoundError(_S._lang.join(_S._lang.BROWSER_EXE_NOT_FOUND))
+        conn = launch_pipe_browser(browser_path, args)
+
+    try:
+        ua = conn.call('Browser.getVersion')['userAgent']
+        conn.browser_id = conn.call('Target.getTargetInfo')['targetInfo']['targetId']
+    except (OSError, KeyError):
+        conn.close()
+        raise BrowserConnectError(ADDRESS=conn.address, TIP=_S._lang.BROWSER_CONNECT_ERR_INFO)
+    conn.is_headless = 'headless' in ua.lower()
+    option.set_address(conn.address)
+    return conn.is_headless, conn.browser_id, False
+
+
 def get_launch_args(opt):
     # ----------处理arguments-----------
     result = set()
@@ -185,6 +234,24 @@ def test_connect(ip, port):
     return False
 
 
+def _wait_active_port(user_path, process, address):
+    """等待浏览器写入DevToolsActivePort文件并返回端口
+    :param user_path: 用户文件夹路径
+    :param process: 浏览器进程对象
+    :param address: 浏览器地址，用于报错
+    :return: 端口
+    """
+    end_time = perf_counter() + _S.browser_connect_timeout
+    while perf_counter() < end_time:
+        port = read_active_port(user_path)
+        if port:
+            return port
+        if process.poll() is not None:
+            break
+        sleep(.02)
+    raise BrowserConnectError(ADDRESS=address, TIP=_S._lang.BROWSER_CONNECT_ERR_INFO)
+
+
 def _run_browser(port, path: str, args) -> Popen:
     """创建浏览器进程
     :param port: 端口号
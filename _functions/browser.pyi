@@ -5,7 +5,7 @@
 @Website  : https://DrissionPage.cn
 @Copyright: (c) 2020 by g1879, Inc. All Rights Reserved.
 """
-from typing import Union
+from typing import Union, Tuple
 
 from .._configs.chromium_options import ChromiumOptions
 
@@ -42,6 +42,14 @@ def set_flags(opt: ChromiumOptions) -> None:
     ...
 
 
+def connect_pipe_browser(option: ChromiumOptions) -> Tuple[bool, str, bool]:
+    """以--remote-debugging-pipe启动浏览器，或返回本进程中已启动的管道浏览器
+    :param option: ChromiumOptions对象
+    :return: (是否无头, 浏览器id, 是否接管的浏览器)
+    """
+    ...
+
+
 def test_connect(ip: str, port: Union[int, str], timeout: float = 30) -> bool:
     """测试浏览器是否可用
     :param ip: 浏览器ip
@@ -0,0 +1,179 @@
+# -*- coding:utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Website  : https://DrissionPage.cn
+@Copyright: (c) 2020 by g1879, Inc. All Rights Reserved.
+"""
+from json import dumps
+from urllib.parse import urlparse
+
+from .fake_cdp import FakeBrowser
+from .._units.recorder import load_records
+
+
+class ReplayTarget(object):
+    """记录中出现过的标签页"""
+
+    def __init__(self, target_id, url='', title=''):
+        self.id = target_id
+        self.url = url
+        self.title = title
+        self.opener_id = None
+
+
+class ReplayBrowser(FakeBrowser):
+    """把CDPRecorder保存的记录作为浏览器提供给Driver连接，按原样回放结果和事件"""
+
+    def __init__(self, path_or_records, speed=0, host='127.0.0.1', port=0):
+        super().__init__(host=host, port=port)
+        self.speed = speed
+        self.misses = {}
+        self.targets = {}
+        self._ws_paths = set()
+        self._commands = {}
+        self._method_commands = {}
+        self._open_events = {}
+        self._cursors = {}
+        self._load(load_records(path_or_records) if not isinstance(path_or_records, list) else path_or_records)
+
+    def __repr__(self):
+        return f'<ReplayBrowser {self.address}>'
+
+    def start(self, tabs=0):
+        return super().start(tabs)
+
+    def reset(self):
+        """恢复所有记录为未使用，以便再次回放"""
+        for entries in self._method_commands.values():
+            for entry in entries:
+                entry['used'] = False
+        self._cursors.clear()
+        self.misses.clear()
+        self.calls.clear()
+
+    def _load(self, records):
+        pending = {}
+        early = {}  # 先于指令记录的返回值
+        anchors = {}
+        first_time = {}
+        for r in records:
+            ws, msg, t = r['ws'], r['m'], r['t']
+            self._ws_paths.add(ws)
+            first_time.setdefault(ws, t)
+            kind, _, target_id = ws.strip('/').partition('/')[2].partition('/')
+            if kind == 'browser':
+                self.id = target_id
+            elif kind == 'page':
+                self._add_target(target_id)
+
+            if r['d'] == '>':
+                entry = {'time': t, 'response': None, 'latency': 0, 'events': [], 'used': False}
+                key = ws, msg.get('sessionId'), msg.get('id')
+                if key in early:
+                    self._set_response(entry, ws, *early.pop(key), anchors)
+                else:
+                    pending[key] = entry
+                method = msg.get('method', '')
+                params = msg.get('params') or {}
+                self._commands.setdefault(self._key(ws, msg), []).append(entry)
+                self._method_commands.setdefault((ws, msg.get('sessionId'), method), []).append(entry)
+                if method == 'Target.attachToTarget':
+                    self._add_target(params.get('targetId'))
+
+            elif 'id' in msg:
+                key = ws, msg.get('sessionId'), msg['id']
+                entry = pending.pop(key, None)
+                if entry is None:
+                    early[key] = msg, t
+                else:
+                    self._set_response(entry, ws, msg, t, anchors)
+
+            else:
+                anchor = anchors.get(ws)
+                if anchor:
+                    anchor[0]['events'].append((t - anchor[1], msg))
+                else:
+                    self._open_events.setdefault(ws, []).append((t - first_time[ws], msg))
+                if msg.get('method') in ('Target.targetCreated', 'Target.targetInfoChanged'):
+                    info = msg['params']['targetInfo']
+                    if info.get('type') == 'page':
+                        self._add_target(info['targetId'], info.get('url', ''), info.get('title', ''))
+
+    def _set_response(self, entry, ws, msg, t, anchors):
+        """把返回值关联到指令，之后的事件跟随此返回值回放"""
+        entry['response'] = msg
+        entry['latency'] = max(t - entry['time'], 0)
+        anchors[ws] = (entry, t)
+        for info in (msg.get('result') or {}).get('targetInfos', ()):
+            if info.get('type') == 'page':
+                self._add_target(info['targetId'], info.get('url', ''), info.get('title', ''))
+
+    def _add_target(self, target_id, url=None, title=None):
+        if not target_id:
+            return
+        target = self.targets.get(target_id)
+        if target is None:
+            target = self.targets[target_id] = ReplayTarget(target_id)
+        if url is not None:
+            target.url = url
+        if title is not None:
+            target.title = title
+
+    @staticmethod
+    def _key(ws, msg):
+        return ws, msg.get('sessionId'), msg.get('method', ''), dumps(msg.get('params') or {}, sort_keys=True)
+
+    def _delay(self, seconds):
+        return seconds / self.speed if self.speed else 0
+
+    def _http(self, path):
+        p = urlparse(path).path.rstrip('/')
+        if p in ('/json', '/json/list'):
+            return '200 OK', [self._json_info(t) for t in self.targets.values()]
+        elif p == '/json/version':
+            return super()._http(path)
+        return '404 Not Found', f'Unknown command: {p}'
+
+    def _ws_tab(self, path):
+        return None if path in self._ws_paths else False
+
+    def _on_open(self, client):
+        for t, msg in self._open_events.get(client.conn.path, ()):
+            client.conn.send(msg, self._delay(t))
+
+    def _handle_msg(self, conn, client, msg):
+        method = msg.get('method', '')
+        with self._lock:
+            self.calls[method] = self.calls.get(method, 0) + 1
+            entry = self._take(self._commands, self._key(conn.path, msg))
+            if entry is None:  # 参数不同时按方法名顺序取用
+                entry = self._take(self._method_commands, (conn.path, msg.get('sessionId'), method))
+            if entry is None:
+                self.misses[method] = self.misses.get(method, 0) + 1
+
+        if entry is None or entry['response'] is None:
+            self._reply(conn, msg, result={})
+            return
+
+        response = dict(entry['response'], id=msg.get('id'))
+        if 'sessionId' in response:  # 保持sessionId在末尾
+            response['sessionId'] = response.pop('sessionId')
+        latency = self._delay(entry['latency'])
+        conn.send(response, latency)
+        for t, event in entry['events']:
+            conn.send(event, latency + self._delay(t))
+
+    def _take(self, commands, key):
+        """按记录顺序取出第一条未用过的指令"""
+        entries = commands.get(key)
+        if not entries:
+            return None
+        i = self._cursors.get((id(commands), key), 0)
+        while i < len(entries) and entries[i]['used']:
+            i += 1
+        self._cursors[(id(commands), key)] = i + 1
+        if i == len(entries):
+            return None
+        entries[i]['used'] = True
+        return entries[i]
@@ -0,0 +1,79 @@
+# -*- coding:utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Website  : https://DrissionPage.cn
+@Copyright: (c) 2020 by g1879, Inc. All Rights Reserved.
+"""
+from pathlib import Path
+from typing import Union, Dict, List, Tuple, Optional, Set
+
+from .fake_cdp import FakeBrowser, _Client, _Connection
+
+
+class ReplayTarget(object):
+    id: str
+    url: str
+    title: str
+    opener_id: Optional[str]
+
+    def __init__(self, target_id: str, url: str = '', title: str = ''): ...
+
+
+class ReplayBrowser(FakeBrowser):
+    speed: float
+    misses: Dict[str, int]
+    targets: Dict[str, ReplayTarget]
+    _ws_paths: Set[str]
+    _commands: Dict[tuple, List[dict]]
+    _method_commands: Dict[tuple, List[dict]]
+    _open_events: Dict[str, List[Tuple[float, dict]]]
+    _cursors: Dict[tuple, int]
+
+    def __init__(self,
+                 path_or_records: Union[str, Path, List[dict]],
+                 speed: float = 0,
+                 host: str = '127.0.0.1',
+                 port: int = 0):
+        """
+        :param path_or_records: CDPRecorder保存的文件路径，或load_records()返回的列表
+        :param speed: 回放速度，1为按记录的时间回放，2为两倍速，0为不等待尽快回放
+        :param host: 监听的ip
+        :param port: 监听的端口，为0时自动分配
+        """
+        ...
+
+    def start(self, tabs: int = 0) -> ReplayBrowser:
+        """启动服务
+        :param tabs: 无效，标签页来自记录
+        :return: 自身
+        """
+        ...
+
+    def reset(self) -> None:
+        """恢复所有记录为未使用，以便再次回放"""
+        ...
+
+    def _load(self, records: List[dict]) -> None:
+        """把记录整理为指令和结果的对应关系，事件挂在其前面最近一条结果上"""
+        ...
+
+    def _set_response(self, entry: dict, ws: str, msg: dict, t: float,
+                      anchors: Dict[str, Tuple[dict, float]]) -> None:
+        """把返回值关联到指令，之后的事件跟随此返回值回放"""
+        ...
+
+    def _add_target(self, target_id: str, url: str = None, title: str = None) -> None: ...
+
+    @staticmethod
+    def _key(ws: str, msg: dict) -> Tuple[str, Optional[str], str, str]:
+        """返回用于匹配指令的键"""
+        ...
+
+    def _delay(self, seconds: float) -> float:
+        """按回放速度换算延迟"""
+        ...
+
+    def _take(self, commands: Dict[tuple, List[dict]], key: tuple) -> Optional[dict]:
+        """按记录顺序取出第一条未用过的指令"""
+        ...
@@ -0,0 +1,998 @@
+# -*- coding:utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Website  : https://DrissionPage.cn
+@Copyright: (c) 2020 by g1879, Inc. All Rights Reserved.
+"""
+from base64 import b64encode
+from hashlib import sha1
+from heapq import heappush, heappop
+from itertools import count
+from json import dumps, loads
+from re import search, match, DOTALL
+from socket import IPPROTO_TCP, TCP_NODELAY
+from socketserver import ThreadingTCPServer, BaseRequestHandler
+from struct import pack, unpack
+from threading import Thread, Lock, Condition
+from time import perf_counter, sleep
+from urllib.parse import unquote, urlparse
+from uuid import uuid4
+
+from lxml.etree import XPathError, Element
+from lxml.html import document_fromstring, tostring, HtmlElement
+
+BLANK_HTML = '<html><head></head><body></body></html>'
+_WS_GUID = '258EAFA5-E914-47DA-95CA-C5AB0DC85B11'
+_WAIT_JS = r'^function\(ms\){\nconst find = \((.*?)\)\.bind\(this\);\nconst count = (\d+);\n'  # make_js_for_wait()生成的等待函数
+
+
+class FakeCDPError(Exception):
+    """由内置处理方法抛出，作为cdp错误返回给客户端"""
+
+    def __init__(self, message, code=-32000):
+        super().__init__(message)
+        self.message = message
+        self.code = code
+
+
+class _Waiting(object):
+    """在页面中等待的指令，结果出现或超时后才回复"""
+
+    def __init__(self, find, timeout, count=1):
+        self.find = find
+        self.end_time = perf_counter() + timeout
+        self.count = count
+
+    def found(self, result):
+        r = result.get('result', {})
+        if 'exceptionDetails' in result:
+            return True
+        if r.get('subtype') == 'null' or r.get('type') == 'undefined':
+            return False
+        num = match(r'(?:NodeList|Array)\((\d+)\)$', r.get('description', ''))
+        return not num or int(num.group(1)) >= self.count
+
+
+class FakeTab(object):
+    """模拟浏览器中的一个标签页，用lxml保存文档"""
+
+    def __init__(self, browser, tab_id, url='about:blank'):
+        self.browser = browser
+        self.id = tab_id
+        self.url = url
+        self.title = ''
+        self.ready_state = 'complete'
+        self.loader_id = None
+        self.opener_id = None
+        self.context_id = 'DEFAULT'
+        self.network_bodies = {}
+        self._doc = None
+        self._nodes = {}
+        self._node_ids = {}
+        self._objects = {}
+        self._searches = {}
+        self.set_html(browser._get_html(url))
+
+    def __repr__(self):
+        return f'<FakeTab {self.id} {self.url}>'
+
+    @property
+    def doc_id(self):
+        return self._doc_id
+
+    def set_html(self, html):
+        """替换文档内容，原有的node id和object id全部失效"""
+        self._doc = document_fromstring(html or BLANK_HTML)
+        self._nodes.clear()
+        self._node_ids.clear()
+        self._objects.clear()
+        self._searches.clear()
+        self._doc_id = next(self.browser._ids)
+        for e in self._doc.iter(Element):
+            i = next(self.browser._ids)
+            self._nodes[i] = e
+            self._node_ids[e] = i
+        title = self._doc.find('.//title')
+        self.title = title.text_content() if title is not None else self.url
+        self.loader_id = uuid4().hex.upper()
+
+    @property
+    def html(self):
+        return tostring(self._doc, encoding='unicode')
+
+    # ----------------节点与对象----------------
+    def node(self, node_id):
+        if node_id == self._doc_id:
+            return None
+        e = self._nodes.get(node_id)
+        if e is None:
+            raise FakeCDPError('Could not find node with given id')
+        return e
+
+    def node_id_of(self, params):
+        """根据nodeId、backendNodeId或objectId参数获取节点id"""
+        if 'nodeId' in params:
+            if params['nodeId'] != self._doc_id and params['nodeId'] not in self._nodes:
+                raise FakeCDPError('Could not find node with given id')
+            return params['nodeId']
+        elif 'backendNodeId' in params:
+            if params['backendNodeId'] != self._doc_id and params['backendNodeId'] not in self._nodes:
+                raise FakeCDPError('No node found for given backend id')
+            return params['backendNodeId']
+        elif 'objectId' in params:
+            obj = self._objects.get(params['objectId'])
+            if obj is None or obj[0] != 'node':
+                raise FakeCDPError('Could not find object with given id')
+            return obj[1]
+        raise FakeCDPError('Either nodeId, backendNodeId or objectId must be specified')
+
+    def describe(self, node_id):
+        if node_id == self._doc_id:
+            return {'nodeId': node_id, 'backendNodeId': node_id, 'nodeType': 9, 'nodeName': '#document',
+                    'localName': '', 'nodeValue': '', 'childNodeCount': 1, 'documentURL': self.url,
+                    'baseURL': self.url, 'frameId': self.id}
+        e = self.node(node_id)
+        attrs = []
+        for k, v in e.attrib.items():
+            attrs.extend((k, v))
+        return {'nodeId': node_id, 'backendNodeId': node_id, 'nodeType': 1, 'nodeName': e.tag.upper(),
+                'localName': e.tag, 'nodeValue': '', 'childNodeCount': len(e), 'attributes': attrs}
+
+    def outer_html(self, node_id):
+        return self.html if node_id == self._doc_id else tostring(self.node(node_id), encoding='unicode',
+                                                                  with_tail=False)
+
+    def remote_node(self, node_id):
+        obj_id = f'{self.id}.{node_id}'
+        self._objects[obj_id] = ('node', node_id)
+        if node_id == self._doc_id:
+            return {'type': 'object', 'subtype': 'node', 'className': 'HTMLDocument', 'description': '#document',
+                    'objectId': obj_id}
+        tag = self._nodes[node_id].tag
+        return {'type': 'object', 'subtype': 'node', 'className': f'HTML{tag.capitalize()}Element',
+                'description': tag, 'objectId': obj_id}
+
+    def remote_list(self, items, is_array):
+        obj_id = f'{self.id}.list{next(self.browser._ids)}'
+        self._objects[obj_id] = ('array' if is_array else 'nodelist', items)
+        return {'type': 'object', 'subtype': 'array', 'className': 'Array' if is_array else 'NodeList',
+                'description': f'{"Array" if is_array else "NodeList"}({len(items)})', 'objectId': obj_id}
+
+    def remote_value(self, value):
+        if isinstance(value, HtmlElement):
+            return self.remote_node(self._node_ids[value])
+        elif value is None:
+            return {'type': 'object', 'subtype': 'null', 'value': None}
+        elif isinstance(value, bool):
+            return {'type': 'boolean', 'value': value}
+        elif isinstance(value, (int, float)):
+            return {'type': 'number', 'value': value, 'description': str(value)}
+        elif isinstance(value, str):
+            return {'type': 'string', 'value': str(value)}
+        elif isinstance(value, (list, tuple)):
+            return self.remote_list(list(value), True)
+        return {'type': 'object', 'className': 'Object', 'description': 'Object', 'value': value}
+
+    def obj(self, obj_id):
+        obj = self._objects.get(obj_id)
+        if obj is None:
+            raise FakeCDPError('Could not find object with given id')
+        return obj
+
+    def context_of(self, node_id):
+        return self._doc if node_id == self._doc_id else self.node(node_id)
+
+    # ----------------查找----------------
+    def query(self, context, selector, xpath=False):
+        try:
+            if xpath:
+                r = context.xpath(selector)
+                return r if isinstance(r, list) else [r]
+            return context.cssselect(selector)
+        except (XPathError, ValueError, SyntaxError):
+            return None
+
+    def search(self, query):
+        q = query.strip()
+        r = self.query(self._doc, q, q.startswith(('/', '(', './')))
+        ids = [self._node_ids[e] for e in r or () if isinstance(e, HtmlElement)]
+        search_id = f'{self.id}.search{next(self.browser._ids)}'
+        self._searches[search_id] = ids
+        return search_id, len(ids)
+
+    def search_results(self, search_id, from_index, to_index):
+        ids = self._searches.get(search_id)
+        if ids is None:
+            raise FakeCDPError('No search session with given id found')
+        return ids[from_index:to_index]
+
+    def discard_search(self, search_id):
+        self._searches.pop(search_id, None)
+
+
+class _Client(object):
+    """一个接收消息的客户端，可以是页面连接、浏览器连接或浏览器连接上的flatten session"""
+
+    def __init__(self, conn, tab=None, session_id=None):
+        self.conn = conn
+        self.tab = tab
+        self.session_id = session_id
+        self.domains = set()
+        self.discover = False
+
+
+class _Connection(object):
+    """服务端的websocket连接，按照注入的延迟顺序发送数据"""
+
+    def __init__(self, browser, sock, path):
+        self.browser = browser
+        self.sock = sock
+        self.path = path
+        self.closed = False
+        self._closing = False
+        self._lock = Lock()
+        self._queue = []
+        self._cond = Condition(self._lock)
+        self._last_due = 0
+        self._seq = count()
+        self._sender = None
+
+    def send(self, obj, delay=0):
+        data = dumps(obj, separators=(',', ':'), ensure_ascii=False).encode()
+        n = len(data)
+        if n < 126:
+            head = pack('!BB', 0x81, n)
+        elif n < 65536:
+            head = pack('!BBH', 0x81, 126, n)
+        else:
+            head = pack('!BBQ', 0x81, 127, n)
+        self._write(head + data, delay)
+
+    def _write(self, frame, delay=0):
+        with self._lock:
+            if self.closed or self._closing:
+                return
+            if delay <= 0 and not self._queue:
+                try:
+                    self.sock.sendall(frame)
+                except OSError:
+                    self.closed = True
+                return
+            due = max(perf_counter() + delay, self._last_due)  # 保持消息顺序
+            self._last_due = due
+            heappush(self._queue, (due, next(self._seq), frame))
+            if self._sender is None:
+                self._sender = Thread(target=self._send_loop, daemon=True)
+                self._sender.start()
+            self._cond.notify()
+
+    def _send_loop(self):
+        with self._lock:
+            while not self.closed:
+                if not self._queue:
+                    self._cond.wait()
+                    continue
+                due, _, frame = self._queue[0]
+                wait = due - perf_counter()
+                if wait > 0:
+                    self._cond.wait(wait)
+                    continue
+                heappop(self._queue)
+                try:
+                    self.sock.sendall(frame)
+                except OSError:
+                    self.closed = True
+                if self._closing and not self._queue:
+                    self._closing = False
+                    break
+        self.close()
+
+    def recv(self):
+        def read(k):
+            b = b''
+            while len(b) < k:
+                c = self.sock.recv(k - len(b))
+                if not c:
+                    raise ConnectionError
+                b += c
+            return b
+
+        buf = b''
+        while True:
+            b1, b2 = read(2)
+            opcode = b1 & 0xf
+            n = b2 & 0x7f
+            if n == 126:
+                n = unpack('!H', read(2))[0]
+            elif n == 127:
+                n = unpack('!Q', read(8))[0]
+            mask = read(4) if b2 & 0x80 else None
+            data = read(n)
+            if mask:
+                data = (int.from_bytes(data, 'big')
+                        ^ int.from_bytes((mask * (n // 4 + 1))[:n], 'big')).to_bytes(n, 'big')
+            if opcode == 0x8:
+                raise ConnectionError
+            elif opcode == 0x9:
+                self._write(pack('!BB', 0x8a, len(data)) + data)
+            elif opcode == 0xa:
+                continue
+            else:
+                buf += data
+                if b1 & 0x80:
+                    return buf
+
+    def close(self, flush=False):
+        with self._lock:
+            if self.closed:
+                return
+            if flush and self._queue:  # 等延迟的消息发完再关闭
+                self._closing = True
+                return
+            self.closed = True
+            self._cond.notify()
+        try:
+            self.sock.sendall(b'\x88\x02\x03\xe8')
+        except OSError:
+            pass
+
+
+class _Server(ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class FakeBrowser(object):
+    """模拟Chromium远程调试接口的本地服务，不需要真实浏览器即可连接和测试"""
+
+    def __init__(self, pages=None, fixtures=None, latency=0, host='127.0.0.1', port=0, strict=False):
+        self.pages = pages if pages is not None else {}
+        self.fixtures = fixtures if fixtures is not None else {}
+        self.latency = latency
+        self.strict = strict
+        self.id = str(uuid4())
+        self.user_agent = ('Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) '
+                           'FakeChrome/120.0.0.0 Safari/537.36')
+        self.product = 'FakeChrome/120.0.0.0'
+        self.calls = {}
+        self.tabs = {}
+        self._ids = count(1)
+        self._host = host
+        self._port = port
+        self._server = None
+        self._clients = set()
+        self._sessions = {}
+        self._connections = set()
+        self._lock = Lock()
+
+    def __repr__(self):
+        return f'<FakeBrowser {self.address}>'
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    @property
+    def address(self):
+        return f'{self._host}:{self._port}'
+
+    @property
+    def tab_ids(self):
+        return list(self.tabs)
+
+    def start(self, tabs=1):
+        """启动服务，tabs为初始标签页数量"""
+        if self._server:
+            return self
+        browser = self
+
+        class Handler(BaseRequestHandler):
+            def handle(self):
+                browser._handle_request(self.request)
+
+        self._server = _Server((self._host, self._port), Handler)
+        self._port = self._server.server_address[1]
+        Thread(target=self._server.serve_forever, daemon=True).start()
+        for _ in range(tabs):
+            self.new_tab()
+        return self
+
+    def stop(self):
+        with self._lock:  # Browser.close会在另一线程调用stop()
+            server, self._server = self._server, None
+        if not server:
+            return
+        for conn in list(self._connections):
+            conn.close()
+        server.shutdown()
+        server.server_close()
+
+    def new_tab(self, url='about:blank', opener_id=None):
+        tab = FakeTab(self, uuid4().hex.upper(), url)
+        tab.opener_id = opener_id
+        self.tabs[tab.id] = tab
+        self._browser_event('Target.targetCreated', {'targetInfo': self._target_info(tab)})
+        return tab
+
+    def close_tab(self, tab_id):
+        tab = self.tabs.pop(tab_id, None)
+        if not tab:
+            return False
+        for client in [c for c in self._clients if c.tab is tab]:
+            if client.session_id:
+                self._detach(client)
+            else:
+                client.conn.close(flush=True)
+        self._browser_event('Target.targetDestroyed', {'targetId': tab_id})
+        return True
+
+    def set_html(self, tab_id, html):
+        self.tabs[tab_id].set_html(html)
+        self.emit(tab_id, 'DOM.documentUpdated')
+
+    def emit(self, tab_id, method, params=None, domain_only=True):
+        """向连接到标签页的客户端发送事件，domain_only为True时只发给已enable该域的客户端"""
+        tab = self.tabs[tab_id]
+        domain = method.split('.', 1)[0]
+        for client in list(self._clients):
+            if client.tab is tab and (not domain_only or domain in client.domains):
+                self._send_event(client, method, params or {})
+
+    def emit_requests(self, tab_id=None, num=1, url='https://example.com/api', method='GET', body='{}',
+                      res_type='XHR', status=200):
+        """模拟标签页发出网络请求，依次触发Network域的相关事件"""
+        tab = self.tabs[tab_id] if tab_id else next(iter(self.tabs.values()))
+        for _ in range(num):
+            rid = f'{next(self._ids)}.1'
+            tab.network_bodies[rid] = body
+            self.emit(tab.id, 'Network.requestWillBeSent',
+                      {'requestId': rid, 'loaderId': tab.loader_id, 'documentURL': tab.url, 'type': res_type,
+                       'request': {'url': url, 'method': method, 'headers': {}}, 'frameId': tab.id})
+            self.emit(tab.id, 'Network.responseReceived',
+                      {'requestId': rid, 'loaderId': tab.loader_id, 'type': res_type, 'frameId': tab.id,
+                       'response': {'url': url, 'status': status, 'statusText': 'OK', 'mimeType': 'application/json',
+                                    'headers': {'content-type': 'application/json'}}})
+            self.emit(tab.id, 'Network.loadingFinished', {'requestId': rid, 'encodedDataLength': len(body)})
+
+    # ----------------http与websocket----------------
+    def _handle_request(self, sock):
+        sock.setsockopt(IPPROTO_TCP, TCP_NODELAY, 1)
+        f = sock.makefile('rb')
+        try:
+            line = f.readline().decode()
+            if not line:
+                return
+            http_method, path = line.split(' ')[:2]
+            headers = {}
+            while True:
+                h = f.readline().decode().strip()
+                if not h:
+                    break
+                k, v = h.split(':', 1)
+                headers[k.strip().lower()] = v.strip()
+        except (OSError, ValueError):
+            return
+        finally:
+            f.close()
+
+        if headers.get('upgrade', '').lower() == 'websocket':
+            accept = b64encode(sha1((headers['sec-websocket-key'] + _WS_GUID).encode()).digest()).decode()
+            self._serve_websocket(sock, path, accept)
+        else:
+            status, body = self._http(path)
+            data = dumps(body).encode()
+            sock.sendall(f'HTTP/1.1 {status}\r\nContent-Type: application/json; charset=UTF-8\r\n'
+                         f'Content-Length: {len(data)}\r\nConnection: close\r\n\r\n'.encode() + data)
+
+    def _http(self, path):
+        u = urlparse(path)
+        p = u.path.rstrip('/')
+        if p in ('/json', '/json/list'):
+            return '200 OK', [self._json_info(t) for t in reversed(list(self.tabs.values()))]
+        elif p == '/json/version':
+            return '200 OK', {'Browser': self.product, 'Protocol-Version': '1.3', 'User-Agent': self.user_agent,
+                              'webSocketDebuggerUrl': f'ws://{self.address}/devtools/browser/{self.id}'}
+        elif p == '/json/new':
+            url = unquote(u.query) if u.query else 'about:blank'
+            return '200 OK', self._json_info(self.new_tab(url))
+        elif p.startswith('/json/close/'):
+            return ('200 OK', 'Target is closing') if self.close_tab(p.split('/')[-1]) \
+                else ('404 Not Found', f'No such target id: {p.split("/")[-1]}')
+        elif p.startswith('/json/activate/'):
+            tab_id = p.split('/')[-1]
+            if tab_id not in self.tabs:
+                return '404 Not Found', f'No such target id: {tab_id}'
+            self.tabs[tab_id] = self.tabs.pop(tab_id)
+            return '200 OK', 'Target activated'
+        return '404 Not Found', f'Unknown command: {p}'
+
+    def _json_info(self, tab):
+        return {'id': tab.id, 'type': 'page', 'title': tab.title, 'url': tab.url, 'description': '',
+                'devtoolsFrontendUrl': '', 'webSocketDebuggerUrl': f'ws://{self.address}/devtools/page/{tab.id}'}
+
+    def _target_info(self, tab):
+        r = {'targetId': tab.id, 'type': 'page', 'title': tab.title, 'url': tab.url, 'attached': False,
+             'canAccessOpener': False, 'browserContextId': tab.context_id}
+        if tab.opener_id:
+            r['openerId'] = tab.opener_id
+        return r
+
+    def _ws_tab(self, path):
+        """返回websocket路径对应的标签页，浏览器连接返回None，路径无效返回False"""
+        parts = path.strip('/').split('/')
+        if len(parts) != 3 or parts[0] != 'devtools':
+            return False
+        elif parts[1] == 'browser':
+            return None if parts[2] == self.id else False
+        elif parts[1] == 'page':
+            return self.tabs.get(parts[2], False)
+        return False
+
+    def _on_open(self, client):
+        pass
+
+    def _serve_websocket(self, sock, path, accept):
+        tab = self._ws_tab(path)
+        if tab is False:
+            sock.sendall(b'HTTP/1.1 404 Not Found\r\nContent-Length: 0\r\nConnection: close\r\n\r\n')
+            return
+
+        sock.sendall(('HTTP/1.1 101 WebSocket Protocol Handshake\r\nUpgrade: WebSocket\r\n'
+                      f'Connection: Upgrade\r\nSec-WebSocket-Accept: {accept}\r\n\r\n').encode())
+        conn = _Connection(self, sock, path)
+        client = _Client(conn, tab)
+        with self._lock:
+            self._connections.add(conn)
+            self._clients.add(client)
+        self._on_open(client)
+        try:
+            while not conn.closed:
+                self._handle_msg(conn, client, loads(conn.recv()))
+        except (OSError, ConnectionError, ValueError):
+            pass
+        finally:
+            with self._lock:
+                self._connections.discard(conn)
+                for c in [c for c in self._clients if c.conn is conn]:
+                    self._clients.discard(c)
+                    if c.session_id:
+                        self._sessions.pop(c.session_id, None)
+            conn.close()
+
+    def _handle_msg(self, conn, client, msg):
+        method = msg.get('method', '')
+        params = msg.get('params') or {}
+        session_id = msg.get('sessionId')
+        with self._lock:
+            self.calls[method] = self.calls.get(method, 0) + 1
+        if session_id:
+            client = self._sessions.get(session_id)
+            if client is None:
+                self._reply(conn, msg, error=FakeCDPError('Session with given id not found.'), delay=0)
+                return
+
+        delay = self.latency(method) if callable(self.latency) else self.latency
+        after = []
+        try:
+            fixture = self.fixtures.get(method)
+            if fixture is not None:
+                result = fixture(client.tab, params) if callable(fixture) else fixture
+                if isinstance(result, dict) and 'error' in result:
+                    raise FakeCDPError(result['error'].get('message', ''), result['error'].get('code', -32000))
+            else:
+                handler = getattr(self, f'_cdp_{method.replace(".", "_")}', None)
+                if handler is None:
+                    if self.strict:
+                        raise FakeCDPError(f"'{method}' wasn't found", -32601)
+                    result = {}
+                else:
+                    result = handler(client, params, after)
+        except FakeCDPError as e:
+            self._reply(conn, msg, error=e, delay=delay)
+        else:
+            if isinstance(result, _Waiting):
+                Thread(target=self._reply_when_found, args=(conn, msg, result, delay), daemon=True).start()
+            else:
+                self._reply(conn, msg, result=result, delay=delay)
+        for func in after:
+            func()
+
+    def _reply_when_found(self, conn, msg, waiting, delay):
+        """模拟页面中的MutationObserver，文档变化后结果出现或超时时回复，以定时重新查找代替监视"""
+        while True:
+            try:
+                result = waiting.find()
+            except FakeCDPError as e:
+                self._reply(conn, msg, error=e, delay=delay)
+                return
+            if waiting.found(result) or perf_counter() >= waiting.end_time:
+                self._reply(conn, msg, result=result, delay=delay)
+                return
+            sleep(.005)
+
+    def _reply(self, conn, msg, result=None, error=None, delay=0):
+        r = {'id': msg.get('id')}
+        if error:
+            r['error'] = {'code': error.code, 'message': error.message}
+        else:
+            r['result'] = result
+        if msg.get('sessionId'):
+            r['sessionId'] = msg['sessionId']
+        conn.send(r, delay)
+
+    def _send_event(self, client, method, params):
+        r = {'method': method, 'params': params}
+        if client.session_id:
+            r['sessionId'] = client.session_id
+        delay = self.latency(method) if callable(self.latency) else self.latency
+        client.conn.send(r, delay)
+
+    def _browser_event(self, method, params):
+        for client in list(self._clients):
+            if client.tab is None and client.discover:
+                self._send_event(client, method, params)
+
+    def _get_html(self, url):
+        page = self.pages.get(url)
+        if page is not None:
+            return page(url) if callable(page) else page
+        if url.startswith('data:text/html,'):
+            return unquote(url[15:])
+        return BLANK_HTML
+
+    def _detach(self, client):
+        with self._lock:
+            self._sessions.pop(client.session_id, None)
+            self._clients.discard(client)
+        browser_client = next((c for c in self._clients if c.conn is client.conn and c.tab is None
+                               and not c.session_id), None)
+        if browser_client:
+            self._send_event(browser_client, 'Target.detachedFromTarget',
+                             {'sessionId': client.session_id, 'targetId': client.tab.id})
+
+    @staticmethod
+    def _tab(client):
+        if client.tab is None:
+            raise FakeCDPError('Not attached to a page target', -32601)
+        return client.tab
+
+    # ----------------Browser、Target----------------
+    def _cdp_Browser_getVersion(self, client, params, after):
+        return {'protocolVersion': '1.3', 'product': self.product, 'revision': '@0', 'userAgent': self.user_agent,
+                'jsVersion': '12.0'}
+
+    def _cdp_Browser_close(self, client, params, after):
+        after.append(lambda: Thread(target=self.stop, daemon=True).start())
+        return {}
+
+    def _cdp_SystemInfo_getProcessInfo(self, client, params, after):
+        return {'processInfo': []}  # 不返回进程号，避免quit()误杀本机进程
+
+    def _cdp_Target_setDiscoverTargets(self, client, params, after):
+        client.discover = params.get('discover', False)
+        if client.discover:
+            after.extend(lambda t=t: self._send_event(client, 'Target.targetCreated',
+                                                      {'targetInfo': self._target_info(t)})
+                         for t in list(self.tabs.values()))
+        return {}
+
+    def _cdp_Target_getTargets(self, client, params, after):
+        return {'targetInfos': [self._target_info(t) for t in reversed(list(self.tabs.values()))]}
+
+    def _cdp_Target_getTargetInfo(self, client, params, after):
+        tab = self.tabs.get(params.get('targetId')) or client.tab
+        if tab is None and 'targetId' not in params:  # 浏览器连接上不带targetId时返回浏览器自身
+            return {'targetInfo': {'targetId': self.id, 'type': 'browser', 'title': '', 'url': '', 'attached': True}}
+        if tab is None:
+            raise FakeCDPError('No target with given id found')
+        return {'targetInfo': self._target_info(tab)}
+
+    def _cdp_Target_createTarget(self, client, params, after):
+        tab = FakeTab(self, uuid4().hex.upper(), params.get('url', 'about:blank'))
+        tab.context_id = params.get('browserContextId', 'DEFAULT')
+        self.tabs[tab.id] = tab
+        after.append(lambda: self._browser_event('Target.targetCreated', {'targetInfo': self._target_info(tab)}))
+        return {'targetId': tab.id}
+
+    def _cdp_Target_closeTarget(self, client, params, after):
+        if params.get('targetId') not in self.tabs:
+            raise FakeCDPError('No target with given id found')
+        after.append(lambda: self.close_tab(params['targetId']))
+        return {'success': True}
+
+    def _cdp_Target_activateTarget(self, client, params, after):
+        if params.get('targetId') not in self.tabs:
+            raise FakeCDPError('No target with given id found')
+        self.tabs[params['targetId']] = self.tabs.pop(params['targetId'])  # /json按激活顺序排列
+        return {}
+
+    def _cdp_Target_attachToTarget(self, client, params, after):
+        tab = self.tabs.get(params.get('targetId'))
+        if tab is None:
+            raise FakeCDPError('No target with given id found')
+        session = _Client(client.conn, tab, uuid4().hex.upper())
+        with self._lock:
+            self._sessions[session.session_id] = session
+            self._clients.add(session)
+        return {'sessionId': session.session_id}
+
+    def _cdp_Target_detachFromTarget(self, client, params, after):
+        session = self._sessions.get(params.get('sessionId'))
+        if session is None:
+            raise FakeCDPError('No session with given id')
+        after.append(lambda: self._detach(session))
+        return {}
+
+    def _cdp_Target_createBrowserContext(self, client, params, after):
+        return {'browserContextId': uuid4().hex.upper()}
+
+    # ----------------Page----------------
+    def _enable(self, client, domain):
+        client.domains.add(domain)
+        return {}
+
+    def _cdp_Page_enable(self, client, params, after):
+        return self._enable(client, 'Page')
+
+    def _cdp_DOM_enable(self, client, params, after):
+        return self._enable(client, 'DOM')
+
+    def _cdp_Runtime_enable(self, client, params, after):
+        return self._enable(client, 'Runtime')
+
+    def _cdp_Network_enable(self, client, params, after):
+        return self._enable(client, 'Network')
+
+    def _cdp_Network_disable(self, client, params, after):
+        client.domains.discard('Network')
+        return {}
+
+    def _cdp_Page_getFrameTree(self, client, params, after):
+        tab = self._tab(client)
+        return {'frameTree': {'frame': {'id': tab.id, 'loaderId': tab.loader_id, 'url': tab.url,
+                                        'securityOrigin': '://', 'mimeType': 'text/html'}}}
+
+    def _cdp_Page_addScriptToEvaluateOnNewDocument(self, client, params, after):
+        return {'identifier': str(next(self._ids))}
+
+    def _cdp_Page_navigate(self, client, params, after):
+        tab = self._tab(client)
+        url = params.get('url', '')
+        if not match(r'^[a-zA-Z][\w+.-]*:', url):
+            raise FakeCDPError('Cannot navigate to invalid URL')
+        if '#' in url and url.split('#', 1)[0] == tab.url.split('#', 1)[0]:
+            tab.url = url
+            return {'frameId': tab.id}
+        self.emit(tab.id, 'Page.frameStartedLoading', {'frameId': tab.id})
+        tab.url = url
+        tab.ready_state = 'loading'
+        tab.set_html(self._get_html(url))
+        self.emit(tab.id, 'DOM.documentUpdated')
+        after.append(lambda: self._load(tab))
+        return {'frameId': tab.id, 'loaderId': tab.loader_id}
+
+    def _cdp_Page_reload(self, client, params, after):
+        tab = self._tab(client)
+        self.emit(tab.id, 'Page.frameStartedLoading', {'frameId': tab.id})
+        tab.ready_state = 'loading'
+        tab.set_html(self._get_html(tab.url))
+        self.emit(tab.id, 'DOM.documentUpdated')
+        after.append(lambda: self._load(tab))
+        return {}
+
+    def _load(self, tab):
+        self.emit(tab.id, 'Page.frameNavigated', {'frame': {'id': tab.id, 'loaderId': tab.loader_id, 'url': tab.url,
+                                                            'securityOrigin': '://', 'mimeType': 'text/html'},
+                                                  'type': 'Navigation'})
+        tab.ready_state = 'interactive'
+        self.emit(tab.id, 'Page.domContentEventFired', {'timestamp': perf_counter()})
+        tab.ready_state = 'complete'
+        self.emit(tab.id, 'Page.loadEventFired', {'timestamp': perf_counter()})
+        self.emit(tab.id, 'Page.frameStoppedLoading', {'frameId': tab.id})
+        self._browser_event('Target.targetInfoChanged', {'targetInfo': self._target_info(tab)})
+
+    def _cdp_Page_getNavigationHistory(self, client, params, after):
+        tab = self._tab(client)
+        return {'currentIndex': 0, 'entries': [{'id': 1, 'url': tab.url, 'userTypedURL': tab.url,
+                                                'title': tab.title, 'transitionType': 'typed'}]}
+
+    def _cdp_Page_getLayoutMetrics(self, client, params, after):
+        viewport = {'pageX': 0, 'pageY': 0, 'clientWidth': 1280, 'clientHeight': 720}
+        size = {'x': 0, 'y': 0, 'width': 1280, 'height': 720}
+        return {'layoutViewport': viewport, 'cssLayoutViewport': viewport,
+                'visualViewport': dict(viewport, offsetX=0, offsetY=0, scale=1, zoom=1),
+                'cssVisualViewport': dict(viewport, offsetX=0, offsetY=0, scale=1, zoom=1),
+                'contentSize': size, 'cssContentSize': size}
+
+    # ----------------DOM----------------
+    def _cdp_DOM_getDocument(self, client, params, after):
+        tab = self._tab(client)
+        return {'root': tab.describe(tab.doc_id)}
+
+    def _cdp_DOM_describeNode(self, client, params, after):
+        tab = self._tab(client)
+        return {'node': tab.describe(tab.node_id_of(params))}
+
+    def _cdp_DOM_resolveNode(self, client, params, after):
+        tab = self._tab(client)
+        return {'object': tab.remote_node(tab.node_id_of(params))}
+
+    def _cdp_DOM_requestNode(self, client, params, after):
+        tab = self._tab(client)
+        return {'nodeId': tab.node_id_of(params)}
+
+    def _cdp_DOM_getAttributes(self, client, params, after):
+        tab = self._tab(client)
+        node_id = tab.node_id_of(params)
+        if node_id == tab.doc_id:
+            raise FakeCDPError('Node is not an Element')
+        return {'attributes': tab.describe(node_id)['attributes']}
+
+    def _cdp_DOM_getOuterHTML(self, client, params, after):
+        tab = self._tab(client)
+        return {'outerHTML': tab.outer_html(tab.node_id_of(params))}
+
+    def _cdp_DOM_performSearch(self, client, params, after):
+        search_id, num = self._tab(client).search(params.get('query', ''))
+        return {'searchId': search_id, 'resultCount': num}
+
+    def _cdp_DOM_getSearchResults(self, client, params, after):
+        return {'nodeIds': self._tab(client).search_results(params.get('searchId'), params.get('fromIndex', 0),
+                                                             params.get('toIndex', 0))}
+
+    def _cdp_DOM_discardSearchResults(self, client, params, after):
+        self._tab(client).discard_search(params.get('searchId'))
+        return {}
+
+    def _cdp_DOM_setAttributeValue(self, client, params, after):
+        tab = self._tab(client)
+        node_id = tab.node_id_of(params)
+        tab.node(node_id).set(params['name'], params['value'])
+        self.emit(tab.id, 'DOM.attributeModified', {'nodeId': node_id, 'name': params['name'],
+                                                    'value': params['value']})
+        return {}
+
+    def _cdp_DOM_requestChildNodes(self, client, params, after):
+        self._tab(client).node_id_of(params)
+        return {}
+
+    def _cdp_DOM_getBoxModel(self, client, params, after):
+        tab = self._tab(client)
+        y = (tab.node_id_of(params) - tab.doc_id) * 20 % 700
+        quad = [8, y, 108, y, 108, y + 20, 8, y + 20]
+        return {'model': {'content': quad, 'padding': quad, 'border': quad, 'margin': quad,
+                          'width': 100, 'height': 20}}
+
+    # ----------------Runtime----------------
+    def _cdp_Runtime_evaluate(self, client, params, after):
+        tab = self._tab(client)
+        expr = params.get('expression', '').strip().rstrip(';').strip()
+        if expr == 'document':
+            return {'result': tab.remote_node(tab.doc_id)}
+        elif expr == 'document.readyState':
+            value = tab.ready_state
+        elif expr == 'document.title':
+            value = tab.title
+        elif expr in ('location.href', 'window.location.href', 'document.URL'):
+            value = tab.url
+        elif expr == 'navigator.userAgent':
+            value = self.user_agent
+        else:
+            return {'result': self._literal(expr)}
+        return {'result': tab.remote_value(value)}
+
+    def _cdp_Runtime_callFunctionOn(self, client, params, after):
+        r = match(_WAIT_JS, params.get('functionDeclaration', ''), DOTALL)
+        if r:
+            args = params.get('arguments') or ({},)
+            find = dict(params, functionDeclaration=r.group(1), arguments=[])
+            return _Waiting(lambda: self._cdp_Runtime_callFunctionOn(client, find, after),
+                            (args[0].get('value') or 0) / 1000, int(r.group(2)))
+        tab = self._tab(client)
+        obj = tab.obj(params.get('objectId'))
+        js = params.get('functionDeclaration', '')
+        if js.startswith('function(){return Array.from(arguments, n => [n.nodeType'):  # 批量获取节点信息
+            infos = [tab.describe(tab.node_id_of(a)) for a in params.get('arguments', ())]
+            return {'result': {'type': 'object', 'subtype': 'array', 'className': 'Array',
+                               'value': [[i['nodeType'], i['localName'], i['nodeValue']] for i in infos]}}
+        if obj[0] == 'node':
+            context = tab.context_of(obj[1])
+            r = search(r'\.querySelector(All)?\("(.*)"\);?\s*}$', js)
+            if r:
+                items = tab.query(context, r.group(2).replace(r'\"', '"'))
+                if items is None:
+                    return self._exception(f"Failed to execute 'querySelector' on 'Document': "
+                                           f"'{r.group(2)}' is not a valid selector.")
+                if r.group(1):
+                    return {'result': tab.remote_list(items, False)}
+                return {'result': tab.remote_value(items[0] if items else None)}
+
+            r = search(r"document\.evaluate\('(.*)',\s*this[^,]*,\s*null,\s*(\d),", js, DOTALL)
+            if r:
+                items = tab.query(context, r.group(1).replace(r"\'", "'"), True)
+                if items is None:
+                    return self._exception(f"Failed to execute 'evaluate' on 'Document': "
+                                           f"The string '{r.group(1)}' is not a valid XPath expression.")
+                if r.group(2) == '9':
+                    return {'result': tab.remote_value(items[0] if items else None)}
+                elif r.group(2) == '7':
+                    return {'result': tab.remote_list([str(i) if isinstance(i, str) else i for i in items], True)}
+                return {'result': tab.remote_value(items[0] if items else '')}
+
+        body = search(r'{(.*)}', js, DOTALL)
+        body = body.group(1).strip().rstrip(';').strip() if body else js
+        if body.startswith('return '):
+            body = body[7:].strip()
+        args = [a.get('value') for a in params.get('arguments', ())]
+        r = match(r'^arguments\[(\d+)]$', body)
+        if r:
+            i = int(r.group(1))
+            return {'result': tab.remote_value(args[i] if i < len(args) else None)}
+        if body == 'JSON.stringify(this)':
+            return {'result': {'type': 'string', 'value': dumps(obj[1] if obj[0] == 'array' else {})}}
+        if obj[0] == 'node' and obj[1] != tab.doc_id:
+            e = tab.node(obj[1])
+            if body in ('this.innerText', 'this.textContent'):
+                return {'result': tab.remote_value(e.text_content())}
+            elif body == 'this.innerHTML':
+                return {'result': tab.remote_value(
+                    (e.text or '') + ''.join(tostring(c, encoding='unicode') for c in e))}
+            elif body == 'this.tagName':
+                return {'result': tab.remote_value(e.tag.upper())}
+            r = match(r'^this\.getAttribute\(["\'](.+)["\']\)$', body)
+            if r:
+                return {'result': tab.remote_value(e.get(r.group(1)))}
+        return {'result': self._literal(body)}
+
+    def _cdp_Runtime_getProperties(self, client, params, after):
+        tab = self._tab(client)
+        kind, items = tab.obj(params.get('objectId'))
+        if kind == 'node':
+            return {'result': []}
+        r = [{'name': str(i), 'value': tab.remote_value(v), 'configurable': True, 'enumerable': True,
+              'writable': True, 'isOwn': True} for i, v in enumerate(items)]
+        if kind == 'array':
+            r.append({'name': 'length', 'value': {'type': 'number', 'value': len(items)}, 'isOwn': True})
+        return {'result': r}
+
+    def _cdp_Runtime_releaseObject(self, client, params, after):
+        self._tab(client)._objects.pop(params.get('objectId'), None)
+        return {}
+
+    @staticmethod
+    def _literal(expr):
+        """只支持字面量表达式，其它表达式返回undefined"""
+        if expr in ('', 'undefined'):
+            return {'type': 'undefined'}
+        try:
+            value = loads(expr.replace("'", '"') if expr.startswith("'") else expr)
+        except ValueError:
+            return {'type': 'undefined'}
+        if value is None:
+            return {'type': 'object', 'subtype': 'null', 'value': None}
+        elif isinstance(value, bool):
+            return {'type': 'boolean', 'value': value}
+        elif isinstance(value, (int, float)):
+            return {'type': 'number', 'value': value, 'description': str(value)}
+        elif isinstance(value, str):
+            return {'type': 'string', 'value': value}
+        return {'type': 'object', 'className': 'Object', 'description': 'Object', 'value': value}
+
+    @staticmethod
+    def _exception(text):
+        return {'result': {'type': 'object', 'subtype': 'error', 'className': 'SyntaxError', 'description': text},
+                'exceptionDetails': {'exceptionId': 1, 'text': 'Uncaught', 'lineNumber': 0, 'columnNumber': 0}}
+
+    # ----------------Network----------------
+    def _cdp_Storage_getStorageKeyForFrame(self, client, params, after):
+        u = urlparse(self._tab(client).url)
+        return {'storageKey': f'{u.scheme}://{u.netloc}/'}
+
+    def _cdp_Network_getResponseBody(self, client, params, after):
+        body = self._tab(client).network_bodies.get(params.get('requestId'))
+        if body is None:
+            raise FakeCDPError('No resource with given identifier found')
+        return {'body': body, 'base64Encoded': False}
@@ -0,0 +1,358 @@
+# -*- coding:utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Website  : https://DrissionPage.cn
+@Copyright: (c) 2020 by g1879, Inc. All Rights Reserved.
+"""
+from itertools import count
+from socket import socket
+from socketserver import ThreadingTCPServer
+from threading import Lock, Condition, Thread
+from typing import Union, Callable, Optional, Dict, List, Tuple, Any, Set
+
+from lxml.html import HtmlElement
+
+BLANK_HTML: str = ...
+_WS_GUID: str = ...
+
+
+class FakeCDPError(Exception):
+    message: str
+    code: int
+
+    def __init__(self, message: str, code: int = -32000): ...
+
+
+class FakeTab(object):
+    browser: FakeBrowser
+    id: str
+    url: str
+    title: str
+    ready_state: str
+    loader_id: Optional[str]
+    opener_id: Optional[str]
+    context_id: str
+    network_bodies: Dict[str, str]
+    _doc: Optional[HtmlElement]
+    _doc_id: int
+    _nodes: Dict[int, HtmlElement]
+    _node_ids: Dict[HtmlElement, int]
+    _objects: Dict[str, Tuple[str, Any]]
+    _searches: Dict[str, List[int]]
+
+    def __init__(self, browser: FakeBrowser, tab_id: str, url: str = 'about:blank'): ...
+
+    @property
+    def doc_id(self) -> int:
+        """返回document节点的id"""
+        ...
+
+    def set_html(self, html: Optional[str]) -> None:
+        """替换文档内容，原有的node id和object id全部失效
+        :param html: html文本，为空时使用空白页
+        :return: None
+        """
+        ...
+
+    @property
+    def html(self) -> str:
+        """返回整个文档的html"""
+        ...
+
+    def node(self, node_id: int) -> Optional[HtmlElement]:
+        """根据id返回元素，document返回None，找不到时抛出FakeCDPError"""
+        ...
+
+    def node_id_of(self, params: dict) -> int:
+        """根据nodeId、backendNodeId或objectId参数获取节点id
+        :param params: cdp方法的参数
+        :return: 节点id
+        """
+        ...
+
+    def describe(self, node_id: int) -> dict:
+        """返回DOM.describeNode格式的节点信息"""
+        ...
+
+    def outer_html(self, node_id: int) -> str:
+        """返回节点的outerHTML"""
+        ...
+
+    def remote_node(self, node_id: int) -> dict:
+        """返回节点的RemoteObject"""
+        ...
+
+    def remote_list(self, items: list, is_array: bool) -> dict:
+        """返回数组或NodeList的RemoteObject
+        :param items: 成员列表
+        :param is_array: 是否Array，否则为NodeList
+        :return: RemoteObject
+        """
+        ...
+
+    def remote_value(self, value: Any) -> dict:
+        """把python对象转换为RemoteObject"""
+        ...
+
+    def obj(self, obj_id: str) -> Tuple[str, Any]:
+        """根据object id返回(类型, 值)"""
+        ...
+
+    def context_of(self, node_id: int) -> HtmlElement:
+        """返回在节点内查找时使用的lxml元素"""
+        ...
+
+    def query(self, context: HtmlElement, selector: str, xpath: bool = False) -> Optional[list]:
+        """在元素内查找，语法错误时返回None
+        :param context: 在其中查找的元素
+        :param selector: css selector或xpath
+        :param xpath: 是否xpath
+        :return: 结果列表
+        """
+        ...
+
+    def search(self, query: str) -> Tuple[str, int]:
+        """执行DOM.performSearch
+        :param query: css selector或xpath
+        :return: (searchId, 结果数量)
+        """
+        ...
+
+    def search_results(self, search_id: str, from_index: int, to_index: int) -> List[int]:
+        """返回搜索结果中的节点id"""
+        ...
+
+    def discard_search(self, search_id: str) -> None:
+        """丢弃搜索结果"""
+        ...
+
+
+class _Client(object):
+    conn: _Connection
+    tab: Optional[FakeTab]
+    session_id: Optional[str]
+    domains: Set[str]
+    discover: bool
+
+    def __init__(self, conn: _Connection, tab: FakeTab = None, session_id: str = None): ...
+
+
+class _Connection(object):
+    browser: FakeBrowser
+    sock: socket
+    path: str
+    closed: bool
+    _closing: bool
+    _lock: Lock
+    _queue: list
+    _cond: Condition
+    _last_due: float
+    _seq: count
+    _sender: Optional[Thread]
+
+    def __init__(self, browser: FakeBrowser, sock: socket, path: str): ...
+
+    def send(self, obj: dict, delay: float = 0) -> None:
+        """发送一条消息
+        :param obj: 消息内容
+        :param delay: 延迟发送的秒数，延迟不会打乱消息顺序
+        :return: None
+        """
+        ...
+
+    def _write(self, frame: bytes, delay: float = 0) -> None:
+        """立即或延迟发送一个websocket帧"""
+        ...
+
+    def _send_loop(self) -> None:
+        """发送延迟消息的线程"""
+        ...
+
+    def recv(self) -> bytes:
+        """返回一条完整消息，连接关闭时抛出ConnectionError"""
+        ...
+
+    def close(self, flush: bool = False) -> None:
+        """关闭连接
+        :param flush: 是否等延迟发送的消息发完再关闭
+        :return: None
+        """
+        ...
+
+
+class _Server(ThreadingTCPServer): ...
+
+
+class FakeBrowser(object):
+    pages: Dict[str, Union[str, Callable[[str], str]]]
+    fixtures: Dict[str, Union[dict, Callable[[Optional[FakeTab], dict], dict]]]
+    latency: Union[float, Callable[[str], float]]
+    strict: bool
+    id: str
+    user_agent: str
+    product: str
+    calls: Dict[str, int]
+    tabs: Dict[str, FakeTab]
+    _ids: count
+    _host: str
+    _port: int
+    _server: Optional[_Server]
+    _clients: Set[_Client]
+    _sessions: Dict[str, _Client]
+    _connections: Set[_Connection]
+    _lock: Lock
+
+    def __init__(self,
+                 pages: Dict[str, Union[str, Callable[[str], str]]] = None,
+                 fixtures: Dict[str, Union[dict, Callable[[Optional[FakeTab], dict], dict]]] = None,
+                 latency: Union[float, Callable[[str], float]] = 0,
+                 host: str = '127.0.0.1',
+                 port: int = 0,
+                 strict: bool = False):
+        """
+        :param pages: {url: html或返回html的方法}，Page.navigate时使用，未收录的url打开空白页
+        :param fixtures: {cdp方法名: 结果或方法}，方法接收(标签页对象, 参数)，优先于内置处理，结果含error时作为错误返回
+        :param latency: 每条消息注入的延迟（秒），可传入接收方法名返回延迟的方法
+        :param host: 监听的ip
+        :param port: 监听的端口，为0时自动分配
+        :param strict: 遇到未支持的方法时是否返回方法不存在错误，为False时返回空结果
+        """
+        ...
+
+    def __enter__(self) -> FakeBrowser: ...
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None: ...
+
+    @property
+    def address(self) -> str:
+        """返回'ip:port'格式的地址，可直接传给Chromium()"""
+        ...
+
+    @property
+    def tab_ids(self) -> List[str]:
+        """返回所有标签页id"""
+        ...
+
+    def start(self, tabs: int = 1) -> FakeBrowser:
+        """启动服务
+        :param tabs: 初始标签页数量
+        :return: 自身
+        """
+        ...
+
+    def stop(self) -> None:
+        """关闭所有连接并停止服务"""
+        ...
+
+    def new_tab(self, url: str = 'about:blank', opener_id: str = None) -> FakeTab:
+        """新建标签页
+        :param url: 标签页的url
+        :param opener_id: 打开者的id
+        :return: 标签页对象
+        """
+        ...
+
+    def close_tab(self, tab_id: str) -> bool:
+        """关闭标签页
+        :param tab_id: 标签页id
+        :return: 是否存在该标签页
+        """
+        ...
+
+    def set_html(self, tab_id: str, html: str) -> None:
+        """设置标签页的文档内容，并发送DOM.documentUpdated事件
+        :param tab_id: 标签页id
+        :param html: html文本
+        :return: None
+        """
+        ...
+
+    def emit(self, tab_id: str, method: str, params: dict = None, domain_only: bool = True) -> None:
+        """向连接到标签页的客户端发送事件
+        :param tab_id: 标签页id
+        :param method: 事件名
+        :param params: 事件参数
+        :param domain_only: 是否只发给已enable该域的客户端
+        :return: None
+        """
+        ...
+
+    def emit_requests(self,
+                      tab_id: str = None,
+                      num: int = 1,
+                      url: str = 'https://example.com/api',
+                      method: str = 'GET',
+                      body: str = '{}',
+                      res_type: str = 'XHR',
+                      status: int = 200) -> None:
+        """模拟标签页发出网络请求，依次触发requestWillBeSent、responseReceived和loadingFinished事件
+        :param tab_id: 标签页id，为None时使用第一个标签页
+        :param num: 请求数量
+        :param url: 请求的url
+        :param method: 请求方法
+        :param body: 响应正文，Network.getResponseBody时返回
+        :param res_type: 资源类型
+        :param status: 响应状态码
+        :return: None
+        """
+        ...
+
+    def _handle_request(self, sock: socket) -> None:
+        """处理一个tcp连接，分发http请求或升级为websocket"""
+        ...
+
+    def _http(self, path: str) -> Tuple[str, Union[dict, list, str]]:
+        """处理/json系列http接口
+        :param path: 请求路径
+        :return: (状态, 正文)
+        """
+        ...
+
+    def _json_info(self, tab: FakeTab) -> dict: ...
+
+    def _target_info(self, tab: FakeTab) -> dict: ...
+
+    def _ws_tab(self, path: str) -> Union[FakeTab, None, bool]:
+        """返回websocket路径对应的标签页，浏览器连接返回None，路径无效返回False"""
+        ...
+
+    def _on_open(self, client: _Client) -> None:
+        """websocket连接建立后调用"""
+        ...
+
+    def _serve_websocket(self, sock: socket, path: str, accept: str) -> None: ...
+
+    def _handle_msg(self, conn: _Connection, client: _Client, msg: dict) -> None:
+        """处理一条cdp指令"""
+        ...
+
+    def _reply(self, conn: _Connection, msg: dict, result: dict = None, error: FakeCDPError = None,
+               delay: float = 0) -> None: ...
+
+    def _send_event(self, client: _Client, method: str, params: dict) -> None: ...
+
+    def _browser_event(self, method: str, params: dict) -> None:
+        """向开启了目标发现的浏览器连接发送事件"""
+        ...
+
+    def _get_html(self, url: str) -> str:
+        """返回url对应的html"""
+        ...
+
+    def _detach(self, client: _Client) -> None: ...
+
+    def _load(self, tab: FakeTab) -> None:
+        """依次发送页面加载的事件"""
+        ...
+
+    @staticmethod
+    def _tab(client: _Client) -> FakeTab: ...
+
+    @staticmethod
+    def _literal(expr: str) -> dict:
+        """把字面量表达式转换为RemoteObject，其它表达式返回undefined"""
+        ...
+
+    @staticmethod
+    def _exception(text: str) -> dict: ...
@@ -5,13 +5,19 @@
 @Website  : https://DrissionPage.cn
 @Copyright: (c) 2020 by g1879, Inc. All Rights Reserved.
 """
+from functools import lru_cache
 from re import split
 
+from lxml.etree import XPath
+
 from .by import By
 from .._functions.settings import Settings as _S
 from ..errors import LocatorError
 
+__LOC_CACHE_SIZE__ = 1024  # 缓存解析结果和预编译对象的定位符数量
+
 
+@lru_cache(maxsize=__LOC_CACHE_SIZE__)
 def locator_to_tuple(loc):
     loc = _preprocess(loc)
 
@@ -94,19 +100,25 @@ def is_selenium_loc(loc):
 
 
 def get_loc(loc, translate_css=False, css_mode=False):
-    if isinstance(loc, tuple):
-        loc = translate_css_loc(loc) if css_mode else translate_loc(loc)
+    if not isinstance(loc, (str, tuple)):
+        raise LocatorError(ALLOW_TYPE=_S._lang.LOC_FORMAT, CURR_VAL=loc)
+    try:
+        return _get_loc(loc, translate_css, css_mode)
+    except TypeError:  # 元组中有不能哈希的对象，不使用缓存
+        return _get_loc.__wrapped__(loc, translate_css, css_mode)
 
-    elif isinstance(loc, str):
-        loc = str_to_css_loc(loc) if css_mode else str_to_xpath_loc(loc)
 
+@lru_cache(maxsize=__LOC_CACHE_SIZE__)
+def _get_loc(loc, translate_css, css_mode):
+    if isinstance(loc, tuple):
+        loc = translate_css_loc(loc) if css_mode else translate_loc(loc)
     else:
-        raise LocatorError(ALLOW_TYPE=_S._lang.LOC_FORMAT, CURR_VAL=loc)
+        loc = str_to_css_loc(loc) if css_mode else str_to_xpath_loc(loc)
 
     if loc[0] == 'css selector' and translate_css:
-        from lxml.cssselect import CSSSelector, ExpressionError
+        from lxml.cssselect import ExpressionError
         try:
-            path = str(CSSSelector(loc[1], translator='html').path)
+            path = str(compile_css(loc[1]).path)
             path = path[20:] if path.startswith('descendant-or-self::') else path
             loc = 'xpath', path
         except ExpressionError:
@@ -115,6 +127,20 @@ def get_loc(loc, translate_css=False, css_mode=False):
     return loc
 
 
+@lru_cache(maxsize=__LOC_CACHE_SIZE__)
+def compile_xpath(path):
+    """返回预编译的lxml XPath对象"""
+    return XPath(path)
+
+
+@lru_cache(maxsize=__LOC_CACHE_SIZE__)
+def compile_css(selector):
+    """返回预编译的lxml CSSSelector对象"""
+    from lxml.cssselect import CSSSelector
+    return CSSSelector(selector, translator='html')
+
+
+@lru_cache(maxsize=__LOC_CACHE_SIZE__)
 def str_to_xpath_loc(loc):
     loc_by = 'xpath'
     loc = _preprocess(loc)
@@ -166,6 +192,7 @@ def str_to_xpath_loc(loc):
     return loc_by, loc_str
 
 
+@lru_cache(maxsize=__LOC_CACHE_SIZE__)
 def str_to_css_loc(loc):
     loc_by = 'css selector'
     loc = _preprocess(loc)
@@ -7,9 +7,14 @@
 """
 from typing import Union
 
+from lxml.cssselect import CSSSelector
+from lxml.etree import XPath
+
+__LOC_CACHE_SIZE__: int = ...
+
 
 def locator_to_tuple(loc: str) -> dict:
-    """解析定位字符串生成dict格式数据
+    """解析定位字符串生成dict格式数据，结果会被缓存，不能修改
     :param loc: 待处理的字符串
     :return: 格式： {'and': bool, 'args': ['属性名称', '匹配方式', '属性值', 是否否定]}
     """
@@ -38,6 +43,27 @@ def get_loc(loc: Union[tuple, str],
     ...
 
 
+def _get_loc(loc: Union[tuple, str], translate_css: bool, css_mode: bool) -> tuple:
+    """get_loc()的缓存实现，参数与get_loc()相同"""
+    ...
+
+
+def compile_xpath(path: str) -> XPath:
+    """返回预编译的lxml XPath对象，结果会被缓存
+    :param path: xpath字符串
+    :return: XPath对象
+    """
+    ...
+
+
+def compile_css(selector: str) -> CSSSelector:
+    """返回预编译的lxml CSSSelector对象，结果会被缓存
+    :param selector: css selector字符串
+    :return: CSSSelector对象
+    """
+    ...
+
+
 def str_to_xpath_loc(loc: str) -> tuple:
     """处理元素查找语句
     :param loc: 查找语法字符串
@@ -5,10 +5,24 @@
 @Website  : https://DrissionPage.cn
 @Copyright: (c) 2020 by g1879, Inc. All Rights Reserved.
 """
+from json import loads as _json_loads, dumps as _json_dumps
 from pathlib import Path
 
 from .texts import get_txt_class
 
+try:
+    from orjson import loads as _fast_loads, dumps as _orjson_dumps
+
+    def _fast_dumps(obj):
+        try:
+            return _orjson_dumps(obj).decode()
+        except TypeError:  # orjson不支持的类型交回标准库处理
+            return _json_dumps(obj)
+
+except ImportError:
+    _fast_loads = _json_loads
+    _fast_dumps = _json_dumps
+
 
 class Settings(object):
     raise_when_ele_not_found = False
@@ -18,8 +32,12 @@ class Settings(object):
     cdp_timeout = 30
     browser_connect_timeout = 30
     auto_handle_alert = None
+    cdp_metrics = False
+    cdp_recorder = None
     _lang = get_txt_class(None)
     suffixes_list = str(Path(__file__).parent.absolute() / 'suffixes.dat').replace('\\', '/')
+    json_loads = staticmethod(_fast_loads)
+    json_dumps = staticmethod(_fast_dumps)
 
     @classmethod
     def set_raise_when_ele_not_found(cls, on_off=True):
@@ -56,6 +74,22 @@ class Settings(object):
         cls.auto_handle_alert = accept
         return cls
 
+    @classmethod
+    def set_cdp_metrics(cls, on_off=True):
+        cls.cdp_metrics = on_off
+        return cls
+
+    @classmethod
+    def set_cdp_recorder(cls, path=None):
+        if cls.cdp_recorder is not None:
+            cls.cdp_recorder.close()
+        if path:
+            from .._units.recorder import CDPRecorder
+            cls.cdp_recorder = CDPRecorder(path)
+        else:
+            cls.cdp_recorder = None
+        return cls
+
     @classmethod
     def set_language(cls, code):
         cls._lang = get_txt_class(code)
@@ -65,3 +99,9 @@ class Settings(object):
     def set_suffixes_list(cls, path):
         cls.suffixes_list = str(Path(path).absolute()).replace('\\', '/')
         return cls
+
+    @classmethod
+    def set_json_codec(cls, loads=None, dumps=None):
+        cls.json_loads = staticmethod(loads or _fast_loads)
+        cls.json_dumps = staticmethod(dumps or _fast_dumps)
+        return cls
@@ -6,9 +6,10 @@
 @Copyright: (c) 2020 by g1879, Inc. All Rights Reserved.
 """
 from pathlib import Path
-from typing import Optional, Union, Literal
+from typing import Optional, Union, Literal, Callable, Any
 
 from .texts import Texts
+from .._units.recorder import CDPRecorder
 
 
 class Settings(object):
@@ -19,8 +20,12 @@ class Settings(object):
     cdp_timeout: float = ...
     browser_connect_timeout: float = ...
     auto_handle_alert: Optional[bool] = ...
+    cdp_metrics: bool = ...
+    cdp_recorder: Optional[CDPRecorder] = ...
     _lang: Texts = ...
     suffixes_list: str = ...
+    json_loads: Callable[[Union[str, bytes]], Any] = ...
+    json_dumps: Callable[[Any], str] = ...
 
     @classmethod
     def set_raise_when_ele_not_found(cls, on_off: bool = True) -> Settings:
@@ -78,6 +83,22 @@ class Settings(object):
         """
         ...
 
+    @classmethod
+    def set_cdp_metrics(cls, on_off: bool = True) -> Settings:
+        """设置是否记录cdp调用统计，只对之后创建的连接生效
+        :param on_off: bool表示开或关
+        :return: None
+        """
+        ...
+
+    @classmethod
+    def set_cdp_recorder(cls, path: Union[str, Path, None] = None) -> Settings:
+        """设置把cdp消息记录到文件，只对之后创建的连接生效，记录可用ReplayBrowser回放
+        :param path: 文件路径，以.gz结尾时压缩保存，为None时停止记录并关闭文件
+        :return: None
+        """
+        ...
+
     @classmethod
     def set_language(cls, code: Literal['zh_cn', 'en']) -> Settings:
         """设置报错和提示信息使用的语言
@@ -93,3 +114,13 @@ class Settings(object):
         :return: None
         """
         ...
+
+    @classmethod
+    def set_json_codec(cls, loads: Callable[[Union[str, bytes]], Any] = None,
+                       dumps: Callable[[Any], str] = None) -> Settings:
+        """设置与浏览器通讯时使用的json编解码方法，默认有orjson时使用orjson，否则使用标准库json
+        :param loads: 把str或bytes解析为对象的方法，为None时恢复默认
+        :param dumps: 把对象序列化为str的方法，为None时恢复默认
+        :return: None
+        """
+        ...
@@ -114,6 +114,9 @@ class Texts(object):
     NO_SUCH_KEY_ = '没有这个按键: {}'
     NO_NEW_TAB = '没有等到新标签页。'
     NO_SUCH_TAB = '没有找到指定标签页。'
+    POOL_CLOSED = '标签页池已关闭。'
+    WORKER_CRASHED = '工作进程多次在执行该任务时崩溃。'
+    PIPE_POSIX_ONLY = '管道连接只支持Linux和macOS。'
     NEED_DOMAIN = '需设置domain或url值。如设置url值，需以http开头。'
     NEED_DOMAIN2 = 'cookie必须带有"domain"或"url"字段。'
     NEED_ARG_ = '{}必须设置。'
@@ -299,6 +302,9 @@ class English(Texts):
     NO_SUCH_KEY_ = 'There is no button: {}'
     NO_NEW_TAB = 'Failed to wait for new tab.'
     NO_SUCH_TAB = 'The specified tab was not found.'
+    POOL_CLOSED = 'The tab pool is closed.'
+    WORKER_CRASHED = 'Worker processes crashed repeatedly while running this task.'
+    PIPE_POSIX_ONLY = 'The pipe transport is only supported on Linux and macOS.'
     NEED_DOMAIN = 'You need to set a domain or url value. If the url value is set, it must start with http.'
     NEED_DOMAIN2 = 'The cookie must have a "domain" or "url" field.'
     NEED_ARG_ = '{} must be set.'
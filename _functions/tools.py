@@ -5,12 +5,13 @@
 @Website  : https://DrissionPage.cn
 @Copyright: (c) 2020 by g1879, Inc. All Rights Reserved.
 """
+from os import kill, readlink
 from pathlib import Path
 from platform import system
 from shutil import rmtree
-from tempfile import gettempdir
-from threading import Lock
-from time import perf_counter, sleep
+from tempfile import gettempdir, mkdtemp
+from threading import Lock, Thread
+from time import perf_counter, sleep, time
 
 from .._configs.options_manage import OptionsManager
 from .._functions.settings import Settings as _S
@@ -28,11 +29,14 @@ class PortFinder(object):
         tmp = Path(path) if path else Path(gettempdir()) / 'DrissionPage'
         self.tmp_dir = tmp / 'autoPortData'
         self.tmp_dir.mkdir(parents=True, exist_ok=True)
-        if str(self.tmp_dir.absolute()) not in PortFinder.checked_paths:
-            for i in self.tmp_dir.iterdir():
-                if i.is_dir() and not port_is_using('127.0.0.1', i.name):
-                    rmtree(i, ignore_errors=True)
-            PortFinder.checked_paths.add(str(self.tmp_dir.absolute()))
+        path = str(self.tmp_dir.absolute())
+        if path not in PortFinder.checked_paths:
+            PortFinder.checked_paths.add(path)
+            Thread(target=_clean_auto_port_dirs, args=(self.tmp_dir, time()), daemon=True).start()
+
+    def new_user_path(self, pipe=False):
+        """为--remote-debugging-port=0或管道模式启动的浏览器创建用户文件夹，不需要查找端口"""
+        return mkdtemp(prefix='pipe_' if pipe else 'port0_', dir=self.tmp_dir)
 
     def get_port(self, scope=None):
         from random import randint
@@ -60,6 +64,63 @@ class PortFinder(object):
             raise BrowserConnectError(_S._lang.NO_AVAILABLE_PORT_FOUND)
 
 
+def _clean_auto_port_dirs(tmp_dir, before):
+    """删除已退出的浏览器留下的用户文件夹，跳过before之后创建的"""
+    for i in tmp_dir.iterdir():
+        try:
+            mtime = i.stat().st_mtime
+            if not i.is_dir() or mtime >= before:
+                continue
+            if i.name.startswith('pipe_'):  # 管道模式不写端口文件，根据浏览器的锁判断
+                if before - mtime < 60 or _profile_in_use(i):
+                    continue
+                rmtree(i, ignore_errors=True)
+                continue
+            port = i.name if i.name.isdigit() else read_active_port(i)
+            if port is None:  # 浏览器写入端口文件前不删除
+                if before - mtime < 60:
+                    continue
+            elif port_is_using('127.0.0.1', port):
+                continue
+            rmtree(i, ignore_errors=True)
+        except OSError:
+            pass
+
+
+def _profile_in_use(user_path):
+    """根据浏览器在用户文件夹中创建的锁判断是否仍有浏览器在使用"""
+    try:
+        target = readlink(user_path / 'SingletonLock')  # 格式为 主机名-进程id
+    except OSError:
+        lock = user_path / 'lockfile'  # Windows中浏览器运行时独占此文件，不能删除
+        if not lock.exists():
+            return False
+        try:
+            lock.unlink()
+            return False
+        except OSError:
+            return True
+    try:
+        kill(int(target.rpartition('-')[2]), 0)
+    except ValueError:
+        return False
+    except PermissionError:  # 进程存在但属于其它用户
+        return True
+    except OSError:
+        return False
+    return True
+
+
+def read_active_port(user_path):
+    """读取浏览器写入用户文件夹的DevToolsActivePort文件，返回端口，文件不存在或未写完时返回None"""
+    try:
+        with open(Path(user_path) / 'DevToolsActivePort', encoding='utf-8') as f:
+            port = f.readline().strip()
+    except OSError:
+        return None
+    return port if port.isdigit() and port != '0' else None
+
+
 def port_is_using(ip, port):
     from socket import socket, AF_INET, SOCK_STREAM
     s = socket(AF_INET, SOCK_STREAM)
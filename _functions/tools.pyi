@@ -8,7 +8,7 @@
 from os import popen
 from pathlib import Path
 from threading import Lock
-from typing import Union, Tuple
+from typing import Union, Tuple, Optional
 
 from .._base.chromium import Chromium
 from .._pages.chromium_base import ChromiumBase
@@ -35,6 +35,38 @@ class PortFinder(object):
         """
         ...
 
+    def new_user_path(self, pipe: bool = False) -> str:
+        """为--remote-debugging-port=0或管道模式启动的浏览器创建用户文件夹，不需要查找端口
+        :param pipe: 是否管道模式，管道模式的文件夹以pipe_开头，清理时根据浏览器的锁判断是否在用
+        :return: 用户文件夹路径
+        """
+        ...
+
+
+def _clean_auto_port_dirs(tmp_dir: Path, before: float) -> None:
+    """删除已退出的浏览器留下的用户文件夹
+    :param tmp_dir: autoPortData文件夹
+    :param before: 只处理此时间戳之前修改的文件夹
+    :return: None
+    """
+    ...
+
+
+def _profile_in_use(user_path: Path) -> bool:
+    """根据浏览器在用户文件夹中创建的锁判断是否仍有浏览器在使用
+    :param user_path: 用户文件夹路径
+    :return: 是否在使用
+    """
+    ...
+
+
+def read_active_port(user_path: Union[str, Path]) -> Optional[str]:
+    """读取浏览器写入用户文件夹的DevToolsActivePort文件
+    :param user_path: 用户文件夹路径
+    :return: 端口，文件不存在或未写完时返回None
+    """
+    ...
+
 
 def port_is_using(ip: str, port: Union[str, int]) -> bool:
     """检查端口是否被占用
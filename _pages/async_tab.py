@@ -0,0 +1,171 @@
+# -*- coding:utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Website  : https://DrissionPage.cn
+@Copyright: (c) 2020 by g1879, Inc. All Rights Reserved.
+"""
+from asyncio import TimeoutError as AsyncTimeoutError
+from pathlib import Path
+from time import perf_counter
+from urllib.parse import quote
+
+from .._elements.async_element import find_in_async, run_js
+from .._functions.settings import Settings as _S
+from .._functions.tools import raise_error
+from ..errors import ContextLostError, ElementLostError
+
+__ERROR__ = 'error'
+
+
+class AsyncTab(object):
+    def __init__(self, browser, tab_id):
+        self.browser = browser
+        self.tab_id = tab_id
+        self._type = 'AsyncTab'
+        self._driver = None
+        self._root_id = None
+        self._timeouts = browser.timeouts
+        self._load_mode = browser._chromium_options.load_mode
+
+    def __repr__(self):
+        return f'<AsyncTab browser_id={self.browser.id} tab_id={self.tab_id}>'
+
+    async def _connect(self):
+        self._driver = await self.browser.driver.attach(self.tab_id, self)
+        await self._driver.run_many(['Page.enable', 'DOM.enable'])
+        self._driver.set_callback('Page.frameNavigated', self._onFrameNavigated)
+
+    def _onFrameNavigated(self, **kwargs):
+        if not kwargs['frame'].get('parentId'):
+            self._root_id = None
+
+    def _on_disconnect(self):
+        self._root_id = None
+
+    @property
+    def driver(self):
+        return self._driver
+
+    @property
+    def timeout(self):
+        return self._timeouts.base
+
+    @property
+    def timeouts(self):
+        return self._timeouts
+
+    async def _run_cdp(self, cmd, **cmd_args):
+        ignore = cmd_args.pop('_ignore', None)
+        r = await self._driver.run(cmd, **cmd_args)
+        return r if __ERROR__ not in r else raise_error(r, self.browser, ignore)
+
+    async def run_cdp(self, cmd, **cmd_args):
+        r = await self._driver.run(cmd, **cmd_args)
+        return r if __ERROR__ not in r else raise_error(r, self.browser, user=True)
+
+    async def run_cdp_batch(self, cmds, timeout=None):
+        results = await self._driver.run_many(cmds, _timeout=timeout)
+        for r in results:
+            if __ERROR__ in r:
+                raise_error(r, self.browser, user=True)
+        return results
+
+    async def _get_root_id(self):
+        if self._root_id is None:
+            self._root_id = (await self._run_cdp('Runtime.evaluate', expression='document'))['result']['objectId']
+        return self._root_id
+
+    async def _call_function(self, js, obj_id=None, args=None, timeout=None):
+        """在元素或文档上执行js方法，文档对象失效时自动重新获取"""
+        kwargs = {'functionDeclaration': js, 'arguments': args or [], 'returnByValue': False,
+                  'awaitPromise': True, 'userGesture': True}
+        if timeout is not None:
+            kwargs['_timeout'] = timeout
+        if obj_id:
+            return await self._run_cdp('Runtime.callFunctionOn', objectId=obj_id, **kwargs)
+        try:
+            return await self._run_cdp('Runtime.callFunctionOn', objectId=await self._get_root_id(), **kwargs)
+        except (ContextLostError, ElementLostError):
+            self._root_id = None
+            return await self._run_cdp('Runtime.callFunctionOn', objectId=await self._get_root_id(), **kwargs)
+
+    async def get(self, url, timeout=None):
+        if isinstance(url, Path) or ('://' not in url and ':\\\\' not in url):
+            p = Path(url)
+            if p.exists():
+                url = str(p.absolute())
+        url = quote(url, safe='-_.~!*\'"();:@&=+$,/\\?#[]%')
+        timeout = timeout if timeout is not None else self._timeouts.page_load
+
+        event = 'Page.domContentEventFired' if self._load_mode == 'eager' else 'Page.loadEventFired'
+        sub = self._driver.subscribe(event)
+        try:
+            end_time = perf_counter() + timeout
+            try:
+                r = await self._run_cdp('Page.navigate', url=url, _timeout=timeout)
+            except TimeoutError:
+                return False
+            if 'errorText' in r:
+                return False
+            if self._load_mode == 'none' or not r.get('loaderId'):  # 同文档跳转不会触发加载事件
+                return True
+            try:
+                await sub.get(max(end_time - perf_counter(), 0))
+            except AsyncTimeoutError:
+                return False
+            return True
+        finally:
+            sub.close()
+
+    async def wait_loaded(self, timeout=None):
+        sub = self._driver.subscribe('Page.loadEventFired')  # 先订阅，避免检查状态后才触发的事件被错过
+        try:
+            if await self.ready_state() == 'complete':
+                return True
+            try:
+                await sub.get(timeout if timeout is not None else self._timeouts.page_load)
+            except (AsyncTimeoutError, ConnectionError):
+                return False
+            return True
+        finally:
+            sub.close()
+
+    async def ready_state(self):
+        r = await self._driver.run('Runtime.evaluate', expression='document.readyState', _timeout=3)
+        return r.get('result', {}).get('value')
+
+    async def title(self):
+        return (await self._run_cdp('Target.getTargetInfo', targetId=self.tab_id))['targetInfo']['title']
+
+    async def url(self):
+        return (await self._run_cdp('Target.getTargetInfo', targetId=self.tab_id))['targetInfo']['url']
+
+    async def html(self):
+        return (await self._run_cdp('DOM.getOuterHTML', objectId=await self._get_root_id()))['outerHTML']
+
+    async def run_js(self, script, *args, as_expr=False, timeout=None):
+        return await run_js(self, None, script, as_expr=as_expr, timeout=timeout, args=args)
+
+    async def ele(self, locator, index=1, timeout=None):
+        return await find_in_async(self, None, locator, index=index, timeout=timeout, method='ele()')
+
+    async def eles(self, locator, timeout=None):
+        return await find_in_async(self, None, locator, index=None, timeout=timeout)
+
+    def set_callback(self, event, callback):
+        """绑定cdp事件，callback可以是普通函数或协程函数"""
+        self._driver.set_callback(event, callback)
+
+    def subscribe(self, event):
+        return self._driver.subscribe(event)
+
+    async def wait_event(self, event, timeout=None):
+        return await self._driver.wait_event(event, timeout)
+
+    async def close(self):
+        await self.browser.close_tabs(self)
+
+    async def disconnect(self):
+        if self._driver:
+            await self._driver.stop()
@@ -0,0 +1,183 @@
+# -*- coding:utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Website  : https://DrissionPage.cn
+@Copyright: (c) 2020 by g1879, Inc. All Rights Reserved.
+"""
+from pathlib import Path
+from typing import Union, Optional, List, Tuple, Any, Callable, Awaitable
+
+from .chromium_base import Timeout
+from .._base.async_chromium import AsyncChromium
+from .._base.async_driver import AsyncSessionDriver, EventSubscription
+from .._elements.async_element import AsyncElement
+from .._elements.none_element import NoneElement
+
+
+class AsyncTab(object):
+    browser: AsyncChromium
+    tab_id: str
+    _type: str
+    _driver: Optional[AsyncSessionDriver]
+    _root_id: Optional[str]
+    _timeouts: Timeout
+    _load_mode: str
+
+    def __init__(self, browser: AsyncChromium, tab_id: str):
+        """
+        :param browser: AsyncChromium对象
+        :param tab_id: 标签页id
+        """
+        ...
+
+    async def _connect(self) -> None:
+        """附加到标签页并启用需要的域"""
+        ...
+
+    def _onFrameNavigated(self, **kwargs) -> None: ...
+
+    def _on_disconnect(self) -> None: ...
+
+    @property
+    def driver(self) -> Optional[AsyncSessionDriver]:
+        """返回用于控制浏览器的驱动对象"""
+        ...
+
+    @property
+    def timeout(self) -> float:
+        """返回基本超时时间"""
+        ...
+
+    @property
+    def timeouts(self) -> Timeout:
+        """返回超时设置对象"""
+        ...
+
+    async def _run_cdp(self, cmd: str, **cmd_args) -> dict:
+        """执行Chrome DevTools Protocol语句
+        :param cmd: 协议项目
+        :param cmd_args: 参数
+        :return: 执行的结果
+        """
+        ...
+
+    async def run_cdp(self, cmd: str, **cmd_args) -> dict:
+        """执行Chrome DevTools Protocol语句
+        :param cmd: 协议项目
+        :param cmd_args: 参数
+        :return: 执行的结果
+        """
+        ...
+
+    async def run_cdp_batch(self, cmds: List[Union[str, Tuple[str, dict]]], timeout: float = None) -> List[dict]:
+        """一次发送多条互不依赖的cdp指令，按顺序返回结果，任一条出错时抛出异常
+        :param cmds: 由(协议项目, 参数dict)或协议项目组成的列表
+        :param timeout: 全部指令的总超时时间（秒），为None使用全局设置
+        :return: 执行结果列表
+        """
+        ...
+
+    async def _get_root_id(self) -> str:
+        """返回document对象的object id"""
+        ...
+
+    async def _call_function(self, js: str, obj_id: str = None, args: list = None, timeout: float = None) -> dict:
+        """在元素或文档上执行js方法
+        :param js: js方法文本
+        :param obj_id: 元素的object id，为None时在document上执行
+        :param args: 已转换的参数列表
+        :param timeout: 超时时间（秒）
+        :return: cdp返回结果
+        """
+        ...
+
+    async def get(self, url: Union[str, Path], timeout: float = None) -> bool:
+        """访问url，并按加载模式等待加载完成
+        :param url: 目标url
+        :param timeout: 连接超时时间（秒），为None时使用页面加载超时设置
+        :return: 目标url是否可用
+        """
+        ...
+
+    async def wait_loaded(self, timeout: float = None) -> bool:
+        """等待页面加载完成
+        :param timeout: 超时时间（秒），为None时使用页面加载超时设置
+        :return: 是否加载完成
+        """
+        ...
+
+    async def ready_state(self) -> Optional[str]:
+        """返回页面加载状态"""
+        ...
+
+    async def title(self) -> str:
+        """返回页面标题"""
+        ...
+
+    async def url(self) -> str:
+        """返回当前网址"""
+        ...
+
+    async def html(self) -> str:
+        """返回页面html"""
+        ...
+
+    async def run_js(self, script: Union[str, Path], *args, as_expr: bool = False, timeout: float = None) -> Any:
+        """运行javascript代码
+        :param script: js文本或js文件路径
+        :param args: 参数，按顺序在js文本中对应arguments[0]、arguments[1]...
+        :param as_expr: 是否作为表达式运行，为True时args无效
+        :param timeout: js超时时间（秒），为None则使用脚本超时设置
+        :return: 运行的结果
+        """
+        ...
+
+    async def ele(self, locator: Union[Tuple[str, str], str], index: int = 1,
+                  timeout: float = None) -> Union[AsyncElement, NoneElement, str, float]:
+        """获取一个符合条件的元素对象
+        :param locator: 定位符
+        :param index: 获取第几个，从1开始，可传入负数获取倒数第几个
+        :param timeout: 查找超时时间（秒），为None使用基本超时设置
+        :return: AsyncElement对象，找不到时返回NoneElement
+        """
+        ...
+
+    async def eles(self, locator: Union[Tuple[str, str], str], timeout: float = None) -> List[Union[AsyncElement, str]]:
+        """获取所有符合条件的元素对象
+        :param locator: 定位符
+        :param timeout: 查找超时时间（秒），为None使用基本超时设置
+        :return: 元素对象组成的列表
+        """
+        ...
+
+    def set_callback(self, event: str, callback: Optional[Callable[..., Union[None, Awaitable]]]) -> None:
+        """绑定cdp事件，callback可以是普通函数或协程函数
+        :param event: cdp event
+        :param callback: 回调方法，为None时解除绑定
+        :return: None
+        """
+        ...
+
+    def subscribe(self, event: str) -> EventSubscription:
+        """订阅一个cdp事件，返回可用async for迭代的订阅对象
+        :param event: cdp event
+        :return: EventSubscription对象
+        """
+        ...
+
+    async def wait_event(self, event: str, timeout: float = None) -> Optional[dict]:
+        """等待一个cdp事件出现
+        :param event: cdp event
+        :param timeout: 超时时间（秒），为None表示无限
+        :return: 事件参数，超时返回None
+        """
+        ...
+
+    async def close(self) -> None:
+        """关闭标签页"""
+        ...
+
+    async def disconnect(self) -> None:
+        """断开与标签页的连接，不关闭标签页"""
+        ...
@@ -9,13 +9,12 @@ from json import loads, JSONDecodeError
 from os.path import sep
 from pathlib import Path
 from re import findall
-from threading import Thread
 from time import perf_counter, sleep
 
 from DataRecorder.tools import make_valid_name
 
 from .._base.base import BasePage
-from .._elements.chromium_element import run_js, make_chromium_eles
+from .._elements.chromium_element import run_js, make_chromium_eles, wait_by_xpath, wait_by_css
 from .._elements.none_element import NoneElement
 from .._elements.session_element import make_session_ele
 from .._functions.cookies import CookiesList
@@ -27,11 +26,14 @@ from .._functions.web import location_in_viewport
 from .._units.actions import Actions
 from .._units.console import Console
 from .._units.listener import Listener
+from .._units.metrics import merge_metrics
+from .._units.notifier import Notifier
 from .._units.rect import TabRect
 from .._units.screencast import Screencast
 from .._units.scroller import PageScroller
 from .._units.setter import ChromiumBaseSetter
 from .._units.states import PageStates
+from .._units.tab_handle import TabHandle
 from .._units.waiter import BaseWaiter
 from ..errors import (ContextLostError, CDPError, PageDisconnectedError, ElementLostError, JavaScriptError,
                       BrowserConnectError, LocatorError)
@@ -43,6 +45,7 @@ class ChromiumBase(BasePage):
     def __init__(self, browser, target_id=None):
         super().__init__()
         self._browser = browser
+        self._notifier = Notifier()
         self._is_loading = None
         self._root_id = None  # object id
         self._set = None
@@ -51,6 +54,10 @@ class ChromiumBase(BasePage):
         self._states = None
         self._has_alert = False
         self._ready_state = None
+        self._target_url = None
+        self._target_title = None
+        self._title_dirty = True  # 导航后标题未经事件或查询确认
+        self._nav_seq = 0
         self._rect = None
         self._wait = None
         self._scroll = None
@@ -59,11 +66,14 @@ class ChromiumBase(BasePage):
         self._doc_got = False  # 用于在LoadEventFired和FrameStoppedLoading间标记是否已获取doc
         self._auto_handle_alert = None
         self._load_end_time = 0
+        self._stop_timer = None  # eager模式超时停止加载的定时任务
         self._init_jss = []
         self._disconnect_flag = False
         self._type = 'ChromiumBase'
         if not hasattr(self, '_listener'):
             self._listener = None
+        if not hasattr(self, '_ele_cache'):
+            self._ele_cache = None
 
         self._d_set_runtime_settings()
         self._connect_browser(target_id)
@@ -71,6 +81,61 @@ class ChromiumBase(BasePage):
     def __call__(self, locator, index=1, timeout=None):
         return self.ele(locator, index, timeout)
 
+    # 以下状态由事件处理方法修改，修改时唤醒等待者
+    @property
+    def _is_loading(self):
+        return self.__is_loading
+
+    @_is_loading.setter
+    def _is_loading(self, value):
+        self.__is_loading = value
+        self._notifier.notify()
+
+    @property
+    def _ready_state(self):
+        return self.__ready_state
+
+    @_ready_state.setter
+    def _ready_state(self, value):
+        self.__ready_state = value
+        self._notifier.notify()
+
+    @property
+    def _target_url(self):
+        return self.__target_url
+
+    @_target_url.setter
+    def _target_url(self, value):
+        self.__target_url = value
+        self._notifier.notify()
+
+    @property
+    def _target_title(self):
+        return self.__target_title
+
+    @_target_title.setter
+    def _target_title(self, value):
+        self.__target_title = value
+        self._notifier.notify()
+
+    @property
+    def _has_alert(self):
+        return self.__has_alert
+
+    @_has_alert.setter
+    def _has_alert(self, value):
+        self.__has_alert = value
+        self._notifier.notify()
+
+    @property
+    def _upload_list(self):
+        return self.__upload_list
+
+    @_upload_list.setter
+    def _upload_list(self, value):
+        self.__upload_list = value
+        self._notifier.notify()
+
     def _d_set_runtime_settings(self):
         pass
 
@@ -78,9 +143,7 @@ class ChromiumBase(BasePage):
         self._is_reading = False
 
         if not target_id:
-            tabs = self.browser._driver.get(f'http://{self.browser.address}/json').json()
-            tabs = [(i['id'], i['url']) for i in tabs
-                    if i['type'] in ('page', 'webview') and not i['url'].startswith('devtools://')]
+            tabs = [(i['targetId'], i['url']) for i in self.browser._targets.tab_infos()]
             dialog = None
             if len(tabs) > 1:
                 for k, t in enumerate(tabs):
@@ -105,6 +168,8 @@ class ChromiumBase(BasePage):
 
     def _driver_init(self, target_id):
         self._is_loading = True
+        self._target_url = None
+        self._title_dirty = True
         self._driver = self.browser._get_driver(target_id, self)
 
         self._alert = Alert(self._auto_handle_alert)
@@ -114,6 +179,8 @@ class ChromiumBase(BasePage):
         self._driver.run('DOM.enable')
         self._driver.run('Page.enable')
         self._driver.run('Emulation.setFocusEmulationEnabled', enabled=True)
+        if self._ele_cache:
+            self._ele_cache.bind(self._driver)
 
         r = self._run_cdp('Page.getFrameTree')
         for i in findall(r"'id': '(.*?)'", str(r)):
@@ -121,13 +188,15 @@ class ChromiumBase(BasePage):
         if not hasattr(self, '_frame_id'):
             self._frame_id = r['frameTree']['frame']['id']
 
-        self._driver.set_callback('Page.frameStartedLoading', self._onFrameStartedLoading)
-        self._driver.set_callback('Page.frameNavigated', self._onFrameNavigated)
-        self._driver.set_callback('Page.domContentEventFired', self._onDomContentEventFired)
-        self._driver.set_callback('Page.loadEventFired', self._onLoadEventFired)
-        self._driver.set_callback('Page.frameStoppedLoading', self._onFrameStoppedLoading)
-        self._driver.set_callback('Page.frameAttached', self._onFrameAttached)
-        self._driver.set_callback('Page.frameDetached', self._onFrameDetached)
+        # 页面加载事件走独立通道，不被其它耗时回调阻塞
+        self._driver.set_callback('Page.frameStartedLoading', self._onFrameStartedLoading, lane='lifecycle')
+        self._driver.set_callback('Page.frameNavigated', self._onFrameNavigated, lane='lifecycle')
+        self._driver.set_callback('Page.navigatedWithinDocument', self._onNavigatedWithinDocument, lane='lifecycle')
+        self._driver.set_callback('Page.domContentEventFired', self._onDomContentEventFired, lane='lifecycle')
+        self._driver.set_callback('Page.loadEventFired', self._onLoadEventFired, lane='lifecycle')
+        self._driver.set_callback('Page.frameStoppedLoading', self._onFrameStoppedLoading, lane='lifecycle')
+        self._driver.set_callback('Page.frameAttached', self._onFrameAttached, lane='lifecycle')
+        self._driver.set_callback('Page.frameDetached', self._onFrameDetached, lane='lifecycle')
 
     def _get_document(self, timeout=10):
         if self._is_reading:
@@ -179,18 +248,42 @@ class ChromiumBase(BasePage):
             self._is_loading = True
             self._load_end_time = perf_counter() + self.timeouts.page_load
             if self._load_mode == 'eager':
-                t = Thread(target=self._wait_to_stop)
-                t.daemon = True
-                t.start()
+                if self._stop_timer:
+                    self._stop_timer.cancel()
+                self._stop_timer = self.browser._scheduler.call_later(self.timeouts.page_load, self._wait_to_stop)
 
     def _onFrameNavigated(self, **kwargs):
         if kwargs['frame']['id'] == self._frame_id:
+            self._nav_seq += 1
+            self._title_dirty = True
+            self._target_url = kwargs['frame']['url'] + kwargs['frame'].get('urlFragment', '')
             self._doc_got = False
             self._ready_state = 'loading'
             self._is_loading = True
             if kwargs.get('type', None) == 'BackForwardCacheRestore':
                 self._get_document()
 
+    def _onNavigatedWithinDocument(self, **kwargs):
+        if kwargs['frameId'] == self._frame_id:
+            self._nav_seq += 1
+            self._target_url = kwargs['url']
+
+    def _onTargetInfoChanged(self, info):
+        """由浏览器对象在收到本标签页的Target.targetInfoChanged时调用"""
+        if self._ready_state == 'complete' and info['url'] == self._target_url:
+            self._title_dirty = False
+        self._target_title = info['title']
+
+    def _get_target_info(self):
+        """查询target信息并更新缓存的url和标题"""
+        seq = self._nav_seq
+        info = self._run_cdp('Target.getTargetInfo', targetId=self._target_id)['targetInfo']
+        if seq == self._nav_seq:
+            self._target_url = info['url']
+            self._target_title = info['title']
+            self._title_dirty = False
+        return info
+
     def _onDomContentEventFired(self, **kwargs):
         if self._load_mode == 'eager':
             self._run_cdp('Page.stopLoading')
@@ -222,9 +315,7 @@ class ChromiumBase(BasePage):
             self._upload_list = None
 
     def _wait_to_stop(self):
-        end_time = perf_counter() + self.timeouts.page_load
-        while perf_counter() < end_time:
-            sleep(.02)
+        self._stop_timer = None
         if self._ready_state in ('interactive', 'complete') and self._is_loading:
             self.stop_loading()
 
@@ -308,11 +399,13 @@ class ChromiumBase(BasePage):
 
     @property
     def title(self):
-        return self._run_cdp_loaded('Target.getTargetInfo', targetId=self._target_id)['targetInfo']['title']
+        self.wait.doc_loaded()
+        return self._get_target_info()['title'] if self._title_dirty else self._target_title
 
     @property
     def url(self):
-        return self._run_cdp_loaded('Target.getTargetInfo', targetId=self._target_id)['targetInfo']['url']
+        self.wait.doc_loaded()
+        return self._get_target_info()['url'] if self._target_url is None else self._target_url
 
     @property
     def _browser_url(self):
@@ -338,6 +431,10 @@ class ChromiumBase(BasePage):
     def _target_id(self):
         return self.driver.id
 
+    @property
+    def handle(self):
+        return TabHandle(self.browser.address, self.tab_id)
+
     @property
     def active_ele(self):
         return self._run_js_loaded('return document.activeElement;')
@@ -387,6 +484,23 @@ class ChromiumBase(BasePage):
         self.wait.doc_loaded()
         return self._run_cdp(cmd, **cmd_args)
 
+    def run_cdp_batch(self, cmds, timeout=None):
+        results = self.driver.run_many(cmds, _timeout=timeout)
+        for r in results:
+            if __ERROR__ in r:
+                raise_error(r, self.browser, user=True)
+        return results
+
+    def metrics(self):
+        return merge_metrics((self.driver,))
+
+    def _run_cdp_batch(self, cmds, ignore=None):
+        results = self.driver.run_many(cmds)
+        for r in results:
+            if __ERROR__ in r:
+                raise_error(r, self.browser, ignore)
+        return results
+
     def run_js(self, script, *args, as_expr=False, timeout=None):
         return self._run_js(script, *args, as_expr=as_expr, timeout=timeout)
 
@@ -440,7 +554,7 @@ class ChromiumBase(BasePage):
 
     def _find_elements(self, locator, timeout, index=1, relative=False, raise_err=None):
         if isinstance(locator, (str, tuple)):
-            loc = get_loc(locator)[1]
+            loc = get_loc(locator)
         elif locator._type in ('ChromiumElement', 'ChromiumFrame'):
             return locator
         else:
@@ -448,59 +562,80 @@ class ChromiumBase(BasePage):
 
         self.wait.doc_loaded()
         end_time = perf_counter() + timeout
-
         search_ids = []
+        try:
+            r = self._search_elements(loc[1], index, end_time, search_ids)
+            if r is None and perf_counter() < end_time:
+                r = self._wait_elements(loc, index, end_time)
+                if r is False:  # 无法在页面中等待时改为轮询
+                    r = None
+                    while r is None and perf_counter() < end_time:
+                        sleep(.01)
+                        r = self._search_elements(loc[1], index, end_time, search_ids)
+                elif r is None:  # 再查找一次，包括页面中等待时不能监视的iframe和shadow dom
+                    r = self._search_elements(loc[1], index, end_time, search_ids)
+        finally:
+            if search_ids:
+                self._driver.run_many([('DOM.discardSearchResults', {'searchId': i}) for i in search_ids])
+
+        if r is None:
+            return NoneElement(self) if index is not None else ChromiumElementsList(owner=self)
+        return r
+
+    def _search_elements(self, loc, index, end_time, search_ids):
+        """用DOM.performSearch查找一次，没有找到时返回None"""
+        timeout = end_time - perf_counter()
         timeout = .5 if timeout <= 0 else timeout
         result = self.driver.run('DOM.performSearch', query=loc, _timeout=timeout, includeUserAgentShadowDOM=True)
-        if not result or __ERROR__ in result:
-            num = 0
-        else:
-            num = result['resultCount']
-            search_ids.append(result['searchId'])
-
-        while True:
-            if num > 0:
-                from_index = index_arg = 0
-                if index is None:
-                    end_index = num
-                    index_arg = None
-                elif index < 0:
-                    from_index = index + num
-                    end_index = from_index + 1
-                else:
-                    from_index = index - 1
-                    end_index = from_index + 1
-
-                if from_index <= num - 1:
-                    nIds = self._driver.run('DOM.getSearchResults', searchId=result['searchId'],
-                                            fromIndex=from_index, toIndex=end_index)
-                    if __ERROR__ not in nIds:
-                        if nIds['nodeIds'][0] != 0:
-                            r = make_chromium_eles(self, _ids=nIds['nodeIds'], index=index_arg,
-                                                   is_obj_id=False, ele_only=True)
-                            if r is not False:
-                                break
-
-                    elif nIds[__ERROR__] == 'connection disconnected':
-                        raise PageDisconnectedError
-
-            if perf_counter() >= end_time:
-                return NoneElement(self) if index is not None else ChromiumElementsList(owner=self)
-
-            sleep(.01)
-            timeout = end_time - perf_counter()
-            timeout = .5 if timeout <= 0 else timeout
-            result = self.driver.run('DOM.performSearch', query=loc, _timeout=timeout, includeUserAgentShadowDOM=True)
-            if result and __ERROR__ not in result:
-                num = result['resultCount']
-                search_ids.append(result['searchId'])
-            elif result and result[__ERROR__] == 'connection disconnected':
+        if not result:
+            return None
+        elif __ERROR__ in result:
+            if result[__ERROR__] == 'connection disconnected':
                 raise PageDisconnectedError
+            return None
+        search_ids.append(result['searchId'])
+        num = result['resultCount']
+        if num == 0:
+            return None
 
-        for _id in search_ids:
-            self._driver.run('DOM.discardSearchResults', searchId=_id)
+        from_index = index_arg = 0
+        if index is None:
+            end_index = num
+            index_arg = None
+        elif index < 0:
+            from_index = index + num
+            end_index = from_index + 1
+        else:
+            from_index = index - 1
+            end_index = from_index + 1
 
-        return r
+        if not 0 <= from_index < num:
+            return None
+        nIds = self._driver.run('DOM.getSearchResults', searchId=result['searchId'],
+                                fromIndex=from_index, toIndex=end_index)
+        if __ERROR__ in nIds:
+            if nIds[__ERROR__] == 'connection disconnected':
+                raise PageDisconnectedError
+            return None
+        if nIds['nodeIds'][0] == 0:
+            return None
+        r = make_chromium_eles(self, _ids=nIds['nodeIds'], index=index_arg, is_obj_id=False, ele_only=True)
+        return None if r is False else r
+
+    def _wait_elements(self, loc, index, end_time):
+        """在页面中用MutationObserver等待元素出现，超时返回None，不能在页面中等待时返回False"""
+        timeout = end_time - perf_counter()
+        try:
+            if loc[0] == 'xpath':
+                r = wait_by_xpath(self, loc[1], index, timeout)
+            else:
+                r = wait_by_css(self, loc[1], index, timeout)
+        except (ContextLostError, ElementLostError, LocatorError, CDPError, TimeoutError):
+            return False
+        if isinstance(r, list):  # 与DOM.performSearch一致，只返回元素
+            r = [i for i in r if not isinstance(i, (str, int, float))]
+            return ChromiumElementsList(self, r) if r else None
+        return None if isinstance(r, (str, int, float)) else r
 
     def refresh(self, ignore_cache=False):
         self._is_loading = True
@@ -538,9 +673,7 @@ class ChromiumBase(BasePage):
     def stop_loading(self):
         try:
             self._run_cdp('Page.stopLoading')
-            end_time = perf_counter() + 5
-            while self._ready_state != 'complete' and perf_counter() < end_time:
-                sleep(.02)
+            self._notifier.wait_for(lambda: self._ready_state == 'complete', 5)
         except (PageDisconnectedError, CDPError):
             pass
         finally:
@@ -681,8 +814,7 @@ class ChromiumBase(BasePage):
         if not isinstance(accept, bool):
             return self._handle_alert(accept=accept, send=send, timeout=timeout, next_one=next_one)
         r = self._handle_alert(accept=accept, send=send, timeout=timeout, next_one=next_one)
-        while self._has_alert:
-            sleep(.0001)
+        self._notifier.wait_for(lambda: not self._has_alert)
         return r
 
     def _handle_alert(self, accept=True, send=None, timeout=None, next_one=False):
@@ -693,10 +825,7 @@ class ChromiumBase(BasePage):
         if timeout is None:
             timeout = self.timeout
         timeout = .1 if timeout <= 0 else timeout
-        end_time = perf_counter() + timeout
-        while not self._alert.activated and perf_counter() < end_time:
-            sleep(.01)
-        if not self._alert.activated:
+        if not self._notifier.wait_for(lambda: self._alert.activated, timeout):
             return False
 
         res_text = self._alert.text
@@ -738,15 +867,9 @@ class ChromiumBase(BasePage):
     def _wait_loaded(self, timeout=None):
         if timeout is None:
             timeout = self.timeouts.page_load
-        end_time = perf_counter() + timeout
-        while perf_counter() < end_time:
-            if self._ready_state == 'complete':
-                return True
-            elif self._load_mode == 'eager' and self._ready_state in ('interactive',
-                                                                      'complete') and not self._is_loading:
-                return True
-
-            sleep(.01)
+        if self._notifier.wait_for(lambda: self._ready_state == 'complete' or (
+                self._load_mode == 'eager' and self._ready_state == 'interactive' and not self._is_loading), timeout):
+            return True
 
         try:
             self.stop_loading()
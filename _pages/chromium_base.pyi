@@ -6,7 +6,7 @@
 @Copyright: (c) 2020 by g1879, Inc. All Rights Reserved.
 """
 from pathlib import Path
-from typing import Union, Tuple, Any, Optional, Literal
+from typing import Union, Tuple, Any, Optional, Literal, List
 
 from requests import Session
 
@@ -24,12 +24,16 @@ from .._functions.elements import SessionElementsList, ChromiumElementsList
 from .._pages.chromium_frame import ChromiumFrame
 from .._units.actions import Actions
 from .._units.console import Console
+from .._units.ele_cache import ElementCache
 from .._units.listener import Listener
+from .._units.notifier import Notifier
+from .._units.scheduler import ScheduledTask
 from .._units.rect import TabRect, FrameRect
 from .._units.screencast import Screencast
 from .._units.scroller import Scroller, PageScroller
 from .._units.setter import ChromiumBaseSetter
 from .._units.states import PageStates
+from .._units.tab_handle import TabHandle
 from .._units.waiter import BaseWaiter
 
 PIC_TYPE = Literal['jpg', 'jpeg', 'png', 'webp', True]
@@ -39,6 +43,7 @@ class ChromiumBase(BasePage):
     """标签页、Frame、Page基类"""
     _tab: Union[ChromiumTab, MixTab, ChromiumFrame, ChromiumPage, WebPage] = ...
     _browser: Chromium = ...
+    _notifier: Notifier = ...
     _driver: Optional[Driver] = ...
     _frame_id: str = ...
     _is_reading: bool = ...
@@ -56,14 +61,20 @@ class ChromiumBase(BasePage):
     _screencast: Optional[Screencast] = ...
     _actions: Optional[Actions] = ...
     _listener: Optional[Listener] = ...
+    _ele_cache: Optional[ElementCache] = ...
     _states: Optional[PageStates] = ...
     _alert: Alert = ...
     _has_alert: bool = ...
     _auto_handle_alert: Optional[bool] = ...
     _doc_got: bool = ...
     _load_end_time: float = ...
+    _stop_timer: Optional[ScheduledTask] = ...
     _init_jss: list = ...
     _ready_state: Optional[str] = ...
+    _target_url: Optional[str] = ...
+    _target_title: Optional[str] = ...
+    _title_dirty: bool = ...
+    _nav_seq: int = ...
     _rect: Optional[TabRect] = ...
     _console: Optional[Console] = ...
     _disconnect_flag: bool = ...
@@ -126,6 +137,23 @@ class ChromiumBase(BasePage):
         """页面跳转时执行"""
         ...
 
+    def _onNavigatedWithinDocument(self, **kwargs):
+        """页面内跳转（锚点、history api）时更新url"""
+        ...
+
+    def _onTargetInfoChanged(self, info: dict) -> None:
+        """由浏览器对象在收到本标签页的Target.targetInfoChanged时调用，更新标题
+        :param info: 事件中的targetInfo
+        :return: None
+        """
+        ...
+
+    def _get_target_info(self) -> dict:
+        """查询target信息，期间没有发生跳转时更新缓存的url和标题
+        :return: Target.TargetInfo格式的dict
+        """
+        ...
+
     def _onDomContentEventFired(self, **kwargs):
         """在页面刷新、变化后重新读取页面内容"""
         ...
@@ -142,8 +170,8 @@ class ChromiumBase(BasePage):
         """文件选择框打开时执行"""
         ...
 
-    def _wait_to_stop(self):
-        """eager策略超时时使页面停止加载"""
+    def _wait_to_stop(self) -> None:
+        """eager策略超时时使页面停止加载，由调度器在页面加载超时时调用"""
         ...
 
     @property
@@ -213,12 +241,12 @@ class ChromiumBase(BasePage):
 
     @property
     def title(self) -> str:
-        """返回当前页面title"""
+        """返回当前页面title，由Target.targetInfoChanged事件维护，页面跳转后首次读取时查询一次"""
         ...
 
     @property
     def url(self) -> str:
-        """返回当前页面url"""
+        """返回当前页面url，由页面跳转事件维护"""
         ...
 
     @property
@@ -246,6 +274,11 @@ class ChromiumBase(BasePage):
         """返回当前标签页id"""
         ...
 
+    @property
+    def handle(self) -> TabHandle:
+        """返回可序列化的标签页引用，可传给其它进程用attach()接管"""
+        ...
+
     @property
     def active_ele(self) -> ChromiumElement:
         """返回当前焦点所在元素"""
@@ -308,6 +341,28 @@ class ChromiumBase(BasePage):
         """
         ...
 
+    def run_cdp_batch(self, cmds: List[Union[str, Tuple[str, dict]]], timeout: float = None) -> List[dict]:
+        """一次发送多条互不依赖的cdp指令，按顺序返回结果，任一条出错时抛出异常
+        :param cmds: 由(协议项目, 参数dict)或协议项目组成的列表
+        :param timeout: 全部指令的总超时时间（秒），为None使用全局设置
+        :return: 执行结果列表
+        """
+        ...
+
+    def metrics(self) -> dict:
+        """返回本页面连接的cdp调用统计，需先用Settings.set_cdp_metrics()开启
+        :return: 包含methods、events、queues等键的dict
+        """
+        ...
+
+    def _run_cdp_batch(self, cmds: List[Union[str, Tuple[str, dict]]], ignore=None) -> List[dict]:
+        """一次发送多条互不依赖的cdp指令，按顺序返回结果
+        :param cmds: 由(协议项目, 参数dict)或协议项目组成的列表
+        :param ignore: 忽略的异常类型
+        :return: 执行结果列表
+        """
+        ...
+
     def run_js(self, script: Union[str, Path], *args, as_expr: bool = False, timeout: float = None) -> Any:
         """运行javascript代码
         :param script: js文本或js文件路径
@@ -437,6 +492,32 @@ class ChromiumBase(BasePage):
         """
         ...
 
+    def _search_elements(self,
+                         loc: str,
+                         index: Optional[int],
+                         end_time: float,
+                         search_ids: List[int]) -> Union[ChromiumElement, ChromiumFrame, ChromiumElementsList, None]:
+        """用DOM.performSearch查找一次
+        :param loc: xpath或css selector
+        :param index: 第几个结果，从1开始，可传入负数获取倒数第几个，为None返回所有
+        :param end_time: 查找结束时间
+        :param search_ids: 用于记录search id的列表，由调用者统一释放
+        :return: 查找结果，没有找到时返回None
+        """
+        ...
+
+    def _wait_elements(self,
+                       loc: Tuple[str, str],
+                       index: Optional[int],
+                       end_time: float) -> Union[ChromiumElement, ChromiumFrame, ChromiumElementsList, None, bool]:
+        """在页面中用MutationObserver等待元素出现
+        :param loc: 定位元组
+        :param index: 第几个结果，从1开始，可传入负数获取倒数第几个，为None返回所有
+        :param end_time: 查找结束时间
+        :return: 查找结果，超时返回None，不能在页面中等待时返回False
+        """
+        ...
+
     def refresh(self, ignore_cache: bool = False) -> None:
         """刷新当前页面
         :param ignore_cache: 是否忽略缓存
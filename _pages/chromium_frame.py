@@ -90,7 +90,7 @@ class ChromiumFrame(ChromiumBase):
         try:
             super()._driver_init(target_id)
         except:
-            self.browser._driver.get(f'http://{self._browser.address}/json')
+            self.browser._json()
             super()._driver_init(target_id)
         self._driver.set_callback('Inspector.detached', self._onInspectorDetached, immediate=True)
         self._driver.set_callback('Page.frameDetached', None)
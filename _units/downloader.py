@@ -64,6 +64,7 @@ class DownloadManager(object):
 
     def set_flag(self, tab_id, flag):
         self._flags[tab_id] = flag
+        self._browser._notifier.notify()
 
     def get_flag(self, tab_id):
         return self._flags.get(tab_id, None)
@@ -82,6 +83,7 @@ class DownloadManager(object):
             self._tab_missions[mission.from_tab].discard(mission)
         self._missions.pop(mission.id, None)
         mission._is_done = True
+        self._browser._notifier.notify()
 
     def cancel(self, mission):
         mission.state = 'canceled'
@@ -166,6 +168,7 @@ class DownloadManager(object):
             self._flags['browser'] = m
         elif self.get_flag(tab) is not None:
             self._flags[tab] = m
+        self._browser._notifier.notify()
 
     def _onDownloadProgress(self, **kwargs):
         if kwargs['guid'] in self._missions:
@@ -173,6 +176,7 @@ class DownloadManager(object):
             if kwargs['state'] == 'inProgress':
                 mission.received_bytes = kwargs['receivedBytes']
                 mission.total_bytes = kwargs['totalBytes']
+                self._browser._notifier.notify()
 
             elif kwargs['state'] == 'completed':
                 if mission.state == 'skipped':
@@ -262,27 +266,24 @@ class DownloadMission(object):
     def wait(self, show=True, timeout=None, cancel_if_timeout=True):
         if show:
             print(f'url: {self.url}')
-            end_time = perf_counter()
-            while self.name is None and perf_counter() < end_time:
-                sleep(0.01)
             print(f'{_S._lang.FILE_NAME}: {self.name or _S._lang.UNKNOWN}')
             print(f'{_S._lang.FOLDER_PATH}: {self.folder}')
 
-        if timeout is None:
-            while not self.is_done:
+        # 每次进度更新或完成时被唤醒
+        notifier = self._mgr._browser._notifier
+        end_time = None if timeout is None else perf_counter() + timeout
+        received = None
+        while not self.is_done:
+            if received != self.received_bytes:
+                received = self.received_bytes
                 if show:
                     print(f'\r{self.rate}% ', end='')
-                sleep(.2)
+            if not notifier.wait_for(lambda: self.is_done or received != self.received_bytes,
+                                     None if end_time is None else end_time - perf_counter()):
+                break
 
-        else:
-            end_time = perf_counter() + timeout
-            while perf_counter() < end_time:
-                if show:
-                    print(f'\r{self.rate}% ', end='')
-                sleep(.2)
-
-            if not self.is_done and cancel_if_timeout:
-                self.cancel()
+        if not self.is_done and cancel_if_timeout and timeout is not None:
+            self.cancel()
 
         if show:
             if self.state == 'completed':
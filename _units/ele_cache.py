@@ -0,0 +1,133 @@
+# -*- coding:utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Website  : https://DrissionPage.cn
+@Copyright: (c) 2020 by g1879, Inc. All Rights Reserved.
+"""
+from threading import Lock
+
+from ..errors import ElementLostError
+
+
+class ElementCache(object):
+    """元素属性缓存，以backend id为键，由DOM域事件使其失效"""
+    KINDS = ('tag', 'attrs', 'html', 'base_uri')
+
+    def __init__(self, owner):
+        self._owner = owner
+        self._driver = None
+        self._lock = Lock()
+        self._data = {k: {} for k in self.KINDS}
+        self._nodes = {}  # 已推送到前端的node id: backend id，用于把事件对应到缓存
+        self._subtrees = set()  # 已订阅整棵子树变化的backend id
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+        self.bind(owner._driver)
+
+    def __repr__(self):
+        return f'<ElementCache hits={self.hits} misses={self.misses}>'
+
+    @property
+    def stats(self):
+        """返回命中统计"""
+        total = self.hits + self.misses
+        return {'hits': self.hits, 'misses': self.misses, 'hit_rate': self.hits / total if total else None,
+                'size': sum(len(i) for i in self._data.values())}
+
+    def bind(self, driver):
+        """绑定到Driver，接收DOM变化事件，原有缓存作废"""
+        if self._driver is not None:
+            self.unbind()
+        self._driver = driver
+        for event, func in self._watchers():
+            driver.set_watcher(event, func)
+        self.clear(True)
+
+    def unbind(self):
+        """停止接收事件并清空缓存"""
+        if self._driver is not None:
+            for event, _ in self._watchers():
+                self._driver.set_watcher(event, None)
+            self._driver = None
+        self.clear(True)
+
+    def clear(self, all_info=False):
+        """清空缓存，标签名不会改变，all_info为False时保留"""
+        with self._lock:
+            self.version += 1
+            for k, v in self._data.items():
+                if all_info or k != 'tag':
+                    v.clear()
+            self._nodes.clear()
+            self._subtrees.clear()
+
+    def load(self, kind, ele, func):
+        """返回缓存的值，没有时执行func()获取，期间页面没有变化才缓存
+        :param kind: 'tag'、'attrs'、'html'或'base_uri'
+        :param ele: 元素对象
+        :param func: 获取值的方法
+        :return: 值
+        """
+        backend_id = ele._backend_id
+        value = self._data[kind].get(backend_id)
+        if value is not None:
+            self.hits += 1
+            return value
+        self.misses += 1
+        version = self._watch(ele, kind)
+        value = func()
+        with self._lock:
+            if version == self.version and value is not None:
+                self._data[kind][backend_id] = value
+        return value
+
+    def _watch(self, ele, kind):
+        """确保浏览器会发送元素变化的事件，返回当前版本号"""
+        version = self.version
+        if kind not in ('attrs', 'html'):
+            return version
+        try:
+            node_id = ele._node_id
+        except ElementLostError:
+            ele._refresh_id()
+            node_id = ele._node_id
+        with self._lock:
+            self._nodes[node_id] = ele._backend_id
+        if kind == 'html' and ele._backend_id not in self._subtrees:
+            ele.owner._run_cdp('DOM.requestChildNodes', nodeId=node_id, depth=-1)
+            self._subtrees.add(ele._backend_id)
+        return version
+
+    def _watchers(self):
+        return (('DOM.attributeModified', self._on_attr_changed),
+                ('DOM.attributeRemoved', self._on_attr_changed),
+                ('DOM.characterDataModified', self._on_tree_changed),
+                ('DOM.childNodeInserted', self._on_tree_changed),
+                ('DOM.childNodeRemoved', self._on_tree_changed),
+                ('DOM.childNodeCountUpdated', self._on_tree_changed),
+                ('DOM.documentUpdated', self._on_doc_updated),
+                ('Page.navigatedWithinDocument', self._on_url_changed))
+
+    def _on_attr_changed(self, **kwargs):
+        with self._lock:
+            self.version += 1
+            self._data['attrs'].pop(self._nodes.get(kwargs['nodeId']), None)
+            self._data['html'].clear()  # 祖先元素的html也已改变
+            if kwargs['name'] == 'href':  # 可能是<base>元素
+                self._data['base_uri'].clear()
+
+    def _on_tree_changed(self, **kwargs):
+        with self._lock:
+            self.version += 1
+            self._data['html'].clear()
+            self._data['base_uri'].clear()
+
+    def _on_doc_updated(self, **kwargs):
+        self.clear()
+
+    def _on_url_changed(self, **kwargs):
+        with self._lock:
+            self.version += 1
+            self._data['base_uri'].clear()
@@ -0,0 +1,82 @@
+# -*- coding:utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Website  : https://DrissionPage.cn
+@Copyright: (c) 2020 by g1879, Inc. All Rights Reserved.
+"""
+from threading import Lock
+from typing import Any, Callable, Dict, Optional, Set, Tuple
+
+from .._base.driver import Driver
+from .._elements.chromium_element import ChromiumElement
+from .._pages.chromium_base import ChromiumBase
+
+
+class ElementCache(object):
+    KINDS: Tuple[str, ...] = ...
+    _owner: ChromiumBase
+    _driver: Optional[Driver]
+    _lock: Lock
+    _data: Dict[str, dict]
+    _nodes: Dict[int, int]
+    _subtrees: Set[int]
+    version: int
+    hits: int
+    misses: int
+
+    def __init__(self, owner: ChromiumBase):
+        """
+        :param owner: 页面对象
+        """
+        ...
+
+    @property
+    def stats(self) -> dict:
+        """返回命中统计，格式：{'hits': 命中数, 'misses': 未命中数, 'hit_rate': 命中率, 'size': 缓存条数}"""
+        ...
+
+    def bind(self, driver: Driver) -> None:
+        """绑定到Driver，接收DOM变化事件，原有缓存作废
+        :param driver: 页面对象的Driver
+        :return: None
+        """
+        ...
+
+    def unbind(self) -> None:
+        """停止接收事件并清空缓存"""
+        ...
+
+    def clear(self, all_info: bool = False) -> None:
+        """清空缓存
+        :param all_info: 是否同时清空标签名，标签名不会改变，为False时保留
+        :return: None
+        """
+        ...
+
+    def load(self, kind: str, ele: ChromiumElement, func: Callable[[], Any]) -> Any:
+        """返回缓存的值，没有时执行func()获取，期间页面没有变化才缓存
+        :param kind: 'tag'、'attrs'、'html'或'base_uri'
+        :param ele: 元素对象
+        :param func: 获取值的方法
+        :return: 值
+        """
+        ...
+
+    def _watch(self, ele: ChromiumElement, kind: str) -> int:
+        """确保浏览器会发送元素变化的事件，读取html时订阅整棵子树
+        :param ele: 元素对象
+        :param kind: 要读取的信息类型
+        :return: 当前版本号
+        """
+        ...
+
+    def _watchers(self) -> Tuple[Tuple[str, Callable], ...]: ...
+
+    def _on_attr_changed(self, **kwargs) -> None: ...
+
+    def _on_tree_changed(self, **kwargs) -> None: ...
+
+    def _on_doc_updated(self, **kwargs) -> None: ...
+
+    def _on_url_changed(self, **kwargs) -> None: ...
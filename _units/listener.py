@@ -9,12 +9,13 @@ from base64 import b64decode
 from json import JSONDecodeError, loads
 from queue import Queue
 from re import search
+from threading import Lock
 from time import perf_counter, sleep
 
 from requests.structures import CaseInsensitiveDict
 
-from .._base.driver import Driver
 from .._functions.settings import Settings as _S
+from .._units.notifier import Notifier
 from ..errors import WaitTimeoutError
 
 
@@ -28,6 +29,9 @@ class Listener(object):
         self._driver = None
         self._running_requests = 0
         self._running_targets = 0
+        self._running_lock = Lock()
+        self._workers = 4
+        self._notifier = Notifier()
 
         self._caught = None
         self._request_ids = None
@@ -92,30 +96,22 @@ class Listener(object):
         if self.listening:
             return
 
-        self._driver = Driver(self._target_id, 'page', self._address)
+        self._driver = self._owner.browser._new_driver(self._target_id)
+        self._driver.owner = self
+        self._set_callback()  # 先绑定回调，避免enable后立即到达的事件被丢弃
         self._driver.run('Network.enable')
-
-        self._set_callback()
         self.listening = True
 
     def wait(self, count=1, timeout=None, fit_count=True, raise_err=None):
         if not self.listening:
             raise RuntimeError(_S._lang.join(_S._lang.NOT_LISTENING))
         if not timeout:
-            while self._driver.is_running and self.listening and self._caught.qsize() < count:
-                sleep(.03)
+            self._notifier.wait_for(lambda: self._stopped or self._caught.qsize() >= count)
             fail = False
 
         else:
-            end = perf_counter() + timeout
-            while self._driver.is_running and self.listening:
-                if perf_counter() > end:
-                    fail = True
-                    break
-                if self._caught.qsize() >= count:
-                    fail = False
-                    break
-                sleep(.03)
+            self._notifier.wait_for(lambda: self._stopped or self._caught.qsize() >= count, timeout)
+            fail = self._caught.qsize() < count
 
         if fail:
             if fit_count or not self._caught.qsize():
@@ -136,18 +132,18 @@ class Listener(object):
             raise RuntimeError(_S._lang.join(_S._lang.NOT_LISTENING))
         caught = 0
         if timeout is None:
-            while self._driver.is_running and self.listening:
+            while not self._stopped:
                 if self._caught.qsize() >= gap:
                     yield self._caught.get_nowait() if gap == 1 else [self._caught.get_nowait() for _ in range(gap)]
                     if count:
                         caught += gap
                         if caught >= count:
                             return
-                sleep(.03)
+                self._notifier.wait_for(lambda: self._stopped or self._caught.qsize() >= gap)
 
         else:
             end = perf_counter() + timeout
-            while self._driver.is_running and self.listening and perf_counter() < end:
+            while not self._stopped and perf_counter() < end:
                 if self._caught.qsize() >= gap:
                     yield self._caught.get_nowait() if gap == 1 else [self._caught.get_nowait() for _ in range(gap)]
                     end = perf_counter() + timeout
@@ -155,9 +151,17 @@ class Listener(object):
                         caught += gap
                         if caught >= count:
                             return
-                sleep(.03)
+                self._notifier.wait_for(lambda: self._stopped or self._caught.qsize() >= gap, end - perf_counter())
             return False
 
+    @property
+    def _stopped(self):
+        """返回是否已停止监听或连接已断开"""
+        return not self.listening or not self._driver or not self._driver.is_running
+
+    def _on_disconnect(self):
+        self._notifier.notify()
+
     def stop(self):
         if self.listening:
             self.pause()
@@ -172,6 +176,7 @@ class Listener(object):
             self._driver.set_callback('Network.loadingFinished', None)
             self._driver.set_callback('Network.loadingFailed', None)
             self.listening = False
+            self._notifier.notify()
         if clear:
             self.clear()
 
@@ -191,20 +196,8 @@ class Listener(object):
     def wait_silent(self, timeout=None, targets_only=False, limit=0):
         if not self.listening:
             raise RuntimeError(_S._lang.join(_S._lang.NOT_LISTENING))
-        if timeout is None:
-            while ((not targets_only and self._running_requests > limit)
-                   or (targets_only and self._running_targets > limit)):
-                sleep(.01)
-            return True
-
-        end_time = perf_counter() + timeout
-        while perf_counter() < end_time:
-            if ((not targets_only and self._running_requests <= limit)
-                    or (targets_only and self._running_targets <= limit)):
-                return True
-            sleep(.01)
-        else:
-            return False
+        return self._notifier.wait_for(lambda: ((not targets_only and self._running_requests <= limit)
+                                                or (targets_only and self._running_targets <= limit)), timeout)
 
     def _to_target(self, target_id, address, owner):
         self._target_id = target_id
@@ -215,26 +208,38 @@ class Listener(object):
             # debug = self._driver._debug
             self._driver.stop()
         if self.listening:
-            self._driver = Driver(self._target_id, 'page', self._address)
+            self._driver = owner.browser._new_driver(self._target_id)
+            self._driver.owner = self
             # self._driver._debug = debug
-            self._driver.run('Network.enable')
             self._set_callback()
+            self._driver.run('Network.enable')
 
     def _set_callback(self):
-        self._driver.set_callback('Network.requestWillBeSent', self._requestWillBeSent)
-        self._driver.set_callback('Network.requestWillBeSentExtraInfo', self._requestWillBeSentExtraInfo)
-        self._driver.set_callback('Network.responseReceived', self._response_received)
-        self._driver.set_callback('Network.responseReceivedExtraInfo', self._responseReceivedExtraInfo)
-        self._driver.set_callback('Network.loadingFinished', self._loading_finished)
-        self._driver.set_callback('Network.loadingFailed', self._loading_failed)
+        # 获取响应体较慢，多个请求并行处理，同一请求的事件按顺序处理
+        self._driver.set_lane('network', workers=self._workers, key=_request_id)
+        self._driver.set_callback('Network.requestWillBeSent', self._requestWillBeSent, lane='network')
+        self._driver.set_callback('Network.requestWillBeSentExtraInfo', self._requestWillBeSentExtraInfo,
+                                  lane='network')
+        self._driver.set_callback('Network.responseReceived', self._response_received, lane='network')
+        self._driver.set_callback('Network.responseReceivedExtraInfo', self._responseReceivedExtraInfo,
+                                  lane='network')
+        self._driver.set_callback('Network.loadingFinished', self._loading_finished, lane='network')
+        self._driver.set_callback('Network.loadingFailed', self._loading_failed, lane='network')
+
+    def _count(self, requests=0, targets=0):
+        """多线程处理事件，计数需加锁"""
+        with self._running_lock:
+            self._running_requests += requests
+            self._running_targets += targets
+        self._notifier.notify()
 
     def _requestWillBeSent(self, **kwargs):
-        self._running_requests += 1
+        self._count(requests=1)
         p = None
         if self._targets is True:
             if ((self._method is True or kwargs['request']['method'] in self._method)
                     and (self._res_type is True or kwargs.get('type', '').upper() in self._res_type)):
-                self._running_targets += 1
+                self._count(targets=1)
                 rid = kwargs['requestId']
                 p = self._request_ids.setdefault(rid, DataPacket(self._owner.tab_id, True))
                 p._raw_request = kwargs
@@ -249,7 +254,7 @@ class Listener(object):
                      or (not self._is_regex and target in kwargs['request']['url']))
                         and (self._method is True or kwargs['request']['method'] in self._method)
                         and (self._res_type is True or kwargs.get('type', '').upper() in self._res_type)):
-                    self._running_targets += 1
+                    self._count(targets=1)
                     p = self._request_ids.setdefault(rid, DataPacket(self._owner.tab_id, target))
                     p._raw_request = kwargs
                     break
@@ -257,7 +262,7 @@ class Listener(object):
         self._extra_info_ids.setdefault(kwargs['requestId'], {})['obj'] = p if p else False
 
     def _requestWillBeSentExtraInfo(self, **kwargs):
-        self._running_requests += 1
+        self._count(requests=1)
         self._extra_info_ids.setdefault(kwargs['requestId'], {})['request'] = kwargs
 
     def _response_received(self, **kwargs):
@@ -267,7 +272,7 @@ class Listener(object):
             request._resource_type = kwargs['type']
 
     def _responseReceivedExtraInfo(self, **kwargs):
-        self._running_requests -= 1
+        self._count(requests=-1)
         r = self._extra_info_ids.get(kwargs['requestId'], None)
         if r:
             obj = r.get('obj', None)
@@ -281,7 +286,7 @@ class Listener(object):
                 r['response'] = kwargs
 
     def _loading_finished(self, **kwargs):
-        self._running_requests -= 1
+        self._count(requests=-1)
         rid = kwargs['requestId']
         packet = self._request_ids.get(rid)
         if packet:
@@ -313,10 +318,10 @@ class Listener(object):
 
         if packet:
             self._caught.put(packet)
-            self._running_targets -= 1
+            self._count(targets=-1)
 
     def _loading_failed(self, **kwargs):
-        self._running_requests -= 1
+        self._count(requests=-1)
         r_id = kwargs['requestId']
         data_packet = self._request_ids.get(r_id, None)
         if data_packet:
@@ -340,7 +345,11 @@ class Listener(object):
 
         if data_packet:
             self._caught.put(data_packet)
-            self._running_targets -= 1
+            self._count(targets=-1)
+
+
+def _request_id(params):
+    return params.get('requestId')
 
 
 class FrameListener(Listener):
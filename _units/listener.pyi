@@ -6,6 +6,7 @@
 @Copyright: (c) 2020 by g1879, Inc. All Rights Reserved.
 """
 from queue import Queue
+from threading import Lock
 from typing import Union, List, Iterable, Optional, Literal, Any
 
 from requests.structures import CaseInsensitiveDict
@@ -13,6 +14,7 @@ from requests.structures import CaseInsensitiveDict
 from .._base.driver import Driver
 from .._pages.chromium_base import ChromiumBase
 from .._pages.chromium_frame import ChromiumFrame
+from .._units.notifier import Notifier
 
 __RES_TYPE__ = Literal['Document', 'Stylesheet', 'Image', 'Media', 'Font', 'Script', 'TextTrack', 'XHR', 'Fetch',
 'Prefetch', 'EventSource', 'WebSocket', 'Manifest', 'SignedExchange', 'Ping', 'CSPViolationReport', 'Preflight', 'Other']
@@ -32,6 +34,9 @@ class Listener(object):
     _extra_info_ids: Optional[dict] = ...
     _running_requests: int = ...
     _running_targets: int = ...
+    _running_lock: Lock = ...
+    _workers: int = ...
+    _notifier: Notifier = ...
     listening: bool = ...
 
     def __init__(self, owner: ChromiumBase):
@@ -143,6 +148,23 @@ class Listener(object):
 
     def _set_callback(self) -> None: ...
 
+    @property
+    def _stopped(self) -> bool:
+        """返回是否已停止监听或连接已断开"""
+        ...
+
+    def _on_disconnect(self) -> None:
+        """监听用的连接断开时唤醒等待者"""
+        ...
+
+    def _count(self, requests: int = 0, targets: int = 0) -> None:
+        """修改正在进行的请求数量
+        :param requests: 所有请求的增量
+        :param targets: 目标请求的增量
+        :return: None
+        """
+        ...
+
     def _requestWillBeSent(self, **kwargs) -> None: ...
 
     def _requestWillBeSentExtraInfo(self, **kwargs) -> None: ...
@@ -156,6 +178,11 @@ class Listener(object):
     def _loading_failed(self, **kwargs) -> None: ...
 
 
+def _request_id(params: dict) -> Optional[str]:
+    """返回事件参数中的requestId，用于分配工作线程"""
+    ...
+
+
 class FrameListener(Listener):
     _owner: ChromiumFrame = ...
     _is_diff: bool = ...
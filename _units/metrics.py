@@ -0,0 +1,183 @@
+# -*- coding:utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Website  : https://DrissionPage.cn
+@Copyright: (c) 2020 by g1879, Inc. All Rights Reserved.
+"""
+from threading import Lock
+
+LATENCY_BUCKETS = (.001, .005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5, 10)
+
+
+class CDPMetrics(object):
+    """记录一个Driver的cdp调用统计"""
+
+    def __init__(self):
+        self._lock = Lock()
+        self.methods = {}
+        self.events = {}
+        self.max_event_queue = 0
+        self.max_immediate_event_queue = 0
+
+    def _method(self, method):
+        m = self.methods.get(method)
+        if m is None:
+            m = self.methods[method] = {'count': 0, 'errors': 0, 'timeouts': 0, 'latency_sum': 0.,
+                                        'latency_buckets': [0] * (len(LATENCY_BUCKETS) + 1),
+                                        'bytes_sent': 0, 'bytes_received': 0}
+        return m
+
+    def on_sent(self, method, size):
+        with self._lock:
+            self._method(method)['bytes_sent'] += size
+
+    def on_received(self, method, size):
+        with self._lock:
+            self._method(method)['bytes_received'] += size
+
+    def on_done(self, method, latency, result):
+        with self._lock:
+            m = self._method(method)
+            m['count'] += 1
+            m['latency_sum'] += latency
+            for i, b in enumerate(LATENCY_BUCKETS):
+                if latency <= b:
+                    m['latency_buckets'][i] += 1
+                    break
+            else:
+                m['latency_buckets'][-1] += 1
+            if 'error' in result:
+                if result.get('type') == 'timeout':
+                    m['timeouts'] += 1
+                else:
+                    m['errors'] += 1
+
+    def on_event(self, method, dispatched):
+        with self._lock:
+            e = self.events.get(method)
+            if e is None:
+                e = self.events[method] = {'count': 0, 'dropped': 0}
+            e['count'] += 1
+            if not dispatched:
+                e['dropped'] += 1
+
+    def on_queue(self, size, immediate=False):
+        if immediate:
+            if size > self.max_immediate_event_queue:
+                self.max_immediate_event_queue = size
+        elif size > self.max_event_queue:
+            self.max_event_queue = size
+
+    def as_dict(self, driver=None):
+        with self._lock:
+            methods = {k: dict(v, latency_buckets=list(v['latency_buckets'])) for k, v in self.methods.items()}
+            events = {k: dict(v) for k, v in self.events.items()}
+        r = {'methods': methods,
+             'events': events,
+             'queues': {'event_queue': {'size': 0, 'max': self.max_event_queue},
+                        'immediate_event_queue': {'size': 0, 'max': self.max_immediate_event_queue}}}
+        if driver is not None:
+            r['queues']['event_queue']['size'] = driver.event_queue.qsize()
+            r['queues']['immediate_event_queue']['size'] = driver.immediate_event_queue.qsize()
+        return r
+
+
+def merge_metrics(drivers):
+    """合并多个Driver的统计数据，未开启统计的Driver会被忽略"""
+    r = {'methods': {}, 'events': {}, 'queues': {'event_queue': {'size': 0, 'max': 0},
+                                                 'immediate_event_queue': {'size': 0, 'max': 0}},
+         'dispatched_events': 0, 'dropped_events': 0, 'drivers': 0}
+    workers = set()  # session与浏览器连接共用ImmediateWorker，其队列只计一次
+    for driver in drivers:
+        if not driver or driver.metrics is None:
+            continue
+        d = driver.metrics.as_dict(driver)
+        r['drivers'] += 1
+        r['dispatched_events'] += driver.dispatched_events
+        r['dropped_events'] += driver.dropped_events
+        for k, v in d['methods'].items():
+            m = r['methods'].get(k)
+            if m is None:
+                r['methods'][k] = v
+            else:
+                for i in ('count', 'errors', 'timeouts', 'latency_sum', 'bytes_sent', 'bytes_received'):
+                    m[i] += v[i]
+                m['latency_buckets'] = [a + b for a, b in zip(m['latency_buckets'], v['latency_buckets'])]
+        for k, v in d['events'].items():
+            e = r['events'].get(k)
+            if e is None:
+                r['events'][k] = v
+            else:
+                for i in ('count', 'dropped'):
+                    e[i] += v[i]
+        for q in ('event_queue', 'immediate_event_queue'):
+            r['queues'][q]['max'] = max(r['queues'][q]['max'], d['queues'][q]['max'])
+        r['queues']['event_queue']['size'] += d['queues']['event_queue']['size']
+        worker = getattr(driver, '_immediate', None)
+        if worker not in workers:
+            if worker is not None:
+                workers.add(worker)
+            r['queues']['immediate_event_queue']['size'] += d['queues']['immediate_event_queue']['size']
+    return r
+
+
+def percentiles(values, points=(50, 90, 99)):
+    """返回{'p50': 值, ...}，无数据时值为None"""
+    values = sorted(values)
+    if not values:
+        return {f'p{p}': None for p in points}
+    return {f'p{p}': values[min(int(len(values) * p / 100), len(values) - 1)] for p in points}
+
+
+def metrics_to_prometheus(metrics, prefix='drissionpage_cdp', labels=None):
+    """把metrics()返回的数据转换为Prometheus文本格式"""
+    base = ''.join(f',{k}="{_escape(v)}"' for k, v in (labels or {}).items())
+    lines = []
+
+    def add(name, kind, helps, rows):
+        lines.append(f'# HELP {prefix}_{name} {helps}')
+        lines.append(f'# TYPE {prefix}_{name} {kind}')
+        for suffix, label, value in rows:
+            label = (label + base).lstrip(',')
+            lines.append(f'{prefix}_{name}{suffix}{{{label}}} {value}' if label
+                         else f'{prefix}_{name}{suffix} {value}')
+
+    methods = metrics.get('methods', {})
+    add('calls_total', 'counter', 'CDP commands completed.',
+        [('', f'method="{k}"', v['count']) for k, v in methods.items()])
+    add('errors_total', 'counter', 'CDP commands that returned an error.',
+        [('', f'method="{k}"', v['errors']) for k, v in methods.items()])
+    add('timeouts_total', 'counter', 'CDP commands that timed out.',
+        [('', f'method="{k}"', v['timeouts']) for k, v in methods.items()])
+    add('sent_bytes_total', 'counter', 'Bytes sent per CDP method.',
+        [('', f'method="{k}"', v['bytes_sent']) for k, v in methods.items()])
+    add('received_bytes_total', 'counter', 'Bytes received per CDP method.',
+        [('', f'method="{k}"', v['bytes_received']) for k, v in methods.items()])
+
+    rows = []
+    for k, v in methods.items():
+        total = 0
+        for b, n in zip(LATENCY_BUCKETS + ('+Inf',), v['latency_buckets']):
+            total += n
+            rows.append(('_bucket', f'method="{k}",le="{b}"', total))
+        rows.append(('_sum', f'method="{k}"', v['latency_sum']))
+        rows.append(('_count', f'method="{k}"', v['count']))
+    add('latency_seconds', 'histogram', 'CDP command round-trip latency.', rows)
+
+    events = metrics.get('events', {})
+    add('events_total', 'counter', 'CDP events received.',
+        [('', f'method="{k}"', v['count']) for k, v in events.items()])
+    add('events_dropped_total', 'counter', 'CDP events dropped without a handler.',
+        [('', f'method="{k}"', v['dropped']) for k, v in events.items()])
+
+    queues = metrics.get('queues', {})
+    add('queue_size', 'gauge', 'Current event queue depth.',
+        [('', f'queue="{k}"', v['size']) for k, v in queues.items()])
+    add('queue_max_size', 'gauge', 'Largest event queue depth observed.',
+        [('', f'queue="{k}"', v['max']) for k, v in queues.items()])
+    return '\n'.join(lines) + '\n'
+
+
+def _escape(value):
+    return str(value).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
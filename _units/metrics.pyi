@@ -0,0 +1,105 @@
+# -*- coding:utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Website  : https://DrissionPage.cn
+@Copyright: (c) 2020 by g1879, Inc. All Rights Reserved.
+"""
+from threading import Lock
+from typing import Dict, Iterable, Optional, Tuple
+
+from .._base.driver import Driver
+
+LATENCY_BUCKETS: Tuple[float, ...] = ...
+
+
+class CDPMetrics(object):
+    _lock: Lock
+    methods: Dict[str, dict]
+    events: Dict[str, dict]
+    max_event_queue: int
+    max_immediate_event_queue: int
+
+    def __init__(self): ...
+
+    def _method(self, method: str) -> dict:
+        """返回某个方法的统计数据，没有时创建"""
+        ...
+
+    def on_sent(self, method: str, size: int) -> None:
+        """记录发送的字节数
+        :param method: cdp方法名
+        :param size: 字节数
+        :return: None
+        """
+        ...
+
+    def on_received(self, method: str, size: int) -> None:
+        """记录收到的字节数
+        :param method: cdp方法名
+        :param size: 字节数
+        :return: None
+        """
+        ...
+
+    def on_done(self, method: str, latency: float, result: dict) -> None:
+        """记录一次调用完成
+        :param method: cdp方法名
+        :param latency: 耗时（秒）
+        :param result: 浏览器返回的数据
+        :return: None
+        """
+        ...
+
+    def on_event(self, method: str, dispatched: bool) -> None:
+        """记录收到的事件
+        :param method: 事件名
+        :param dispatched: 是否已分发给回调方法
+        :return: None
+        """
+        ...
+
+    def on_queue(self, size: int, immediate: bool = False) -> None:
+        """记录事件队列深度
+        :param size: 当前队列长度
+        :param immediate: 是否立即执行事件的队列
+        :return: None
+        """
+        ...
+
+    def as_dict(self, driver: Driver = None) -> dict:
+        """返回统计数据的副本
+        :param driver: 传入时读取其当前队列长度
+        :return: 统计数据
+        """
+        ...
+
+
+def merge_metrics(drivers: Iterable[Optional[Driver]]) -> dict:
+    """合并多个Driver的统计数据，未开启统计的Driver会被忽略
+    :param drivers: Driver对象组成的列表
+    :return: 合并后的统计数据
+    """
+    ...
+
+
+def percentiles(values: Iterable[float], points: Iterable[int] = (50, 90, 99)) -> Dict[str, Optional[float]]:
+    """计算百分位数
+    :param values: 数据
+    :param points: 要计算的百分位
+    :return: {'p50': 值, ...}，无数据时值为None
+    """
+    ...
+
+
+def metrics_to_prometheus(metrics: dict, prefix: str = 'drissionpage_cdp', labels: Dict[str, str] = None) -> str:
+    """把metrics()返回的数据转换为Prometheus文本格式
+    :param metrics: browser.metrics()或tab.metrics()返回的数据
+    :param prefix: 指标名前缀
+    :param labels: 附加到每个指标的标签
+    :return: Prometheus文本
+    """
+    ...
+
+
+def _escape(value: str) -> str: ...
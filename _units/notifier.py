@@ -0,0 +1,24 @@
+# -*- coding:utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Website  : https://DrissionPage.cn
+@Copyright: (c) 2020 by g1879, Inc. All Rights Reserved.
+"""
+from threading import Condition
+
+
+class Notifier(object):
+    """状态变化通知器，事件处理方法修改状态后调用notify()，等待方阻塞到条件成立或超时，不轮询"""
+
+    def __init__(self):
+        self._cond = Condition()
+
+    def notify(self):
+        with self._cond:
+            self._cond.notify_all()
+
+    def wait_for(self, predicate, timeout=None):
+        """predicate须为只读取属性的简单判断，在锁内执行"""
+        with self._cond:
+            return self._cond.wait_for(predicate, timeout)
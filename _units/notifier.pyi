@@ -0,0 +1,27 @@
+# -*- coding:utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Website  : https://DrissionPage.cn
+@Copyright: (c) 2020 by g1879, Inc. All Rights Reserved.
+"""
+from threading import Condition
+from typing import Callable, Optional, Any
+
+
+class Notifier(object):
+    _cond: Condition
+
+    def __init__(self): ...
+
+    def notify(self) -> None:
+        """唤醒所有等待者重新检查条件，状态改变后调用"""
+        ...
+
+    def wait_for(self, predicate: Callable[[], Any], timeout: Optional[float] = None) -> Any:
+        """阻塞直到条件成立或超时
+        :param predicate: 返回条件是否成立的方法，在锁内执行，不能调用cdp
+        :param timeout: 超时时间（秒），为None时无限等待，小于等于0时只检查一次
+        :return: predicate()最后一次的结果
+        """
+        ...
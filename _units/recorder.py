@@ -0,0 +1,92 @@
+# -*- coding:utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Website  : https://DrissionPage.cn
+@Copyright: (c) 2020 by g1879, Inc. All Rights Reserved.
+"""
+from gzip import open as gzip_open
+from json import loads
+from pathlib import Path
+from threading import Lock
+from time import perf_counter, time
+from urllib.parse import urlparse
+
+
+class CDPRecorder(object):
+    """把websocket上收发的cdp消息按时间写入jsonl文件，文件名以.gz结尾时压缩保存"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = (gzip_open(self.path, 'wt', encoding='utf-8') if self.path.suffix == '.gz'
+                      else open(self.path, 'w', encoding='utf-8'))
+        self._lock = Lock()
+        self._start = perf_counter()
+        self.records = 0
+        self._file.write(f'{{"v":1,"time":{time():.3f}}}\n')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @property
+    def closed(self):
+        return self._file is None
+
+    def wrap(self, ws, url):
+        return RecordingWebSocket(ws, self, urlparse(url).path)
+
+    def record(self, ws_path, direction, msg_json):
+        """记录一条消息，消息本身已是json文本，直接拼接不再编码"""
+        line = f'{{"t":{perf_counter() - self._start:.6f},"ws":"{ws_path}","d":"{direction}","m":{msg_json}}}\n'
+        with self._lock:
+            if self._file is not None:
+                self._file.write(line)
+                self.records += 1
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class RecordingWebSocket(object):
+    """包装websocket连接，收发时交给CDPRecorder记录"""
+
+    def __init__(self, ws, recorder, ws_path):
+        self._ws = ws
+        self._recorder = recorder
+        self._path = ws_path
+
+    def send(self, msg_json):
+        self._recorder.record(self._path, '>', msg_json)  # 先记录，避免返回值记在指令前面
+        return self._ws.send(msg_json)
+
+    def recv(self):
+        msg_json = self._ws.recv()
+        if msg_json:
+            self._recorder.record(self._path, '<', msg_json)
+        return msg_json
+
+    def close(self, *args, **kwargs):
+        return self._ws.close(*args, **kwargs)
+
+    def __getattr__(self, item):
+        return getattr(self._ws, item)
+
+
+def load_records(path):
+    """读取CDPRecorder保存的文件，返回记录列表，每条为{'t', 'ws', 'd', 'm'}"""
+    path = Path(path)
+    records = []
+    with (gzip_open(path, 'rt', encoding='utf-8') if path.suffix == '.gz' else open(path, encoding='utf-8')) as f:
+        for line in f:
+            if line.strip():
+                r = loads(line)
+                if 'm' in r:
+                    records.append(r)
+    return records
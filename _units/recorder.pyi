@@ -0,0 +1,78 @@
+# -*- coding:utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Website  : https://DrissionPage.cn
+@Copyright: (c) 2020 by g1879, Inc. All Rights Reserved.
+"""
+from pathlib import Path
+from threading import Lock
+from typing import Union, Optional, List, TextIO
+
+from websocket import WebSocket
+
+
+class CDPRecorder(object):
+    path: Path
+    _file: Optional[TextIO]
+    _lock: Lock
+    _start: float
+    records: int
+
+    def __init__(self, path: Union[str, Path]):
+        """
+        :param path: 保存的文件路径，以.gz结尾时压缩保存
+        """
+        ...
+
+    def __enter__(self) -> CDPRecorder: ...
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None: ...
+
+    @property
+    def closed(self) -> bool:
+        """返回是否已关闭"""
+        ...
+
+    def wrap(self, ws: WebSocket, url: str) -> RecordingWebSocket:
+        """包装websocket连接，使其收发的消息被记录
+        :param ws: websocket连接
+        :param url: 连接的地址
+        :return: 包装后的连接
+        """
+        ...
+
+    def record(self, ws_path: str, direction: str, msg_json: str) -> None:
+        """记录一条消息
+        :param ws_path: 连接的路径
+        :param direction: '>'表示发出，'<'表示收到
+        :param msg_json: 消息的json文本
+        :return: None
+        """
+        ...
+
+    def close(self) -> None:
+        """关闭文件，之后的消息不再记录"""
+        ...
+
+
+class RecordingWebSocket(object):
+    _ws: WebSocket
+    _recorder: CDPRecorder
+    _path: str
+
+    def __init__(self, ws: WebSocket, recorder: CDPRecorder, ws_path: str): ...
+
+    def send(self, msg_json: str) -> int: ...
+
+    def recv(self) -> str: ...
+
+    def close(self, *args, **kwargs) -> None: ...
+
+
+def load_records(path: Union[str, Path]) -> List[dict]:
+    """读取CDPRecorder保存的文件
+    :param path: 文件路径
+    :return: 记录列表，每条为{'t': 时间, 'ws': 连接路径, 'd': 方向, 'm': 消息}
+    """
+    ...
@@ -13,10 +13,8 @@ class ElementRect(object):
 
     @property
     def corners(self):
-        vr = self._get_viewport_rect('border')
-        r = self._ele.owner._run_cdp_loaded('Page.getLayoutMetrics')['visualViewport']
-        sx = r['pageX']
-        sy = r['pageY']
+        m, sx, sy = self._get_model_and_scroll()
+        vr = m['border']
         return [(vr[0] + sx, vr[1] + sy), (vr[2] + sx, vr[3] + sy), (vr[4] + sx, vr[5] + sy), (vr[6] + sx, vr[7] + sy)]
 
     @property
@@ -26,21 +24,24 @@ class ElementRect(object):
 
     @property
     def size(self):
-        border = self._ele.owner._run_cdp('DOM.getBoxModel', backendNodeId=self._ele._backend_id,
-                                          nodeId=self._ele._node_id, objectId=self._ele._obj_id)['model']['border']
+        border = self._ele.owner._run_cdp('DOM.getBoxModel', backendNodeId=self._ele._backend_id)['model']['border']
         return border[2] - border[0], border[5] - border[1]
 
     @property
     def location(self):
-        return self._get_page_coord(*self.viewport_location)
+        m, sx, sy = self._get_model_and_scroll()
+        return m['border'][0] + sx, m['border'][1] + sy
 
     @property
     def midpoint(self):
-        return self._get_page_coord(*self.viewport_midpoint)
+        m, sx, sy = self._get_model_and_scroll()
+        x, y = _midpoint(m['border'])
+        return x + sx, y + sy
 
     @property
     def click_point(self):
-        return self._get_page_coord(*self.viewport_click_point)
+        m, sx, sy = self._get_model_and_scroll()
+        return _midpoint(m['border'])[0] + sx, m['padding'][1] + 3 + sy
 
     @property
     def viewport_location(self):
@@ -49,13 +50,12 @@ class ElementRect(object):
 
     @property
     def viewport_midpoint(self):
-        m = self._get_viewport_rect('border')
-        return m[0] + (m[2] - m[0]) // 2, m[3] + (m[5] - m[3]) // 2
+        return _midpoint(self._get_viewport_rect('border'))
 
     @property
     def viewport_click_point(self):
-        m = self._get_viewport_rect('padding')
-        return self.viewport_midpoint[0], m[1] + 3
+        m = self._ele.owner._run_cdp('DOM.getBoxModel', backendNodeId=self._ele._backend_id)['model']
+        return _midpoint(m['border'])[0], m['padding'][1] + 3
 
     @property
     def screen_location(self):
@@ -99,11 +99,12 @@ class ElementRect(object):
     def _get_viewport_rect(self, quad):
         return self._ele.owner._run_cdp('DOM.getBoxModel', backendNodeId=self._ele._backend_id)['model'][quad]
 
-    def _get_page_coord(self, x, y):
-        r = self._ele.owner._run_cdp_loaded('Page.getLayoutMetrics')['visualViewport']
-        sx = r['pageX']
-        sy = r['pageY']
-        return x + sx, y + sy
+    def _get_model_and_scroll(self):
+        """同时获取盒模型和页面滚动位置"""
+        self._ele.owner.wait.doc_loaded()
+        m, r = self._ele.owner._run_cdp_batch([('DOM.getBoxModel', {'backendNodeId': self._ele._backend_id}),
+                                               'Page.getLayoutMetrics'])
+        return m['model'], r['visualViewport']['pageX'], r['visualViewport']['pageY']
 
 
 class TabRect(object):
@@ -214,3 +215,7 @@ class FrameRect(object):
                                         '+ this.documentElement.scrollTop.toString();')
         w, h = r.split(' ')
         return int(w), int(h)
+
+
+def _midpoint(quad):
+    return quad[0] + (quad[2] - quad[0]) // 2, quad[3] + (quad[5] - quad[3]) // 2
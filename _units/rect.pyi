@@ -96,11 +96,9 @@ class ElementRect(object):
         """
         ...
 
-    def _get_page_coord(self, x: float, y: float) -> Tuple[float, float]:
-        """根据视口坐标获取绝对坐标
-        :param x: 视口x坐标
-        :param y: 视口y坐标
-        :return: 坐标元组
+    def _get_model_and_scroll(self) -> Tuple[dict, float, float]:
+        """一次往返同时获取元素盒模型和页面滚动位置
+        :return: (盒模型, 页面x滚动, 页面y滚动)
         """
         ...
 
@@ -214,3 +212,11 @@ class FrameRect(object):
     def scroll_position(self) -> Tuple[float, float]:
         """返回滚动条位置，格式：(x, y)"""
         ...
+
+
+def _midpoint(quad: list) -> Tuple[float, float]:
+    """计算四边形的中点
+    :param quad: 盒模型中的四边形坐标
+    :return: 中点坐标
+    """
+    ...
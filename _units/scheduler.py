@@ -0,0 +1,160 @@
+# -*- coding:utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Website  : https://DrissionPage.cn
+@Copyright: (c) 2020 by g1879, Inc. All Rights Reserved.
+"""
+from collections import deque
+from heapq import heappush, heappop
+from itertools import count
+from sys import excepthook, exc_info
+from threading import Thread, Condition, current_thread
+from time import perf_counter
+
+from ..errors import PageDisconnectedError
+
+
+class ScheduledTask(object):
+    """定时任务，可在执行前取消"""
+
+    def __init__(self, due, func, args, kwargs):
+        self.due = due
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.cancelled = False
+
+    def __repr__(self):
+        return f'<ScheduledTask {getattr(self.func, "__name__", self.func)} due={self.due:.3f}>'
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class Scheduler(object):
+    """库内后台任务的统一调度器，一个计时线程管理定时任务，有上限的工作线程池执行任务，线程按需创建、空闲后退出"""
+
+    def __init__(self, max_workers=8, idle_timeout=5):
+        self.max_workers = max_workers
+        self.idle_timeout = idle_timeout
+        self._cond = Condition()
+        self._tasks = deque()
+        self._timers = []
+        self._seq = count()
+        self._workers = set()
+        self._idle = 0
+        self._timer_th = None
+        self._closed = False
+        self.done_tasks = 0
+
+    def __repr__(self):
+        return f'<Scheduler workers={len(self._workers)} queue={len(self._tasks)} timers={len(self._timers)}>'
+
+    @property
+    def stats(self):
+        """返回线程和队列信息"""
+        with self._cond:
+            return {'workers': len(self._workers), 'idle_workers': self._idle, 'max_workers': self.max_workers,
+                    'queue': len(self._tasks), 'timers': sum(1 for t in self._timers if not t[2].cancelled),
+                    'timer_thread': self._timer_th is not None, 'done_tasks': self.done_tasks,
+                    'closed': self._closed}
+
+    @property
+    def closed(self):
+        return self._closed
+
+    def submit(self, func, *args, **kwargs):
+        """把任务交给工作线程执行，已关闭时返回False"""
+        with self._cond:
+            if self._closed:
+                return False
+            self._tasks.append((func, args, kwargs))
+            if self._idle < len(self._tasks) and len(self._workers) < self.max_workers:
+                t = Thread(target=self._work_loop, daemon=True)
+                self._workers.add(t)
+                t.start()
+            self._cond.notify_all()
+            return True
+
+    def call_later(self, delay, func, *args, **kwargs):
+        """delay秒后在工作线程中执行任务，返回ScheduledTask，已关闭时返回None"""
+        task = ScheduledTask(perf_counter() + delay, func, args, kwargs)
+        with self._cond:
+            if self._closed:
+                return None
+            heappush(self._timers, (task.due, next(self._seq), task))
+            if self._timer_th is None:
+                self._timer_th = Thread(target=self._timer_loop, daemon=True)
+                self._timer_th.start()
+            else:
+                self._cond.notify_all()
+        return task
+
+    def shutdown(self, wait=True, timeout=5):
+        """停止接收任务，取消未到期的定时任务和未开始的任务，等待正在执行的任务结束"""
+        with self._cond:
+            self._closed = True
+            for t in self._timers:
+                t[2].cancel()
+            self._timers.clear()
+            self._tasks.clear()
+            self._cond.notify_all()
+            workers = [t for t in self._workers if t is not current_thread()]
+        if wait:
+            end_time = perf_counter() + timeout
+            for t in workers:
+                t.join(max(end_time - perf_counter(), 0))
+        return True
+
+    def _timer_loop(self):
+        with self._cond:
+            while not self._closed:
+                while self._timers and self._timers[0][2].cancelled:
+                    heappop(self._timers)
+                if not self._timers:
+                    if not self._cond.wait(self.idle_timeout) and not self._timers:
+                        break
+                    continue
+                wait = self._timers[0][0] - perf_counter()
+                if wait > 0:
+                    self._cond.wait(wait)
+                    continue
+                task = heappop(self._timers)[2]
+                self._cond.release()
+                try:
+                    self.submit(self._run_timer, task)
+                finally:
+                    self._cond.acquire()
+            self._timer_th = None
+
+    @staticmethod
+    def _run_timer(task):
+        if not task.cancelled:
+            task.func(*task.args, **task.kwargs)
+
+    def _work_loop(self):
+        me = current_thread()
+        with self._cond:
+            while True:
+                if self._tasks:
+                    func, args, kwargs = self._tasks.popleft()
+                    self._cond.release()
+                    try:
+                        func(*args, **kwargs)
+                    except PageDisconnectedError:
+                        pass
+                    except Exception:
+                        excepthook(*exc_info())
+                    finally:
+                        self._cond.acquire()
+                        self.done_tasks += 1
+                    continue
+                if self._closed:
+                    break
+                self._idle += 1
+                notified = self._cond.wait(self.idle_timeout)
+                self._idle -= 1
+                if not notified and not self._tasks:
+                    break
+            self._workers.discard(me)
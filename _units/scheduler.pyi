@@ -0,0 +1,95 @@
+# -*- coding:utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Website  : https://DrissionPage.cn
+@Copyright: (c) 2020 by g1879, Inc. All Rights Reserved.
+"""
+from collections import deque
+from itertools import count
+from threading import Thread, Condition
+from typing import Callable, Optional, Set, List, Tuple, Any
+
+
+class ScheduledTask(object):
+    due: float
+    func: Callable
+    args: tuple
+    kwargs: dict
+    cancelled: bool
+
+    def __init__(self, due: float, func: Callable, args: tuple, kwargs: dict): ...
+
+    def cancel(self) -> None:
+        """取消任务，已开始执行的任务不受影响"""
+        ...
+
+
+class Scheduler(object):
+    max_workers: int
+    idle_timeout: float
+    done_tasks: int
+    _cond: Condition
+    _tasks: deque
+    _timers: List[Tuple[float, int, ScheduledTask]]
+    _seq: count
+    _workers: Set[Thread]
+    _idle: int
+    _timer_th: Optional[Thread]
+    _closed: bool
+
+    def __init__(self, max_workers: int = 8, idle_timeout: float = 5):
+        """
+        :param max_workers: 工作线程数量上限，超出的任务排队等待
+        :param idle_timeout: 线程空闲多少秒后退出
+        """
+        ...
+
+    @property
+    def stats(self) -> dict:
+        """返回线程和队列信息，格式：{'workers', 'idle_workers', 'max_workers', 'queue', 'timers', 'timer_thread',
+        'done_tasks', 'closed'}"""
+        ...
+
+    @property
+    def closed(self) -> bool:
+        """返回是否已关闭"""
+        ...
+
+    def submit(self, func: Callable, *args: Any, **kwargs: Any) -> bool:
+        """把任务交给工作线程执行
+        :param func: 要执行的方法
+        :param args: 方法的位置参数
+        :param kwargs: 方法的关键字参数
+        :return: 是否已接收，调度器已关闭时返回False
+        """
+        ...
+
+    def call_later(self, delay: float, func: Callable, *args: Any, **kwargs: Any) -> Optional[ScheduledTask]:
+        """延迟执行任务，到期后交给工作线程执行
+        :param delay: 延迟秒数
+        :param func: 要执行的方法
+        :param args: 方法的位置参数
+        :param kwargs: 方法的关键字参数
+        :return: 可取消的任务对象，调度器已关闭时返回None
+        """
+        ...
+
+    def shutdown(self, wait: bool = True, timeout: float = 5) -> bool:
+        """停止接收任务，取消未到期的定时任务和未开始的任务
+        :param wait: 是否等待正在执行的任务结束
+        :param timeout: 等待的超时时间（秒）
+        :return: True
+        """
+        ...
+
+    def _timer_loop(self) -> None:
+        """计时线程，把到期的任务交给工作线程，无任务时空闲超时退出"""
+        ...
+
+    @staticmethod
+    def _run_timer(task: ScheduledTask) -> None: ...
+
+    def _work_loop(self) -> None:
+        """工作线程，无任务时空闲超时退出"""
+        ...
@@ -11,7 +11,6 @@ from pathlib import Path
 from random import randint
 from shutil import rmtree
 from tempfile import gettempdir
-from threading import Thread
 from time import sleep, time
 
 from .._functions.settings import Settings as _S
@@ -44,13 +43,13 @@ class Screencast(object):
             self._tmp_path.mkdir(parents=True, exist_ok=True)
 
         if self._mode.startswith('frugal'):
-            self._owner.driver.set_callback('Page.screencastFrame', self._onScreencastFrame)
+            self._owner.driver.set_callback('Page.screencastFrame', self._onScreencastFrame, lane='screencast')
             self._owner._run_cdp('Page.startScreencast', everyNthFrame=1, quality=100)
 
         elif not self._mode.startswith('js'):
             self._running = True
             self._enable = True
-            Thread(target=self._run).start()
+            self._owner.browser._scheduler.submit(self._run)
 
         else:  # js模式
             js = '''
@@ -145,12 +144,15 @@ class Screencast(object):
             self._path = save_path
 
     def _run(self):
-        self._running = True
-        path = self._tmp_path or self._path
-        while self._enable:
-            self._owner.get_screenshot(path=path, name=f'{time()}.jpg')
-            sleep(.04)
-        self._running = False
+        """每次截图后重新排期，不长期占用工作线程"""
+        scheduled = False
+        try:
+            if self._enable:
+                self._owner.get_screenshot(path=self._tmp_path or self._path, name=f'{time()}.jpg')
+                scheduled = self._owner.browser._scheduler.call_later(.04, self._run) is not None
+        finally:
+            if not scheduled:
+                self._running = False
 
     def _onScreencastFrame(self, **kwargs):
         path = self._tmp_path or self._path
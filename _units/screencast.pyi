@@ -53,7 +53,7 @@ class Screencast(object):
         ...
 
     def _run(self) -> None:
-        """非节俭模式运行方法"""
+        """非节俭模式运行方法，截图一次后通过调度器安排下一次"""
         ...
 
     def _onScreencastFrame(self, **kwargs) -> None:
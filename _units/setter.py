@@ -12,6 +12,7 @@ from requests.structures import CaseInsensitiveDict
 
 from .cookies_setter import (SessionCookiesSetter, CookiesSetter, WebPageCookiesSetter, BrowserCookiesSetter,
                              MixTabCookiesSetter)
+from .ele_cache import ElementCache
 from .._functions.settings import Settings as _S
 from .._functions.tools import show_or_hide_browser
 from .._functions.web import format_headers
@@ -134,6 +135,9 @@ class BrowserSetter(BrowserBaseSetter):
     def auto_handle_alert(self, on_off=True, accept=True):
         self._owner._auto_handle_alert = None if on_off is None else accept if on_off else 'close'
 
+    def auto_close_tabs(self, urls=None, is_regex=False, popups_only=True):
+        self._owner._targets.set_close_rules(urls, is_regex, popups_only)
+
     def download_path(self, path):
         super().download_path(path)
         self._owner._dl_mgr.set_path('browser', self._owner._download_path)
@@ -209,6 +213,14 @@ class ChromiumBaseSetter(BrowserBaseSetter):
     def auto_handle_alert(self, on_off=True, accept=True):
         self._owner._alert.auto = None if on_off is None else accept if on_off else 'close'
 
+    def ele_cache(self, on_off=True):
+        if on_off:
+            if not self._owner._ele_cache:
+                self._owner._ele_cache = ElementCache(self._owner)
+        elif self._owner._ele_cache:
+            self._owner._ele_cache.unbind()
+            self._owner._ele_cache = None
+
     def blocked_urls(self, urls):
         if not urls:
             urls = []
@@ -256,6 +256,18 @@ class BrowserSetter(BrowserBaseSetter):
         """
         ...
 
+    def auto_close_tabs(self,
+                        urls: Union[str, list, tuple, None] = None,
+                        is_regex: bool = False,
+                        popups_only: bool = True) -> None:
+        """设置自动关闭url匹配规则的新标签页，在收到目标事件时直接关闭，不连接标签页
+        :param urls: url中包含的文本或正则，可传入多个，为None时取消自动关闭
+        :param is_regex: urls是否为正则表达式
+        :param popups_only: 是否只关闭由页面打开的标签页（有opener），为False时也关闭未连接过的其它标签页
+        :return: None
+        """
+        ...
+
     def download_path(self, path: Union[Path, str, None]) -> None:
         """设置下载路径
         :param path: 下载路径
@@ -345,6 +357,13 @@ class ChromiumBaseSetter(BrowserBaseSetter):
         """
         ...
 
+    def ele_cache(self, on_off: bool = True) -> None:
+        """设置是否缓存元素的标签名、属性、html和baseURI，缓存在页面DOM变化时自动失效，适合反复读取元素信息的场景
+        :param on_off: bool表示开或关
+        :return: None
+        """
+        ...
+
     def blocked_urls(self, urls: Union[list, tuple, str, None]) -> None:
         """设置要忽略的url
         :param urls: 要忽略的url，可用*通配符，可输入多个，传入None时清空已设置的内容
@@ -0,0 +1,36 @@
+# -*- coding:utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Website  : https://DrissionPage.cn
+@Copyright: (c) 2020 by g1879, Inc. All Rights Reserved.
+"""
+
+
+class TabHandle(object):
+    """可序列化的标签页引用，可在其它进程中接管该标签页"""
+    __slots__ = ('address', 'tab_id')
+
+    def __init__(self, address, tab_id):
+        self.address = address
+        self.tab_id = tab_id
+
+    def __repr__(self):
+        return f'<TabHandle {self.address} {self.tab_id}>'
+
+    def __eq__(self, other):
+        return isinstance(other, TabHandle) and (self.address, self.tab_id) == (other.address, other.tab_id)
+
+    def __hash__(self):
+        return hash((self.address, self.tab_id))
+
+    def __getstate__(self):
+        return self.address, self.tab_id
+
+    def __setstate__(self, state):
+        self.address, self.tab_id = state
+
+    def attach(self):
+        """连接浏览器并返回该标签页对象"""
+        from .._base.chromium import Chromium
+        return Chromium(self.address).get_tab(self.tab_id)
@@ -0,0 +1,32 @@
+# -*- coding:utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Website  : https://DrissionPage.cn
+@Copyright: (c) 2020 by g1879, Inc. All Rights Reserved.
+"""
+from typing import Tuple
+
+from .._pages.mix_tab import MixTab
+
+
+class TabHandle(object):
+    address: str
+    tab_id: str
+
+    def __init__(self, address: str, tab_id: str):
+        """可序列化的标签页引用，可在其它进程中接管该标签页
+        :param address: 浏览器地址，格式 ip:port
+        :param tab_id: 标签页id
+        """
+        ...
+
+    def __getstate__(self) -> Tuple[str, str]: ...
+
+    def __setstate__(self, state: Tuple[str, str]) -> None: ...
+
+    def attach(self) -> MixTab:
+        """连接浏览器并返回该标签页对象
+        :return: MixTab对象
+        """
+        ...
@@ -0,0 +1,179 @@
+# -*- coding:utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Website  : https://DrissionPage.cn
+@Copyright: (c) 2020 by g1879, Inc. All Rights Reserved.
+"""
+from collections import deque
+from threading import Lock
+from time import perf_counter
+
+from .metrics import percentiles
+from .._functions.settings import Settings as _S
+
+
+class TabPool(object):
+    """预先创建好的标签页池，借出时直接返回就绪的标签页，归还时重置后放回"""
+
+    def __init__(self, browser, size=4, mix=True, new_context=False, clear_cookies=None):
+        self._browser = browser
+        self.size = size
+        self._mix = mix
+        self._new_context = new_context
+        self._clear_cookies = new_context if clear_cookies is None else clear_cookies
+        self._lock = Lock()
+        self._idle = deque()
+        self._leased = set()
+        self._contexts = {}
+        self._filling = 0
+        self._recycling = 0
+        self._closed = False
+        self.hits = 0
+        self.misses = 0
+        self.discarded = 0
+        self._latencies = deque(maxlen=1000)
+        self.fill()
+
+    def __repr__(self):
+        return f'<TabPool idle={len(self._idle)} leased={len(self._leased)} size={self.size}>'
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @property
+    def stats(self):
+        """返回命中率和借出耗时等统计信息"""
+        with self._lock:
+            total = self.hits + self.misses
+            latencies = list(self._latencies)
+            r = {'size': self.size, 'idle': len(self._idle), 'leased': len(self._leased), 'hits': self.hits,
+                 'misses': self.misses, 'hit_rate': self.hits / total if total else None,
+                 'discarded': self.discarded}
+        r['lease_ms'] = {k: None if v is None else v * 1000 for k, v in percentiles(latencies).items()}
+        return r
+
+    def fill(self):
+        """补足空闲标签页到size个"""
+        while True:
+            with self._lock:
+                if self._closed or len(self._idle) + self._filling + self._recycling >= self.size:
+                    return
+                self._filling += 1
+            try:
+                tab = self._create()
+            finally:
+                with self._lock:
+                    self._filling -= 1
+            with self._lock:
+                if not self._closed and len(self._idle) < self.size:
+                    self._idle.append(tab)
+                    continue
+            self._discard(tab)
+
+    def lease(self, url=None):
+        """借出一个标签页，没有空闲的时新建一个"""
+        begin = perf_counter()
+        tab = None
+        with self._lock:
+            if self._closed:
+                raise RuntimeError(_S._lang.join(_S._lang.POOL_CLOSED))
+            while self._idle:
+                tab = self._idle.popleft()
+                if tab._driver and tab._driver.is_running:
+                    self.hits += 1
+                    break
+                self.discarded += 1
+                tab = None
+            else:
+                self.misses += 1
+        if tab is None:
+            tab = self._create()
+        with self._lock:
+            self._leased.add(tab.tab_id)
+            self._latencies.append(perf_counter() - begin)
+        self._browser._scheduler.submit(self.fill)
+        if url:
+            try:
+                tab.get(url)
+            except BaseException:  # 打开失败时归还，避免标签页一直处于借出状态
+                self.release(tab)
+                raise
+        return tab
+
+    def release(self, tab):
+        """归还标签页，在后台重置后放回池中，池已满或已关闭时关闭它"""
+        with self._lock:
+            if tab.tab_id not in self._leased:
+                return False
+            self._leased.discard(tab.tab_id)
+            self._recycling += 1
+        if not self._browser._scheduler.submit(self._recycle, tab):
+            with self._lock:
+                self._recycling -= 1
+            self._discard(tab)
+        return True
+
+    def close(self):
+        """关闭池中空闲的标签页，借出的标签页归还时关闭"""
+        with self._lock:
+            self._closed = True
+            tabs = list(self._idle)
+            self._idle.clear()
+        for tab in tabs:
+            self._discard(tab)
+
+    def _create(self):
+        tab = self._browser._new_tab(self._mix, new_context=self._new_context)
+        if self._new_context:
+            info = self._browser._targets.get(tab.tab_id)
+            if info and info.get('browserContextId'):
+                self._contexts[tab.tab_id] = info['browserContextId']
+        return tab
+
+    def _recycle(self, tab):
+        try:
+            self._reset(tab)
+            ok = True
+        except Exception:
+            ok = False
+        with self._lock:
+            self._recycling -= 1
+            if ok and not self._closed and len(self._idle) < self.size:
+                self._idle.append(tab)
+                return
+        self._discard(tab)
+
+    def _reset(self, tab):
+        """清除标签页的使用痕迹：弹窗、监听、初始化脚本、存储和cookies，然后打开空白页"""
+        if tab._has_alert:
+            tab.handle_alert(accept=False)
+        if tab._listener and tab._listener.listening:
+            tab._listener.stop()
+        if tab._console and tab._console.listening:
+            tab._console.stop()
+        if tab._init_jss:
+            tab.remove_init_js()
+        if (tab._target_url or '').startswith(('http://', 'https://')):
+            tab.clear_cache(session_storage=True, local_storage=True, cache=False, cookies=False)
+        if self._clear_cookies:
+            context = self._contexts.get(tab.tab_id)
+            if context:
+                self._browser._run_cdp('Storage.clearCookies', browserContextId=context)
+            else:
+                tab._run_cdp('Network.clearBrowserCookies')
+        tab.get('about:blank')
+
+    def _discard(self, tab):
+        with self._lock:
+            self.discarded += 1
+            context = self._contexts.pop(tab.tab_id, None)
+        try:
+            tab.close()
+            if context:
+                self._browser._run_cdp('Target.disposeBrowserContext', browserContextId=context)
+        except Exception:
+            pass
@@ -0,0 +1,97 @@
+# -*- coding:utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Website  : https://DrissionPage.cn
+@Copyright: (c) 2020 by g1879, Inc. All Rights Reserved.
+"""
+from collections import deque
+from threading import Lock
+from typing import Dict, Set, Union, Optional
+
+from .._base.chromium import Chromium
+from .._pages.chromium_tab import ChromiumTab
+from .._pages.mix_tab import MixTab
+
+
+class TabPool(object):
+    _browser: Chromium
+    size: int
+    _mix: bool
+    _new_context: bool
+    _clear_cookies: bool
+    _lock: Lock
+    _idle: deque
+    _leased: Set[str]
+    _contexts: Dict[str, str]
+    _filling: int
+    _recycling: int
+    _closed: bool
+    hits: int
+    misses: int
+    discarded: int
+    _latencies: deque
+
+    def __init__(self,
+                 browser: Chromium,
+                 size: int = 4,
+                 mix: bool = True,
+                 new_context: bool = False,
+                 clear_cookies: Optional[bool] = None):
+        """
+        :param browser: Chromium对象
+        :param size: 保持就绪的空闲标签页数量
+        :param mix: 是否返回MixTab，为False时返回ChromiumTab
+        :param new_context: 是否每个标签页使用独立环境，cookies和存储互不影响
+        :param clear_cookies: 归还时是否清除cookies，为None时独立环境下清除；非独立环境会清除整个浏览器的cookies
+        """
+        ...
+
+    def __enter__(self) -> TabPool: ...
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None: ...
+
+    @property
+    def stats(self) -> dict:
+        """返回统计信息，包括空闲和借出数量、命中次数、命中率、关闭的标签页数量，
+        及借出耗时的百分位数lease_ms: {'p50': 毫秒, 'p90': 毫秒, 'p99': 毫秒}"""
+        ...
+
+    def fill(self) -> None:
+        """新建标签页，补足空闲标签页到size个"""
+        ...
+
+    def lease(self, url: str = None) -> Union[MixTab, ChromiumTab]:
+        """借出一个标签页，池中有就绪的直接返回，没有时新建一个，借出后在后台补足池
+        :param url: 借出后要访问的网址，为None时不访问
+        :return: 标签页对象
+        """
+        ...
+
+    def release(self, tab: Union[MixTab, ChromiumTab]) -> bool:
+        """归还标签页，在后台关闭弹窗、停止监听、移除初始化脚本、清除存储（和cookies）并打开空白页后放回池中，
+        池已满、已关闭或重置失败时关闭该标签页
+        :param tab: lease()借出的标签页
+        :return: 是否该池借出的标签页
+        """
+        ...
+
+    def close(self) -> None:
+        """关闭池，关闭空闲的标签页，借出的标签页在归还时关闭"""
+        ...
+
+    def _create(self) -> Union[MixTab, ChromiumTab]:
+        """新建标签页，独立环境时记录环境id"""
+        ...
+
+    def _recycle(self, tab: Union[MixTab, ChromiumTab]) -> None:
+        """重置标签页并放回池中，失败时关闭"""
+        ...
+
+    def _reset(self, tab: Union[MixTab, ChromiumTab]) -> None:
+        """清除标签页的使用痕迹：弹窗、监听、初始化脚本、存储和cookies，然后打开空白页"""
+        ...
+
+    def _discard(self, tab: Union[MixTab, ChromiumTab]) -> None:
+        """关闭标签页，并销毁池为它创建的环境"""
+        ...
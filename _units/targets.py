@@ -0,0 +1,103 @@
+# -*- coding:utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Website  : https://DrissionPage.cn
+@Copyright: (c) 2020 by g1879, Inc. All Rights Reserved.
+"""
+from re import compile, escape
+from threading import Lock
+
+TAB_TYPES = ('page', 'webview')
+
+
+class TargetRegistry(object):
+    """浏览器目标的内存登记表，由Target域事件维护，按激活顺序保存，最近激活的在最前"""
+
+    def __init__(self):
+        self._lock = Lock()
+        self._targets = {}  # 插入顺序即激活顺序，最近激活的在末尾
+        self._close_rules = None
+        self._popups_only = True
+
+    def __repr__(self):
+        return f'<TargetRegistry targets={len(self._targets)}>'
+
+    def __len__(self):
+        return len(self._targets)
+
+    def __contains__(self, target_id):
+        return target_id in self._targets
+
+    def get(self, target_id):
+        """返回目标信息，不存在时返回None"""
+        return self._targets.get(target_id)
+
+    def sync(self, json_list):
+        """用/json接口的结果重置激活顺序，/json中没有的目标保留在最后"""
+        ids = {i['id'] for i in json_list}
+        with self._lock:
+            targets = {k: v for k, v in self._targets.items() if k not in ids}
+            for i in reversed(json_list):
+                info = self._targets.get(i['id']) or {'targetId': i['id']}
+                info.update(type=i['type'], title=i['title'], url=i['url'])
+                targets[i['id']] = info
+            self._targets = targets
+
+    def set_close_rules(self, rules=None, is_regex=False, popups_only=True):
+        """设置自动关闭目标的url规则，rules为空时取消"""
+        if not rules:
+            self._close_rules = None
+            return
+        if isinstance(rules, str):
+            rules = (rules,)
+        self._popups_only = popups_only
+        self._close_rules = [compile(r if is_regex else escape(r)) for r in rules]
+
+    def should_close(self, info):
+        """返回目标是否匹配自动关闭规则"""
+        rules = self._close_rules
+        if not rules or info['type'] not in TAB_TYPES or (self._popups_only and not info.get('openerId')):
+            return False
+        return any(r.search(info['url']) for r in rules)
+
+    def on_created(self, info):
+        """目标创建时调用，新目标放在最前，已登记的只更新信息，返回是否新目标"""
+        with self._lock:
+            old = self._targets.get(info['targetId'])
+            if old is None:
+                self._targets[info['targetId']] = dict(info)
+                return True
+            old.update(info)
+            return False
+
+    def on_changed(self, info):
+        with self._lock:
+            old = self._targets.get(info['targetId'])
+            if old is not None:
+                old.update(info)
+
+    def on_destroyed(self, target_id):
+        with self._lock:
+            self._targets.pop(target_id, None)
+
+    def activate(self, target_id):
+        """把目标移到最前"""
+        with self._lock:
+            info = self._targets.pop(target_id, None)
+            if info is not None:
+                self._targets[target_id] = info
+
+    def infos(self, types=None):
+        """按激活顺序返回目标信息列表，types为None时返回所有类型"""
+        with self._lock:
+            targets = list(self._targets.values())
+        return [i for i in reversed(targets) if types is None or i['type'] in types]
+
+    def tab_infos(self):
+        """按激活顺序返回标签页信息列表，不含devtools"""
+        return [i for i in self.infos(TAB_TYPES) if not i['url'].startswith('devtools://')]
+
+    def tab_ids(self):
+        """按激活顺序返回标签页id列表，不含devtools"""
+        return [i['targetId'] for i in self.tab_infos()]
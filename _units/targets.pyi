@@ -0,0 +1,101 @@
+# -*- coding:utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Website  : https://DrissionPage.cn
+@Copyright: (c) 2020 by g1879, Inc. All Rights Reserved.
+"""
+from re import Pattern
+from threading import Lock
+from typing import Dict, List, Optional, Iterable, Tuple, Union
+
+TAB_TYPES: Tuple[str, ...] = ...
+
+
+class TargetRegistry(object):
+    _lock: Lock
+    _targets: Dict[str, dict]
+    _close_rules: Optional[List[Pattern]]
+    _popups_only: bool
+
+    def __init__(self): ...
+
+    def __len__(self) -> int: ...
+
+    def __contains__(self, target_id: str) -> bool: ...
+
+    def get(self, target_id: str) -> Optional[dict]:
+        """返回目标信息
+        :param target_id: 目标id
+        :return: Target.TargetInfo格式的dict，不存在时返回None
+        """
+        ...
+
+    def sync(self, json_list: List[dict]) -> None:
+        """用/json接口的结果重置激活顺序，/json中没有的目标保留在最后
+        :param json_list: /json接口返回的列表
+        :return: None
+        """
+        ...
+
+    def set_close_rules(self,
+                        rules: Union[str, list, tuple, None] = None,
+                        is_regex: bool = False,
+                        popups_only: bool = True) -> None:
+        """设置自动关闭目标的url规则
+        :param rules: url中包含的文本或正则，为空时取消
+        :param is_regex: rules是否为正则表达式
+        :param popups_only: 是否只匹配有opener的目标
+        :return: None
+        """
+        ...
+
+    def should_close(self, info: dict) -> bool:
+        """返回目标是否匹配自动关闭规则
+        :param info: Target.TargetInfo格式的dict
+        :return: 是否应关闭
+        """
+        ...
+
+    def on_created(self, info: dict) -> bool:
+        """Target.targetCreated时调用，新目标放在最前，已登记的只更新信息
+        :param info: 事件中的targetInfo
+        :return: 是否新登记的目标
+        """
+        ...
+
+    def on_changed(self, info: dict) -> None:
+        """Target.targetInfoChanged时调用，更新标题、url等信息
+        :param info: 事件中的targetInfo
+        :return: None
+        """
+        ...
+
+    def on_destroyed(self, target_id: str) -> None:
+        """Target.targetDestroyed时调用，移除目标
+        :param target_id: 目标id
+        :return: None
+        """
+        ...
+
+    def activate(self, target_id: str) -> None:
+        """目标被激活时调用，把目标移到最前
+        :param target_id: 目标id
+        :return: None
+        """
+        ...
+
+    def infos(self, types: Optional[Iterable[str]] = None) -> List[dict]:
+        """按激活顺序返回目标信息列表，最近激活的在最前
+        :param types: 要返回的目标类型，为None时返回所有类型
+        :return: Target.TargetInfo格式的dict组成的列表
+        """
+        ...
+
+    def tab_infos(self) -> List[dict]:
+        """按激活顺序返回page、webview类型的目标信息列表，不含devtools页面"""
+        ...
+
+    def tab_ids(self) -> List[str]:
+        """按激活顺序返回page、webview类型的目标id列表，不含devtools页面"""
+        ...
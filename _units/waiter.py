@@ -33,11 +33,8 @@ class BrowserWaiter(OriginWaiter):
             curr_tab = curr_tab.tab_id
         if timeout is None:
             timeout = self._owner.timeout
-        end_time = perf_counter() + timeout
-        while perf_counter() < end_time:
-            if curr_tab != self._owner._newest_tab_id:
-                return self._owner._newest_tab_id
-            sleep(.01)
+        if self._owner._notifier.wait_for(lambda: curr_tab != self._owner._newest_tab_id, timeout):
+            return self._owner._newest_tab_id
 
         if raise_err is True or (_S.raise_when_wait_failed is True and raise_err is None):
             raise WaitTimeoutError(_S._lang.WAITING_FAILED_, _S._lang.NEW_TAB, timeout)
@@ -56,16 +53,12 @@ class BrowserWaiter(OriginWaiter):
         if not self._owner._dl_mgr._running:
             raise RuntimeError(_S._lang.join(_S._lang.NEED_DOWNLOAD_PATH, TIP=_S._lang.SET_DOWNLOAD_PATH))
         if not timeout:
-            while self._owner._dl_mgr._missions:
-                sleep(.5)
+            self._owner._notifier.wait_for(lambda: not self._owner._dl_mgr._missions)
             return True
 
         else:
-            end_time = perf_counter() + timeout
-            while perf_counter() < end_time:
-                if not self._owner._dl_mgr._missions:
-                    return True
-                sleep(.5)
+            if self._owner._notifier.wait_for(lambda: not self._owner._dl_mgr._missions, timeout):
+                return True
 
             if self._owner._dl_mgr._missions:
                 if cancel_if_timeout:
@@ -152,18 +145,13 @@ class BaseWaiter(OriginWaiter):
             return False
 
     def load_start(self, timeout=None, raise_err=None):
-        return self._loading(timeout=timeout, gap=.002, raise_err=raise_err)
+        return self._loading(timeout=timeout, raise_err=raise_err)
 
     def doc_loaded(self, timeout=None, raise_err=None):
         return self._loading(timeout=timeout, start=False, raise_err=raise_err)
 
     def upload_paths_inputted(self):
-        end_time = perf_counter() + self._owner.timeout
-        while perf_counter() < end_time:
-            if not self._owner._upload_list:
-                return True
-            sleep(.01)
-        return False
+        return self._owner._notifier.wait_for(lambda: not self._owner._upload_list, self._owner.timeout)
 
     def download_begin(self, timeout=None, cancel_it=False):
         if not self._owner.browser._dl_mgr._running:
@@ -208,15 +196,12 @@ class BaseWaiter(OriginWaiter):
         else:
             return False
 
-    def _loading(self, timeout=None, start=True, gap=.01, raise_err=None):
+    def _loading(self, timeout=None, start=True, raise_err=None):
         if timeout is None:
             timeout = self._owner.timeout
         timeout = .1 if timeout <= 0 else timeout
-        end_time = perf_counter() + timeout
-        while perf_counter() < end_time:
-            if self._owner._is_loading == start:
-                return True
-            sleep(gap)
+        if self._owner._notifier.wait_for(lambda: self._owner._is_loading == start, timeout):
+            return True
 
         if raise_err is True or (_S.raise_when_wait_failed is True and raise_err is None):
             raise WaitTimeoutError(_S._lang.WAITING_FAILED_, _S._lang.PAGE_LOADED, timeout)
@@ -228,17 +213,15 @@ class TabWaiter(BaseWaiter):
     def downloads_done(self, timeout=None, cancel_if_timeout=True):
         if not self._owner.browser._dl_mgr._running:
             raise RuntimeError(_S._lang.join(_S._lang.NEED_DOWNLOAD_PATH, TIP=_S._lang.SET_DOWNLOAD_PATH))
+        notifier = self._owner.browser._notifier
         if not timeout:
-            while self._owner.browser._dl_mgr.get_tab_missions(self._owner.tab_id):
-                sleep(.5)
+            notifier.wait_for(lambda: not self._owner.browser._dl_mgr.get_tab_missions(self._owner.tab_id))
             return self._owner
 
         else:
-            end_time = perf_counter() + timeout
-            while perf_counter() < end_time:
-                if not self._owner.browser._dl_mgr.get_tab_missions(self._owner.tab_id):
-                    return self._owner
-                sleep(.5)
+            if notifier.wait_for(lambda: not self._owner.browser._dl_mgr.get_tab_missions(self._owner.tab_id),
+                                 timeout):
+                return self._owner
 
             if self._owner.browser._dl_mgr.get_tab_missions(self._owner.tab_id):
                 if cancel_if_timeout:
@@ -249,21 +232,41 @@ class TabWaiter(BaseWaiter):
                 return self._owner
 
     def alert_closed(self, timeout=None):
+        notifier = self._owner._notifier
         if timeout is None:
-            while not self._owner.states.has_alert:
-                sleep(.2)
-            while self._owner.states.has_alert:
-                sleep(.2)
+            notifier.wait_for(lambda: self._owner.states.has_alert)
+            notifier.wait_for(lambda: not self._owner.states.has_alert)
 
         else:
             end_time = perf_counter() + timeout
-            while not self._owner.states.has_alert and perf_counter() < end_time:
-                sleep(.2)
-            while self._owner.states.has_alert and perf_counter() < end_time:
-                sleep(.2)
+            notifier.wait_for(lambda: self._owner.states.has_alert, timeout)
+            notifier.wait_for(lambda: not self._owner.states.has_alert, end_time - perf_counter())
 
         return False if self._owner.states.has_alert else self._owner
 
+    def _change(self, arg, text, exclude=False, timeout=None, raise_err=None):
+        owner = self._owner
+        if (arg == 'url' and owner._target_url is None) or (arg == 'title' and owner._title_dirty):
+            owner._get_target_info()
+        if arg == 'url':
+            def do():
+                return (text in (owner._target_url or '')) != exclude
+        elif arg == 'title':
+            def do():
+                return (text in (owner._target_title or '')) != exclude
+        else:
+            raise ValueError
+
+        if timeout is None:
+            timeout = owner.timeout
+        if owner._notifier.wait_for(do, timeout):
+            return True
+
+        if raise_err is True or (_S.raise_when_wait_failed is True and raise_err is None):
+            raise WaitTimeoutError(_S._lang.WAITING_FAILED_, _S._lang.ARG, timeout, ARG=arg)
+        else:
+            return False
+
 
 class ChromiumPageWaiter(TabWaiter):
     def new_tab(self, timeout=None, raise_err=None):
@@ -410,13 +413,8 @@ class FrameWaiter(BaseWaiter, ElementWaiter):
 
 def wait_mission(browser, tid, timeout=None):
     r = False
-    end_time = perf_counter() + timeout
-    while perf_counter() < end_time:
-        v = browser._dl_mgr.get_flag(tid)
-        if not isinstance(v, bool):
-            r = v
-            break
-        sleep(.005)
+    if browser._notifier.wait_for(lambda: not isinstance(browser._dl_mgr.get_flag(tid), bool), timeout):
+        r = browser._dl_mgr.get_flag(tid)
 
     browser._dl_mgr.set_flag(tid, None)
     return r
@@ -206,12 +206,10 @@ class BaseWaiter(OriginWaiter):
     def _loading(self,
                  timeout: float = None,
                  start: bool = True,
-                 gap: float = .01,
                  raise_err: bool = None) -> bool:
         """等待页面开始加载或加载完成
         :param timeout: 超时时间（秒），为None时使用页面timeout属性
         :param start: 等待开始还是结束
-        :param gap: 间隔秒数
         :param raise_err: 等待失败时是否报错，为None时根据Settings设置
         :return: 是否等待成功
         """
@@ -0,0 +1,289 @@
+# -*- coding:utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Website  : https://DrissionPage.cn
+@Copyright: (c) 2020 by g1879, Inc. All Rights Reserved.
+"""
+from itertools import count, cycle
+from json import dump, load
+from queue import Queue, Empty
+from threading import Event, Lock, Thread, Timer, active_count
+from time import perf_counter
+
+from click import command, option, Choice, Path
+
+from .._functions.fake_cdp import FakeBrowser
+
+BENCHMARKS = ('new_tab', 'tab_pool', 'tab_lookup', 'url_title', 'ele', 'eles', 'child_eles', 'eles_attr',
+              'child_eles_attr', 'ele_read', 'ele_read_cached', 'ele_wait', 'run_js', 'cdp_call', 'dispatch_queue',
+              'dispatch_slot', 'listener', 'frame_events', 's_lookup')
+S_LOCATORS = ('#target', '.item@data-i=5', 'tag:li@@class=item@@data-i=7', 'text:item 9', 'css:#list > li.item',
+              'xpath://li[@data-i="3"]', ('css selector', 'div.box'))
+
+
+def make_html(nodes=1000):
+    """生成测试用页面，包含nodes个li元素"""
+    items = ''.join(f'<li class="item" data-i="{i}">item {i}</li>' for i in range(nodes))
+    return (f'<html><head><title>benchmark</title></head><body><div id="target" class="box">target</div>'
+            f'<ul id="list">{items}</ul></body></html>')
+
+
+def run_benchmarks(latency=0, nodes=1000, rounds=50, requests=1000, frames=2000, names=None, show=True,
+                   lookups=100000):
+    """在内置的模拟浏览器上运行性能测试，返回{测试名称: 结果}"""
+    from .._base.chromium import Chromium
+
+    url = 'http://benchmark.local/'
+    names = BENCHMARKS if names is None else names
+    results = {}
+    with FakeBrowser(pages={url: make_html(nodes)}, latency=latency) as fake:
+        browser = Chromium(fake.address)
+        try:
+            tab = browser.latest_tab
+            tab.get(url)
+
+            def bench(name, func, times):
+                calls = sum(fake.calls.values())
+                t = perf_counter()
+                for _ in range(times):
+                    func()
+                total = perf_counter() - t
+                results[name] = {'rounds': times, 'total': total, 'mean': total / times,
+                                 'ops': times / total if total else 0,
+                                 'cdp_calls': (sum(fake.calls.values()) - calls) / times}
+
+            if 'new_tab' in names:
+                bench('new_tab', lambda: browser.new_tab().close(), max(rounds // 5, 1))
+            if 'tab_pool' in names:
+                pool = browser.new_tab_pool(4)
+                bench('tab_pool', lambda: pool.release(pool.lease()), max(rounds // 5, 1))
+                results['tab_pool'].update(pool.stats)
+                pool.close()
+            if 'tab_lookup' in names:
+                bench('tab_lookup', lambda: (browser.latest_tab, browser.get_tab(title='benchmark')), rounds)
+            if 'url_title' in names:
+                bench('url_title', lambda: (tab.url, tab.title), rounds)
+            if 'ele' in names:
+                bench('ele', lambda: tab.ele('#target'), rounds)
+            if 'eles' in names:
+                bench('eles', lambda: tab.eles('tag:li'), max(rounds // 10, 1))
+            if 'child_eles' in names:
+                ul = tab('#list')
+                bench('child_eles', lambda: ul.eles('css:li'), max(rounds // 10, 1))
+            if 'eles_attr' in names:
+                bench('eles_attr', lambda: tab.eles('tag:li')[-1].attr('data-i'), max(rounds // 10, 1))
+            if 'child_eles_attr' in names:
+                ul = tab('#list')
+                bench('child_eles_attr', lambda: ul.eles('css:li')[-1].attr('data-i'), max(rounds // 10, 1))
+            if 'ele_read' in names:
+                ele = tab('#target')
+                bench('ele_read', lambda: (ele.tag, ele.attr('id'), ele.html), rounds)
+            if 'ele_read_cached' in names:
+                tab.set.ele_cache()
+                ele = tab('#target')
+                bench('ele_read_cached', lambda: (ele.tag, ele.attr('id'), ele.html), rounds)
+                tab.set.ele_cache(False)
+            if 'ele_wait' in names:
+                li = tab.eles('tag:li')[-1]
+                ids = count()
+
+                def wait_ele():  # 元素在50ms后才出现
+                    cls = f'late{next(ids)}'
+                    timer = Timer(.05, tab.run_cdp, ('DOM.setAttributeValue',),
+                                  {'nodeId': li._node_id, 'name': 'class', 'value': cls})
+                    timer.start()
+                    tab.ele(f'.{cls}', timeout=5)
+                    timer.join()
+
+                bench('ele_wait', wait_ele, max(rounds // 10, 1))
+            if 'run_js' in names:
+                bench('run_js', lambda: tab.run_js('return 1'), rounds)
+            if 'cdp_call' in names:
+                bench('cdp_call', lambda: tab._driver.run('Runtime.evaluate', expression='1'), rounds * 10)
+            if 'dispatch_queue' in names or 'dispatch_slot' in names:
+                bench_dispatch(bench, names, rounds * 100)
+            if 'listener' in names:
+                tab.listen.start()
+                bench('listener', lambda: (fake.emit_requests(tab.tab_id, requests),
+                                           tab.listen.wait(requests, timeout=60)), 1)
+                tab.listen.stop()
+                r = results['listener']
+                r.update(rounds=requests, mean=r['total'] / requests, ops=requests / r['total'],
+                         cdp_calls=r['cdp_calls'] / requests)
+            if 'frame_events' in names:
+                threads = bench_frame_events(browser, tab, fake, frames, bench)
+                r = results['frame_events']
+                events = max(frames // 5, 1) * 5 * 2 * 20
+                r.update(rounds=events, mean=r['total'] / events, ops=events / r['total'], threads=threads)
+            if 's_lookup' in names:
+                from .._elements.session_element import make_session_ele
+                doc = make_session_ele(make_html(nodes))
+                locators = cycle(S_LOCATORS)
+                bench('s_lookup', lambda: doc.ele(next(locators)), lookups)
+        finally:
+            browser.quit()
+
+    if show:
+        print(f'latency={latency}s nodes={nodes}')
+        print(f'{"name":<16}{"rounds":>8}{"mean(ms)":>12}{"ops/s":>12}{"cdp/op":>10}')
+        for k, v in results.items():
+            print(f'{k:<16}{v["rounds"]:>8}{v["mean"] * 1000:>12.3f}{v["ops"]:>12.1f}{v["cdp_calls"]:>10.1f}')
+    return results
+
+
+def bench_frame_events(browser, tab, fake, frames, bench, cycles=5):
+    """模拟iframe密集的页面：分cycles轮，每轮新连接20个session并绑定立即处理的回调，连续触发frameAttached和
+    frameDetached事件，处理完后断开。检查每个session按顺序收到全部事件，且线程数不随session的连接和断开增长，
+    返回期间的最大线程数"""
+    start_threads = active_count()
+    limit = start_threads + browser._driver._immediate.max_workers + 4
+    per_cycle = max(frames // cycles, 1)
+    total = per_cycle * 2 * 20
+    expected = [(e, f'F{i}') for i in range(per_cycle) for e in ('attached', 'detached')]
+    lock = Lock()
+    count = [0, start_threads]
+    done = Event()
+
+    def recorder(received, name):
+        def on_frame(frameId, **kwargs):
+            received.append((name, frameId))
+            with lock:
+                count[0] += 1
+                count[1] = max(count[1], active_count())
+                if count[0] == total:
+                    done.set()
+
+        return on_frame
+
+    def run_cycle():
+        count[0] = 0
+        done.clear()
+        drivers = [browser._driver.attach(tab.tab_id) for _ in range(20)]
+        received = [[] for _ in drivers]
+        try:
+            for d, r in zip(drivers, received):
+                d.set_callback('Page.frameAttached', recorder(r, 'attached'), immediate=True)
+                d.set_callback('Page.frameDetached', recorder(r, 'detached'), immediate=True)
+            for i in range(per_cycle):
+                params = {'frameId': f'F{i}', 'parentFrameId': tab._frame_id}
+                fake.emit(tab.tab_id, 'Page.frameAttached', params, domain_only=False)
+                fake.emit(tab.tab_id, 'Page.frameDetached', params, domain_only=False)
+            if not done.wait(60):
+                raise TimeoutError(f'frame_events: {count[0]}/{total}')
+        finally:
+            for d in drivers:
+                d.stop()
+        for n, r in enumerate(received):
+            if r != expected:
+                raise AssertionError(f'frame_events: session {n} received {len(r)}/{len(expected)} events '
+                                     f'or out of order')
+
+    def fire():
+        for _ in range(cycles):
+            run_cycle()
+        if count[1] > limit:
+            raise AssertionError(f'frame_events: {count[1]} threads, limit {limit}')
+
+    bench('frame_events', fire, 1)
+    return count[1]
+
+
+def save_baseline(path, results):
+    """把测试结果保存为基准文件"""
+    with open(path, 'w', encoding='utf-8') as f:
+        dump({k: {'mean': v['mean'], 'cdp_calls': v['cdp_calls']} for k, v in results.items()}, f, indent=2)
+
+
+def compare_results(results, baseline, tolerance=.25):
+    """与基准比较，返回超出容差的项目列表，每项为(测试名称, 指标, 基准值, 当前值)"""
+    if isinstance(baseline, str):
+        with open(baseline, 'r', encoding='utf-8') as f:
+            baseline = load(f)
+    regressions = []
+    for name, r in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        for key in ('mean', 'cdp_calls'):
+            if key in base and r[key] > base[key] * (1 + tolerance):
+                regressions.append((name, key, base[key], r[key]))
+    return regressions
+
+
+def bench_dispatch(bench, names, rounds):
+    """不经过网络，比较每条指令新建Queue并每0.2秒轮询与复用ResponseSlot两种结果分发方式的开销"""
+    from .._base.driver import ResponseSlot
+
+    requests = Queue()
+
+    def responder():  # 模拟接收线程
+        while True:
+            item = requests.get()
+            if item is None:
+                return
+            ws_id, target = item
+            msg = {'id': ws_id, 'result': {}}
+            if isinstance(target, ResponseSlot):
+                target.set(ws_id, msg)
+            else:
+                target.put(msg)
+
+    Thread(target=responder, daemon=True).start()
+    ids = count(1)
+    free = []
+
+    def with_queue():
+        q = Queue()
+        requests.put((next(ids), q))
+        while True:
+            try:
+                return q.get(timeout=.2)
+            except Empty:
+                pass
+
+    def with_slot():
+        slot = free.pop() if free else ResponseSlot()
+        slot.id = ws_id = next(ids)
+        requests.put((ws_id, slot))
+        slot.wait()
+        result = slot.result
+        slot.reset()
+        free.append(slot)
+        return result
+
+    try:
+        if 'dispatch_queue' in names:
+            bench('dispatch_queue', with_queue, rounds)
+        if 'dispatch_slot' in names:
+            bench('dispatch_slot', with_slot, rounds)
+    finally:
+        requests.put(None)
+
+
+@command()
+@option('-l', '--latency', default=0., help='每条cdp消息注入的延迟（秒）')
+@option('-n', '--nodes', default=1000, help='eles()测试的元素数量')
+@option('-r', '--rounds', default=50, help='每项测试的执行次数')
+@option('-q', '--requests', default=1000, help='监听测试模拟的请求数量')
+@option('-f', '--frames', default=2000, help='frame_events测试触发的frameAttached/frameDetached对数')
+@option('-s', '--lookups', default=100000, help='s_lookup测试在已解析文档上的查找次数')
+@option('-b', '--bench', multiple=True, type=Choice(BENCHMARKS),
+        help=f'只运行指定测试，可多次传入：{", ".join(BENCHMARKS)}')
+@option('--save', type=Path(dir_okay=False), help='把结果保存为基准文件')
+@option('--baseline', type=Path(exists=True, dir_okay=False), help='与基准文件比较，有退化时以状态码1退出')
+@option('-t', '--tolerance', default=.25, help='与基准比较时允许的增幅，0.25表示25%')
+def main(latency, nodes, rounds, requests, frames, lookups, bench, save, baseline, tolerance):
+    results = run_benchmarks(latency, nodes, rounds, requests, frames, bench or None, lookups=lookups)
+    if save:
+        save_baseline(save, results)
+    if baseline:
+        regressions = compare_results(results, baseline, tolerance)
+        for name, key, base, curr in regressions:
+            print(f'REGRESSION {name} {key}: {base:.6g} -> {curr:.6g}')
+        if regressions:
+            raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
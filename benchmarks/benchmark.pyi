@@ -0,0 +1,78 @@
+# -*- coding:utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Website  : https://DrissionPage.cn
+@Copyright: (c) 2020 by g1879, Inc. All Rights Reserved.
+"""
+from typing import Union, Callable, Optional, Iterable, Dict, Tuple, List, Any
+
+BENCHMARKS: Tuple[str, ...] = ...
+S_LOCATORS: Tuple[Union[str, tuple], ...] = ...
+
+
+def make_html(nodes: int = 1000) -> str:
+    """生成测试用页面
+    :param nodes: li元素数量
+    :return: html文本
+    """
+    ...
+
+
+def run_benchmarks(latency: Union[float, Callable[[str], float]] = 0,
+                   nodes: int = 1000,
+                   rounds: int = 50,
+                   requests: int = 1000,
+                   frames: int = 2000,
+                   names: Optional[Iterable[str]] = None,
+                   show: bool = True,
+                   lookups: int = 100000) -> Dict[str, dict]:
+    """在内置的模拟浏览器上运行性能测试
+    :param latency: 每条cdp消息注入的延迟（秒）
+    :param nodes: eles()测试的元素数量
+    :param rounds: 每项测试的执行次数
+    :param requests: 监听测试模拟的请求数量
+    :param frames: frame_events测试触发的frameAttached/frameDetached对数
+    :param names: 要运行的测试名称，为None时运行全部
+    :param show: 是否打印结果
+    :param lookups: s_lookup测试在已解析文档上轮流用S_LOCATORS查找的次数
+    :return: {测试名称: {'rounds', 'total', 'mean', 'ops', 'cdp_calls'}}
+    """
+    ...
+
+
+def bench_dispatch(bench: Callable[[str, Callable[[], Any], int], None],
+                   names: Iterable[str],
+                   rounds: int) -> None:
+    """不经过网络，比较每条指令新建Queue并轮询与复用ResponseSlot两种结果分发方式的单条指令开销
+    :param bench: run_benchmarks()中的计时方法
+    :param names: 要运行的测试名称
+    :param rounds: 每种方式的执行次数
+    :return: None
+    """
+    ...
+
+
+def save_baseline(path: str, results: Dict[str, dict]) -> None:
+    """把测试结果保存为基准文件
+    :param path: json文件路径
+    :param results: run_benchmarks()返回的结果
+    :return: None
+    """
+    ...
+
+
+def compare_results(results: Dict[str, dict],
+                    baseline: Union[str, Dict[str, dict]],
+                    tolerance: float = .25) -> List[Tuple[str, str, float, float]]:
+    """与基准比较，mean和cdp_calls超过基准值(1 + tolerance)倍的视为退化
+    :param results: run_benchmarks()返回的结果
+    :param baseline: 基准文件路径或其内容
+    :param tolerance: 允许的增幅
+    :return: [(测试名称, 指标, 基准值, 当前值), ...]
+    """
+    ...
+
+
+def main(latency: float, nodes: int, rounds: int, requests: int, frames: int, lookups: int,
+         bench: Tuple[str, ...], save: Optional[str], baseline: Optional[str], tolerance: float) -> None: ...
@@ -14,9 +14,10 @@ from ._functions.settings import Settings
 from ._functions.tools import wait_until, configs_to_here
 from ._functions.web import get_blob, tree
 from ._units.actions import Actions
+from ._units.metrics import metrics_to_prometheus
 
 __all__ = ['make_session_ele', 'Actions', 'Keys', 'By', 'Settings', 'wait_until', 'configs_to_here', 'get_blob',
-           'tree', 'from_selenium', 'from_playwright']
+           'tree', 'from_selenium', 'from_playwright', 'metrics_to_prometheus']
 
 
 def from_selenium(driver):
@@ -5,13 +5,15 @@
 @Website  : https://DrissionPage.cn
 @Copyright: (c) 2020 by g1879, Inc. All Rights Reserved.
 """
+from ._elements.async_element import AsyncElement
 from ._elements.chromium_element import ChromiumElement, ShadowRoot
 from ._elements.none_element import NoneElement
 from ._elements.session_element import SessionElement
+from ._pages.async_tab import AsyncTab
 from ._pages.chromium_frame import ChromiumFrame
 from ._pages.chromium_tab import ChromiumTab
 from ._pages.mix_tab import MixTab
 from ._pages.mix_tab import MixTab as WebPageTab
 
 __all__ = ['ChromiumElement', 'ShadowRoot', 'NoneElement', 'SessionElement', 'ChromiumFrame', 'ChromiumTab',
-           'MixTab', 'WebPageTab']
+           'MixTab', 'WebPageTab', 'AsyncTab', 'AsyncElement']